@@ -6,6 +6,8 @@ Cada activo define sus costos en unidades naturales (ticks, dólares fijos).
 pasando slippage_ticks directamente (el engine lo aplica como valor fijo).
 """
 
+from functools import lru_cache
+
 FUTURES_CONFIG = {
     "CME": {
         "ES": {  # S&P 500 E-mini
@@ -48,6 +50,7 @@ FUTURES_CONFIG = {
 }
 
 
+@lru_cache(maxsize=None)
 def get_futures_config(exchange: str, symbol: str) -> dict:
     """
     Devuelve configuración de futuros compatible con BacktestEngine.
@@ -57,6 +60,10 @@ def get_futures_config(exchange: str, symbol: str) -> dict:
 
     El exchange_fee es el costo total por contrato por lado (exchange + broker).
 
+    El resultado se cachea por (exchange, symbol): el optimizador crea un
+    backtest por combinación y todas comparten el mismo dict. No modificarlo
+    (igual que el dict que devuelve get_crypto_config).
+
     Args:
         exchange: Nombre del exchange (e.g., "CME")
         symbol: Símbolo del futuro (e.g., "ES", "CL")
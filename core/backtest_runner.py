@@ -4,7 +4,7 @@ Orquestador completo de backtests.
 Ejecuta el backtest y calcula todas las métricas en un solo paso.
 """
 
-from typing import Any
+from typing import Any, Callable
 import pandas as pd
 from core.simple_backtest_engine import BacktestEngine
 from metrics.metrics_aggregator import MetricsAggregator
@@ -27,28 +27,41 @@ class BacktestRunner:
         all_metrics = runner.metrics.all_metrics
     """
     
-    def __init__(self, strategy: Any):
+    def __init__(self, strategy: Any, market_arrays: dict | None = None):
         """
         Inicializa el runner con una estrategia.
         
         Args:
             strategy: Instancia de BaseStrategy o similar
+            market_arrays: Opcional. Arrays de extract_market_arrays() sobre
+                strategy.market_data, ya extraídos (p. ej. por el optimizador)
         """
         self.strategy = strategy
+        self.market_arrays = market_arrays
         self.engine: BacktestEngine | None = None
         self.results: pd.DataFrame | None = None
         self.metrics: MetricsAggregator | None = None
         self.market_config: dict | None = None
     
-    def run(self, verbose: bool = True) -> pd.DataFrame:
+    def run(
+        self,
+        verbose: bool = True,
+        signals: list | None = None,
+        early_stop_cb: Callable[[int, dict], bool] | None = None
+    ) -> pd.DataFrame | None:
         """
         Ejecuta el backtest completo.
         
         Args:
             verbose: Si True, imprime progreso
+            signals: Señales ya generadas (p. ej. cacheadas por el optimizador).
+                     Si None, se llama a strategy.generate_simple_signals()
+            early_stop_cb: Callback de poda (ver BacktestEngine.run). Si devuelve
+                     True, el backtest se abandona sin calcular métricas
             
         Returns:
-            DataFrame con resultados del motor
+            DataFrame con resultados del motor, o None si se podó
+            (results y metrics quedan en None)
         """
         if verbose:
             print("\n" + "="*60)
@@ -59,7 +72,10 @@ class BacktestRunner:
         if verbose:
             print("\n🔍 Generando señales...")
         
-        signals = self.strategy.generate_simple_signals()
+        if signals is None:
+            signals = self.strategy.generate_simple_signals()
+        else:
+            self.strategy.simple_signals = signals
         
         if verbose:
             print(f"✓ {len(signals)} señales generadas")
@@ -87,7 +103,12 @@ class BacktestRunner:
         if verbose:
             print("\n⚙️ Ejecutando motor de backtest...")
         
-        self.results = self.engine.run(signals)
+        self.results = self.engine.run(signals, early_stop_cb=early_stop_cb)
+        if self.results is None:
+            if verbose:
+                print("✂️ Backtest detenido por early_stop_cb")
+            self.metrics = None
+            return None
         
         if verbose:
             print(f"✓ Backtest completado: {len(self.results)} trades")
@@ -98,7 +119,8 @@ class BacktestRunner:
         
         self.metrics = MetricsAggregator(
             results=self.results,
-            strategy=self.strategy
+            strategy=self.strategy,
+            market_arrays=self.market_arrays
         )
         
         if verbose:
@@ -114,13 +136,13 @@ class BacktestRunner:
         
         self.metrics.print_summary(sections=sections)
     
-    def save_results(self, output_dir: str = 'outputs'):
-        """Guarda todos los resultados."""
+    def save_results(self, output_dir: str = 'outputs', format: str = 'parquet'):
+        """Guarda todos los resultados (parquet por defecto, 'csv' o 'feather')."""
         if self.metrics is None:
             print("⚠️ Primero ejecuta run()")
             return
         
-        self.metrics.save_results(output_dir=output_dir)
+        self.metrics.save_results(output_dir=output_dir, format=format)
 
 
 
@@ -11,19 +11,42 @@ sea fácil de entender y debuggear.
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Callable
 import pandas as pd
 from models.enums import SignalType, SignalPositionSide
 from models.simple_signals import TradingSignal
 
 
-@dataclass
+# Columnas del DataFrame de resultados, en orden
+RESULT_COLUMNS = (
+    'symbol', 'position_side', 'entry_time', 'exit_time', 'num_entries',
+    'avg_entry_price', 'exit_price', 'total_cost', 'exit_value',
+    'contracts', 'risk_usd', 'point_value',
+    'total_entry_fees', 'exit_fee', 'total_fees',
+    'entry_slippage', 'exit_slippage', 'total_slippage',
+    'gross_pnl', 'net_pnl', 'capital_after', 'pnl_pct'
+)
+
+# Cada cuántas señales se consulta el early_stop_cb de BacktestEngine.run()
+EARLY_STOP_EVERY = 50
+
+# Ruta de cada señal según (lado, tipo): True = entrada, False = salida.
+# BUY+LONG / SELL+SHORT abren; SELL+LONG / BUY+SHORT cierran.
+_SIGNAL_ROUTES = {
+    (SignalPositionSide.LONG, SignalType.BUY): True,
+    (SignalPositionSide.SHORT, SignalType.SELL): True,
+    (SignalPositionSide.LONG, SignalType.SELL): False,
+    (SignalPositionSide.SHORT, SignalType.BUY): False,
+}
+
+@dataclass(slots=True)
 class Entry:
     """
     Una entrada individual dentro de una posición.
 
     Cuando haces múltiples compras para promediar, cada compra
     es un Entry separado que se guarda en la lista de entradas
-    de la Position.
+    de la Position. Usa slots: se crea una por cada señal de entrada.
     """
     timestamp: datetime
     price: float  # Precio real después de aplicar slippage
@@ -42,11 +65,19 @@ class Position:
     dos Entries (la compra a 50k y la compra a 48k).
     """
 
+    __slots__ = (
+        'symbol', 'entry_time', 'entries', 'position_side', '_risk_usd',
+        '_total_cost', '_total_fees', '_total_slippage', '_total_crypto',
+        '_total_contracts', '_total_contract_notional',
+    )
+
     def __init__(self, symbol: str, entry_time: datetime):
         self.symbol = symbol
         self.entry_time = entry_time  # Timestamp de la primera entrada
         self.entries: list[Entry] = []
         self.position_side: SignalPositionSide = None  # Set on first entry
+        self._risk_usd = 0.0  # Futuros: riesgo acumulado en USD de todas las entradas
+        self._reset_totals()
 
     def add_entry(self, timestamp: datetime, price: float,
                   size_usdt: float, fee: float, slippage_cost: float,
@@ -66,18 +97,41 @@ class Position:
             fee=fee,
             slippage_cost=slippage_cost
         ))
+        self._add_to_totals(self.entries[-1])
+
+    # Los agregados se mantienen como sumas acumuladas (O(1) por consulta).
+    # Se suman en el mismo orden que las entradas, así que el resultado es
+    # idéntico a recorrer la lista con sum().
+
+    def _reset_totals(self):
+        """Pone a cero las sumas acumuladas de las entradas."""
+        self._total_cost = 0.0
+        self._total_fees = 0.0
+        self._total_slippage = 0.0
+        self._total_crypto = 0.0
+        self._total_contracts = 0
+        self._total_contract_notional = 0.0  # sum(price * contracts), futuros
+
+    def _add_to_totals(self, entry: Entry):
+        """Acumula una entrada en las sumas."""
+        self._total_cost += entry.size_usdt
+        self._total_fees += entry.fee
+        self._total_slippage += entry.slippage_cost
+        self._total_crypto += entry.size_usdt / entry.price
+        self._total_contracts += entry.contracts
+        self._total_contract_notional += entry.price * entry.contracts
 
     def total_cost(self) -> float:
         """Cuántos USDT gastamos en total en todas las entradas."""
-        return sum(entry.size_usdt for entry in self.entries)
+        return self._total_cost
 
     def total_fees_on_entries(self) -> float:
         """Fees totales pagados en todas las entradas."""
-        return sum(entry.fee for entry in self.entries)
+        return self._total_fees
 
     def total_slippage_on_entries(self) -> float:
         """Slippage total pagado en todas las entradas."""
-        return sum(entry.slippage_cost for entry in self.entries)
+        return self._total_slippage
 
     def total_crypto(self) -> float:
         """
@@ -86,7 +140,7 @@ class Position:
         Por ejemplo, si compramos 0.5 BTC a 50k (25k USDT) y luego
         0.5 BTC a 48k (24k USDT), tenemos 1.0 BTC en total.
         """
-        return sum(entry.size_usdt / entry.price for entry in self.entries)
+        return self._total_crypto
 
     def average_entry_price(self) -> float:
         """
@@ -102,14 +156,14 @@ class Position:
 
     def total_contracts(self) -> int:
         """Total de contratos en todas las entradas."""
-        return sum(entry.contracts for entry in self.entries)
+        return self._total_contracts
 
     def average_entry_price_futures(self) -> float:
         """Precio promedio ponderado por contratos (futuros)."""
         total_c = self.total_contracts()
         if total_c == 0:
             return 0.0
-        return sum(e.price * e.contracts for e in self.entries) / total_c
+        return self._total_contract_notional / total_c
 
     def partial_close_futures(self, pct: float) -> dict:
         """
@@ -122,20 +176,23 @@ class Position:
         closed_fees = 0.0
         closed_slippage = 0.0
 
+        # Una sola pasada: se reduce cada entrada y se re-acumulan las sumas
+        self._reset_totals()
         for entry in self.entries:
             contracts_to_close = int(entry.contracts * pct)  # floor
-            if contracts_to_close == 0:
-                continue
-            ratio = contracts_to_close / entry.contracts
-            closed_contracts += contracts_to_close
-            closed_fees += entry.fee * ratio
-            closed_slippage += entry.slippage_cost * ratio
+            if contracts_to_close > 0:
+                ratio = contracts_to_close / entry.contracts
+                closed_contracts += contracts_to_close
+                closed_fees += entry.fee * ratio
+                closed_slippage += entry.slippage_cost * ratio
 
-            # Reducir la entrada restante
-            remaining_ratio = 1 - ratio
-            entry.contracts -= contracts_to_close
-            entry.fee *= remaining_ratio
-            entry.slippage_cost *= remaining_ratio
+                # Reducir la entrada restante
+                remaining_ratio = 1 - ratio
+                entry.contracts -= contracts_to_close
+                entry.fee *= remaining_ratio
+                entry.slippage_cost *= remaining_ratio
+
+            self._add_to_totals(entry)
 
         return {
             'total_contracts': closed_contracts,
@@ -161,6 +218,8 @@ class Position:
         closed_fees = 0.0
         closed_slippage = 0.0
 
+        # Una sola pasada: se reduce cada entrada y se re-acumulan las sumas
+        self._reset_totals()
         for entry in self.entries:
             size_closed = entry.size_usdt * pct
             crypto_closed = size_closed / entry.price
@@ -177,6 +236,8 @@ class Position:
             entry.fee -= fee_closed
             entry.slippage_cost -= slip_closed
 
+            self._add_to_totals(entry)
+
         return {
             'total_cost': closed_cost,
             'total_crypto': closed_crypto,
@@ -223,6 +284,11 @@ class BacktestEngine:
             self.fee_fixed = 0.0
             self.fee_rate = market_config['exchange_fee']
 
+        # Slippage precalculado por dirección: real = precio * mult + offset.
+        # Crypto usa solo el multiplicador (offset 0), futuros solo el offset (mult 1).
+        self._slippage_up = (1 + self.slippage_pct, self.slippage_fixed)
+        self._slippage_down = (1 - self.slippage_pct, -self.slippage_fixed)
+
         # Detectar tipo de mercado y campos de futuros
         self.is_futures = 'slippage_ticks' in market_config
         if self.is_futures:
@@ -234,43 +300,86 @@ class BacktestEngine:
 
         # Estado del motor
         self.current_position: Position | None = None
-        self.completed_trades: list[dict] = []
+        # Trades completados en formato columnar (una lista por columna):
+        # el DataFrame final se construye sin convertir un dict por trade
+        self._trade_columns: dict[str, list] = {col: [] for col in RESULT_COLUMNS}
 
     def _is_entry(self, signal: TradingSignal) -> bool:
         """BUY+LONG = entry, SELL+SHORT = entry."""
-        return (
-            (signal.position_side == SignalPositionSide.LONG and signal.signal_type == SignalType.BUY) or
-            (signal.position_side == SignalPositionSide.SHORT and signal.signal_type == SignalType.SELL)
-        )
+        return _SIGNAL_ROUTES.get((signal.position_side, signal.signal_type)) is True
 
     def _is_exit(self, signal: TradingSignal) -> bool:
         """SELL+LONG = exit, BUY+SHORT = exit."""
-        return (
-            (signal.position_side == SignalPositionSide.LONG and signal.signal_type == SignalType.SELL) or
-            (signal.position_side == SignalPositionSide.SHORT and signal.signal_type == SignalType.BUY)
-        )
-
-    def run(self, signals: list[TradingSignal]) -> pd.DataFrame:
+        return _SIGNAL_ROUTES.get((signal.position_side, signal.signal_type)) is False
+
+    def run(
+        self,
+        signals: list[TradingSignal],
+        early_stop_cb: Callable[[int, dict], bool] | None = None,
+        check_every: int = EARLY_STOP_EVERY
+    ) -> pd.DataFrame | None:
         """
         Ejecuta el backtest procesando todas las señales.
 
         Args:
             signals: Lista de TradingSignal en orden cronológico
+            early_stop_cb: Opcional. Se llama cada check_every señales como
+                early_stop_cb(indice_señal, metricas_parciales); si devuelve True
+                el backtest se abandona. Ver _running_metrics() para las claves
+            check_every: Cada cuántas señales se consulta early_stop_cb
 
         Returns:
-            DataFrame con los resultados de todos los trades completados
+            DataFrame con los resultados de todos los trades completados,
+            o None si early_stop_cb detuvo el backtest
         """
-        for signal in signals:
-            if self._is_entry(signal):
-                self._open_position(signal)
-            elif self._is_exit(signal):
-                self._close_position(signal)
+        # Una consulta al dict por señal en vez de hasta 8 comparaciones de enums
+        open_position, close_position = self._open_position, self._close_position
+        if early_stop_cb is None:
+            for signal in signals:
+                is_entry = _SIGNAL_ROUTES.get((signal.position_side, signal.signal_type))
+                if is_entry:
+                    open_position(signal)
+                elif is_entry is not None:
+                    close_position(signal)
+        else:
+            running = {'trades': 0, 'net_pnl': 0.0, 'max_drawdown': 0.0, '_peak': -float('inf')}
+            for idx, signal in enumerate(signals, start=1):
+                is_entry = _SIGNAL_ROUTES.get((signal.position_side, signal.signal_type))
+                if is_entry:
+                    open_position(signal)
+                elif is_entry is not None:
+                    close_position(signal)
+                if idx % check_every == 0 and early_stop_cb(idx, self._running_metrics(running)):
+                    return None
 
         # Si quedó una posición abierta al final, no la incluimos
         # en los resultados porque no sabemos el P&L hasta que se cierre
 
         return self._create_results_dataframe()
 
+    def _running_metrics(self, running: dict) -> dict:
+        """
+        Actualiza las métricas parciales con los trades cerrados desde la última llamada.
+
+        - trades: trades completados
+        - net_pnl: P&L neto acumulado
+        - max_drawdown: máxima caída de la curva de capital por trade, con la misma
+          definición que PortfolioMetrics (pico = máximo del capital tras cada trade).
+          Solo puede crecer: es una cota inferior del max_drawdown final
+        """
+        net_pnl = self._trade_columns['net_pnl']
+        equity = self.initial_capital + running['net_pnl']
+        peak, max_drawdown = running['_peak'], running['max_drawdown']
+        for pnl in net_pnl[running['trades']:]:
+            equity += pnl
+            peak = max(peak, equity)
+            max_drawdown = max(max_drawdown, peak - equity)
+        running.update(
+            trades=len(net_pnl), net_pnl=equity - self.initial_capital,
+            max_drawdown=max_drawdown, _peak=peak
+        )
+        return running
+
     def _open_position(self, signal: TradingSignal):
         """
         Procesa una señal de entrada (apertura o DCA).
@@ -278,7 +387,7 @@ class BacktestEngine:
         Crypto: calcula size en USDT, compra/vende crypto.
         Futuros: calcula contratos por riesgo o usa override, solo paga fee.
         """
-        real_price = self._apply_slippage(signal)
+        real_price = self._apply_slippage(signal, is_entry=True)
         slippage_per_unit = abs(real_price - signal.price)
 
         if self.is_futures:
@@ -316,7 +425,6 @@ class BacktestEngine:
                     entry_time=signal.timestamp
                 )
                 self.current_position.position_side = signal.position_side
-                self.current_position._risk_usd = 0.0
             else:
                 # DCA: verify same direction
                 if self.current_position.position_side != signal.position_side:
@@ -348,7 +456,6 @@ class BacktestEngine:
                     entry_time=signal.timestamp
                 )
                 self.current_position.position_side = signal.position_side
-                self.current_position._risk_usd = 0.0
             else:
                 # DCA: verify same direction
                 if self.current_position.position_side != signal.position_side:
@@ -378,7 +485,7 @@ class BacktestEngine:
 
         pos = self.current_position
         pct = signal.position_size_pct
-        real_price = self._apply_slippage(signal)
+        real_price = self._apply_slippage(signal, is_entry=False)
         slippage_per_unit = abs(signal.price - real_price)
 
         if self.is_futures:
@@ -410,10 +517,10 @@ class BacktestEngine:
 
             self.capital += net_pnl
 
-            risk_usd = getattr(pos, '_risk_usd', 0.0)
+            risk_usd = pos._risk_usd
             pnl_pct = (net_pnl / risk_usd * 100) if risk_usd > 0 else 0
 
-            self.completed_trades.append({
+            self._record_trade({
                 'symbol': pos.symbol,
                 'position_side': pos.position_side.value,
                 'entry_time': pos.entry_time,
@@ -470,7 +577,7 @@ class BacktestEngine:
 
             avg_entry = closed_cost / closed_crypto if closed_crypto > 0 else 0.0
 
-            self.completed_trades.append({
+            self._record_trade({
                 'symbol': pos.symbol,
                 'position_side': pos.position_side.value,
                 'entry_time': pos.entry_time,
@@ -498,26 +605,30 @@ class BacktestEngine:
         if pct >= 1.0:
             self.current_position = None
 
-    def _apply_slippage(self, signal: TradingSignal) -> float:
+    def _record_trade(self, trade: dict):
+        """Añade un trade completado a las columnas de resultados."""
+        for col, value in trade.items():
+            self._trade_columns[col].append(value)
+
+    @property
+    def completed_trades(self) -> list[dict]:
+        """Trades completados como lista de dicts (se materializa bajo demanda)."""
+        columns = self._trade_columns
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    def _apply_slippage(self, signal: TradingSignal, is_entry: bool) -> float:
         """Apply slippage — always against the trader.
 
         Entry LONG or Exit SHORT → price goes UP (trader pays more)
         Entry SHORT or Exit LONG → price goes DOWN (trader receives less)
-        """
-        is_entry = self._is_entry(signal)
-        price_goes_up = (
-            (is_entry and signal.position_side == SignalPositionSide.LONG) or
-            (not is_entry and signal.position_side == SignalPositionSide.SHORT)
-        )
 
-        price = signal.price
-        if self.slippage_fixed > 0:
-            real_price = price + self.slippage_fixed if price_goes_up else price - self.slippage_fixed
-        elif price_goes_up:
-            real_price = price * (1 + self.slippage_pct)
-        else:
-            real_price = price * (1 - self.slippage_pct)
+        is_entry lo pasa el llamador (ya conoce la ruta), en vez de
+        re-evaluar la ruta de la señal en cada ejecución.
+        """
+        price_goes_up = (signal.position_side == SignalPositionSide.LONG) == is_entry
+        mult, offset = self._slippage_up if price_goes_up else self._slippage_down
 
+        real_price = signal.price * mult + offset
         return round(real_price / self.tick_size) * self.tick_size
 
     def _create_results_dataframe(self) -> pd.DataFrame:
@@ -526,15 +637,8 @@ class BacktestEngine:
 
         Este DataFrame es lo que usarás para análisis y visualización.
         """
-        if not self.completed_trades:
+        if not self._trade_columns['symbol']:
             # Si no hubo trades, devolver DataFrame vacío con las columnas
-            return pd.DataFrame(columns=[
-                'symbol', 'position_side', 'entry_time', 'exit_time', 'num_entries',
-                'avg_entry_price', 'exit_price', 'total_cost', 'exit_value',
-                'contracts', 'risk_usd', 'point_value',
-                'total_entry_fees', 'exit_fee', 'total_fees',
-                'entry_slippage', 'exit_slippage', 'total_slippage',
-                'gross_pnl', 'net_pnl', 'capital_after', 'pnl_pct'
-            ])
-
-        return pd.DataFrame(self.completed_trades)
+            return pd.DataFrame(columns=list(RESULT_COLUMNS))
+
+        return pd.DataFrame(self._trade_columns)
@@ -5,10 +5,41 @@ Combina métricas de trade y portfolio en un solo lugar.
 Maneja las conversiones de nombres de columnas automáticamente.
 """
 
+from typing import Literal
+
+import numpy as np
 import pandas as pd
 from metrics.trade_metrics import TradeMetricsCalculator
 from metrics.portfolio_metrics import BacktestMetrics
 
+_SAVE_FORMATS = ('parquet', 'csv', 'feather')
+
+
+# Secciones de print_summary: clave → (título, método de BacktestMetrics)
+_SUMMARY_SECTIONS = {
+    'general': ("💰 RESUMEN GENERAL", 'compute_general_summary'),
+    'pnl': ("📊 ANÁLISIS DE PROFIT/LOSS", 'compute_profit_loss_analysis'),
+    'drawdown': ("📉 DRAWDOWN", 'compute_drawdown_analysis'),
+    'ratios': ("📈 RATIOS DE PERFORMANCE", 'compute_performance_ratios'),
+    'time': ("⏱️ ESTADÍSTICAS DE TIEMPO", 'compute_time_statistics'),
+    'costs': ("💸 COSTOS OPERACIONALES", 'compute_operational_costs'),
+}
+
+_IMPORTANT_TIME_KEYS = (
+    'backtest_duration', 'time_in_market_pct', 'trades_per_day',
+    'avg_winning_trade_duration_min', 'avg_losing_trade_duration_min',
+)
+
+# Línea "  clave: valor" con el format ya ligado (sin reparsear el f-string por métrica)
+_METRIC_LINE = "  {:30s}: {}".format
+
+
+def _format_metric(value) -> str:
+    """Formatea una métrica para mostrar: floats a 2 decimales, NaN como 'N/A'."""
+    if isinstance(value, (float, np.floating)):
+        return "N/A" if np.isnan(value) else f"{value:.2f}"
+    return str(value)
+
 
 class MetricsAggregator:
     """
@@ -31,16 +62,19 @@ class MetricsAggregator:
         aggregator.print_summary()
     """
     
-    def __init__(self, results: pd.DataFrame, strategy):
+    def __init__(self, results: pd.DataFrame, strategy, market_arrays: dict | None = None):
         """
         Inicializa el agregador con los resultados del backtest.
         
         Args:
             results: DataFrame del BacktestEngine
             strategy: Instancia de la estrategia (para acceder a market_data, timeframe, etc.)
+            market_arrays: Opcional. extract_market_arrays(strategy.market_data) ya
+                calculado, para no re-extraerlo en cada backtest
         """
         self.results = results
         self.strategy = strategy
+        self.market_arrays = market_arrays
         
         # Calcular métricas automáticamente
         self._calculate_all_metrics()
@@ -60,7 +94,8 @@ class MetricsAggregator:
             market_data=self.strategy.market_data,
             timeframe=self.strategy.timeframe,
             is_futures=is_futures,
-            point_value=point_value
+            point_value=point_value,
+            market_arrays=self.market_arrays
         )
         
         self.trade_metrics_df = metrics_calculator.create_trade_metrics_df(results_adapted)
@@ -117,84 +152,69 @@ class MetricsAggregator:
                      Opciones: 'general', 'pnl', 'drawdown', 'ratios', 'time', 'costs'
         """
         if sections is None:
-            sections = ['general', 'pnl', 'drawdown', 'ratios', 'time', 'costs']
-        
-        print("\n" + "="*60)
-        print("📊 MÉTRICAS COMPLETAS DEL BACKTEST")
-        print("="*60)
-        
-        if 'general' in sections:
-            print("\n💰 RESUMEN GENERAL")
-            print("-"*60)
-            general = self.portfolio_metrics.compute_general_summary()
-            for key, value in general.items():
-                print(f"  {key:30s}: {value}")
-        
-        if 'pnl' in sections:
-            print("\n📊 ANÁLISIS DE PROFIT/LOSS")
-            print("-"*60)
-            pnl = self.portfolio_metrics.compute_profit_loss_analysis()
-            for key, value in pnl.items():
-                print(f"  {key:30s}: {value}")
-        
-        if 'drawdown' in sections:
-            print("\n📉 DRAWDOWN")
-            print("-"*60)
-            dd = self.portfolio_metrics.compute_drawdown_analysis()
-            for key, value in dd.items():
-                print(f"  {key:30s}: {value}")
-        
-        if 'ratios' in sections:
-            print("\n📈 RATIOS DE PERFORMANCE")
-            print("-"*60)
-            ratios = self.portfolio_metrics.compute_performance_ratios()
-            for key, value in ratios.items():
-                print(f"  {key:30s}: {value}")
-        
-        if 'time' in sections:
-            print("\n⏱️ ESTADÍSTICAS DE TIEMPO")
-            print("-"*60)
-            time_stats = self.portfolio_metrics.compute_time_statistics()
-            # Mostrar solo las más importantes para no saturar
-            important_time_keys = [
-                'backtest_duration', 'time_in_market_pct', 'trades_per_day',
-                'avg_winning_trade_duration_min', 'avg_losing_trade_duration_min'
-            ]
-            for key in important_time_keys:
-                if key in time_stats:
-                    print(f"  {key:30s}: {time_stats[key]}")
-        
-        if 'costs' in sections:
-            print("\n💸 COSTOS OPERACIONALES")
-            print("-"*60)
-            costs = self.portfolio_metrics.compute_operational_costs()
-            for key, value in costs.items():
-                print(f"  {key:30s}: {value}")
-        
-        print("\n" + "="*60)
+            sections = list(_SUMMARY_SECTIONS)
+        
+        lines = ["", "="*60, "📊 MÉTRICAS COMPLETAS DEL BACKTEST", "="*60]
+        
+        for section, (title, method_name) in _SUMMARY_SECTIONS.items():
+            if section not in sections:
+                continue
+            
+            metrics = getattr(self.portfolio_metrics, method_name)()
+            if section == 'time':
+                # Mostrar solo las más importantes para no saturar
+                metrics = {key: metrics[key] for key in _IMPORTANT_TIME_KEYS if key in metrics}
+            
+            lines.extend(("", title, "-"*60))
+            lines.extend(_METRIC_LINE(key, _format_metric(value)) for key, value in metrics.items())
+        
+        lines.extend(("", "="*60))
+        print("\n".join(lines))
     
     @property
     def portfolio_summary_df(self) -> pd.DataFrame:
         """Convierte el diccionario de métricas en un DataFrame para análisis."""
         return pd.DataFrame([self.all_metrics])
     
-    def save_results(self, output_dir: str = 'outputs'):
+    def save_results(
+        self,
+        output_dir: str = 'outputs',
+        format: Literal['parquet', 'csv', 'feather'] = 'parquet'
+    ):
         """
-        Guarda todos los resultados en archivos CSV.
-        
+        Guarda todos los resultados en disco.
+
+        Parquet (default) y Feather son formatos binarios columnares: se escriben
+        mucho más rápido que CSV y ocupan menos espacio. CSV se mantiene como
+        formato legacy para abrir los resultados en Excel u otras herramientas.
+
         Args:
             output_dir: Directorio donde guardar los archivos
+            format: 'parquet' (default), 'feather' o 'csv'.
+                    Parquet y Feather requieren pyarrow (pip install pyarrow)
         """
         import os
+
+        if format not in _SAVE_FORMATS:
+            raise ValueError(
+                f"Formato '{format}' no soportado. Opciones: {list(_SAVE_FORMATS)}"
+            )
+
         os.makedirs(output_dir, exist_ok=True)
-        
-        # Guardar métricas detalladas por trade
-        self.trade_metrics_df.to_csv(f'{output_dir}/trade_metrics.csv', index=False)
-        
-        # Guardar resumen de portfolio
-        self.portfolio_summary_df.to_csv(f'{output_dir}/portfolio_summary.csv', index=False)
-        
-        # Guardar resultados raw del motor
-        self.results.to_csv(f'{output_dir}/engine_results.csv', index=False)
-        
-        print(f"\n✓ Resultados guardados en {output_dir}/")
\ No newline at end of file
+
+        frames = {
+            'trade_metrics': self.trade_metrics_df,        # Métricas detalladas por trade
+            'portfolio_summary': self.portfolio_summary_df,  # Resumen de portfolio
+            'engine_results': self.results,                # Resultados raw del motor
+        }
+
+        for name, df in frames.items():
+            path = f'{output_dir}/{name}.{format}'
+            if format == 'parquet':
+                df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+            elif format == 'feather':
+                df.reset_index(drop=True).to_feather(path)
+            else:
+                df.to_csv(path, index=False)
+
+        print(f"\n✓ Resultados guardados en {output_dir}/ ({format})")
@@ -1,19 +1,153 @@
+from dataclasses import dataclass
+
 import pandas as pd
 import numpy as np
 
+from utils.jit import njit
+
+
+# Contadores de barras por trade: enteros pequeños, exactos en float32, así que
+# las reducciones mueven la mitad de bytes sin cambiar ningún resultado.
+_FLOAT32_COLS = ("duration_bars", "bars_in_loss", "bars_in_profit")
+
+# Columnas monetarias: se quedan en float64. En float32 cada P&L se redondearía
+# antes de sumar y ese error llegaría a net_profit, medias y exports.
+_FLOAT64_COLS = ("net_pnl", "gross_pnl", "total_fees", "slippage_cost")
+
+
+# Horas por barra según la nomenclatura estándar (M1, H4, D1...).
+# Fallback de compute_time_statistics cuando el timeframe no es un objeto Timeframe.
+_TIMEFRAME_HOURS = (
+    {f"M{m}": m / 60 for m in (1, 5, 15, 30)}
+    | {f"H{h}": h for h in (1, 4)}
+    | {"D1": 24, "W1": 24 * 7, "MN1": 24 * 30}
+)
+
+
+def _as_array(values: pd.Series) -> np.ndarray:
+    """Array NumPy de una columna numérica, también si está respaldada por Arrow."""
+    if isinstance(values.dtype, pd.ArrowDtype):
+        return values.to_numpy(dtype=values.dtype.numpy_dtype, na_value=np.nan)
+    return values.to_numpy()
+
+
+def _sum64(values: pd.Series) -> float:
+    """Suma con acumulador float64 (también sobre columnas float32 o Arrow)."""
+    return float(_as_array(values).sum(dtype=np.float64))
+
+
+@njit(cache=True)
+def _moment_stats(returns):
+    """
+    Una sola pasada (Welford) sobre los retornos por trade.
+
+    Returns:
+        (mean, std, downside_std) con ddof=1, igual que pandas.
+        std/downside_std son NaN si hay menos de 2 valores.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    n_neg = 0
+    mean_neg = 0.0
+    m2_neg = 0.0
+
+    for i in range(returns.shape[0]):
+        v = float(returns[i])
+        n += 1
+        delta = v - mean
+        mean += delta / n
+        m2 += delta * (v - mean)
+        if v < 0:
+            n_neg += 1
+            delta_neg = v - mean_neg
+            mean_neg += delta_neg / n_neg
+            m2_neg += delta_neg * (v - mean_neg)
+
+    if n == 0:
+        mean = np.nan
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    downside_std = np.sqrt(m2_neg / (n_neg - 1)) if n_neg > 1 else np.nan
+    return mean, std, downside_std
+
+
+@dataclass
+class _PnLStats:
+    """Agregados de 'net_pnl' compartidos por el resumen, el análisis P&L y los ratios."""
+    n_trades: int
+    n_wins: int
+    n_losses: int
+    sum_wins: float
+    sum_losses: float      # Negativo (suma de las pérdidas)
+    sum_pnl: float
+    mean_pnl: float
+    std_pnl: float
+    max_win: float
+    max_loss: float        # El trade más negativo
+    mean_win: float
+    mean_loss: float
+    downside_std: float
+
 
 class BacktestMetrics:
-    def __init__(self, trade_data: pd.DataFrame, initial_capital: float):
+    def __init__(self, trade_data: pd.DataFrame, initial_capital: float, use_arrow: bool = False):
         """
         Inicializa el cálculo de métricas del backtest.
         :param trade_data: DataFrame con los datos de cada trade (salida de TradeMetricsCalculator)
         :param initial_capital: Capital inicial utilizado en el backtest.
+        :param use_arrow: Si True, las columnas numéricas por trade usan dtypes de PyArrow
+                          (float64[pyarrow] / float32[pyarrow]): máscaras, sumas y cummax corren
+                          en kernels de Arrow. Requiere pyarrow. Default: dtypes NumPy.
         """
-        self.trade_data = trade_data
+        if use_arrow:
+            import pyarrow as pa
+            float32_dtype, float64_dtype = pd.ArrowDtype(pa.float32()), pd.ArrowDtype(pa.float64())
+        else:
+            float32_dtype, float64_dtype = np.float32, np.float64
+
+        dtypes = {col: float32_dtype for col in _FLOAT32_COLS}
+        dtypes.update({col: float64_dtype for col in _FLOAT64_COLS})
+        self.trade_data = trade_data.astype(
+            {col: dtype for col, dtype in dtypes.items() if col in trade_data.columns}
+        )
         self.initial_capital = initial_capital
         
         # Extraer la moneda del DataFrame, si está disponible
         self.currency = trade_data.get("currency", pd.Series(["USDT"])).iloc[0] if not trade_data.empty else "USDT"
+
+        # Timestamps como datetime64[ns]: las duraciones se calculan con aritmética
+        # timedelta64 en NumPy, sin objetos Timestamp/Timedelta de pandas
+        self._entry_times = pd.to_datetime(self.trade_data["entry_time"]).to_numpy(dtype="datetime64[ns]")
+        self._exit_times = pd.to_datetime(self.trade_data["exit_time"]).to_numpy(dtype="datetime64[ns]")
+
+        # Agregados de net_pnl: se calculan una sola vez y los comparten todas las secciones
+        self._pnl_stats = self._aggregate_pnl_stats()
+
+    def _aggregate_pnl_stats(self) -> _PnLStats:
+        """
+        Recorre 'net_pnl' una sola vez (más un pase por ganadores y otro por perdedores)
+        y devuelve todos los agregados que necesitan las distintas secciones.
+        """
+        pnl = _as_array(self.trade_data["net_pnl"])
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        mean_pnl, std_pnl, downside_std = _moment_stats(pnl)
+
+        return _PnLStats(
+            n_trades=int(pnl.size),
+            n_wins=int(wins.size),
+            n_losses=int(losses.size),
+            sum_wins=float(wins.sum(dtype=np.float64)),
+            sum_losses=float(losses.sum(dtype=np.float64)),
+            sum_pnl=float(pnl.sum(dtype=np.float64)),
+            mean_pnl=float(mean_pnl),
+            std_pnl=float(std_pnl),
+            max_win=float(wins.max()) if wins.size > 0 else 0,
+            max_loss=float(losses.min()) if losses.size > 0 else 0,
+            mean_win=float(wins.mean(dtype=np.float64)) if wins.size > 0 else 0,
+            mean_loss=float(losses.mean(dtype=np.float64)) if losses.size > 0 else 0,
+            downside_std=float(downside_std),
+        )
     
     def compute_all_metrics(self) -> dict:
         """
@@ -35,53 +169,46 @@ class BacktestMetrics:
         """
         Calcula el resumen general del backtest.
         """
-        total_trades = len(self.trade_data)
-        winning_trades_net = self.trade_data[self.trade_data["net_pnl"] > 0]
-        losing_trades_net = self.trade_data[self.trade_data["net_pnl"] < 0]
+        stats = self._pnl_stats
+        total_trades = stats.n_trades
         
         # (A) Beneficio bruto total (suma de 'gross_pnl')
-        gross_profit = self.trade_data["gross_pnl"].sum()
+        gross_profit = _sum64(self.trade_data["gross_pnl"])
         
         # (B) Beneficio neto total (suma de 'net_pnl')
-        net_profit = self.trade_data["net_pnl"].sum()
-        
-        # (C) Calcular costos totales (solo fees, ya que slippage está en el precio)
-        total_fees = self.trade_data["total_fees"].sum()
-        total_costs = total_fees  # ✅ Solo consideramos fees como costos
+        net_profit = stats.sum_pnl
         
         # (E) Otras métricas
-        total_profit_net = winning_trades_net["net_pnl"].sum()
-        total_loss_net = abs(losing_trades_net["net_pnl"].sum())
+        total_profit_net = stats.sum_wins
+        total_loss_net = abs(stats.sum_losses)
         profit_factor = total_profit_net / total_loss_net if total_loss_net > 0 else np.nan
         
         # ✅ MEJORA: Mover las métricas relevantes al resumen general
-        num_wins_net = len(winning_trades_net)
-        num_loss_net = len(losing_trades_net)
+        num_wins_net = stats.n_wins
+        num_loss_net = stats.n_losses
         win_loss_ratio = (num_wins_net / num_loss_net) if num_loss_net > 0 else np.nan
         
         expectancy = 0.0
-        if len(self.trade_data) > 0:
-            avg_winning_trade = winning_trades_net["net_pnl"].mean() if not winning_trades_net.empty else 0
-            avg_losing_trade = losing_trades_net["net_pnl"].mean() if not losing_trades_net.empty else 0
-            expectancy = ((avg_winning_trade * num_wins_net) -
-                        (abs(avg_losing_trade) * num_loss_net)) / len(self.trade_data)
+        if total_trades > 0:
+            expectancy = ((stats.mean_win * num_wins_net) -
+                        (abs(stats.mean_loss) * num_loss_net)) / total_trades
         
         percent_profitable = 0.0
         if total_trades > 0:
-            percent_profitable = (len(winning_trades_net) / total_trades) * 100
+            percent_profitable = (num_wins_net / total_trades) * 100
         
         # Calcular el ROI sobre el capital inicial
         roi_percentage = (net_profit / self.initial_capital) * 100 if self.initial_capital > 0 else 0
         
         result = {
-            "gross_profit": round(gross_profit, 2),
-            "net_profit": round(net_profit, 2),
-            "ROI": round(roi_percentage, 2),
+            "gross_profit": gross_profit,
+            "net_profit": net_profit,
+            "ROI": roi_percentage,
             "total_trades": total_trades,
-            "percent_profitable": round(percent_profitable, 2),
-            "profit_factor": round(profit_factor, 2),
-            "win_loss_ratio": round(win_loss_ratio, 2) if not np.isnan(win_loss_ratio) else "N/A",
-            "expectancy": round(expectancy, 2),
+            "percent_profitable": percent_profitable,
+            "profit_factor": profit_factor,
+            "win_loss_ratio": win_loss_ratio,
+            "expectancy": expectancy,
         }
         
         return result
@@ -104,13 +231,9 @@ class BacktestMetrics:
         # 'gross_profit' = suma total bruta (ganancias + pérdidas)
         gross_profit = total_gross_profit + total_gross_loss
         
-        # Rachas ganadoras y perdedoras (en NET)
-        winning_trades_net = self.trade_data[self.trade_data["net_pnl"] > 0]
-        losing_trades_net = self.trade_data[self.trade_data["net_pnl"] < 0]
-   
         # ✅ FIX: Cálculo correcto de rachas consecutivas
-        # Crear una serie con 1 para ganadores, 0 para perdedores
-        win_streak = (self.trade_data["net_pnl"] > 0).astype(int)
+        # Lista de bools (True = ganador): iterar una lista evita el boxing de pandas por elemento
+        win_streak = (_as_array(self.trade_data["net_pnl"]) > 0).tolist()
         
         # Inicializar contadores
         current_win_streak = 0
@@ -120,7 +243,7 @@ class BacktestMetrics:
         
         # Iterar a través de los resultados de los trades
         for is_win in win_streak:
-            if is_win == 1:
+            if is_win:
                 # Trade ganador
                 current_win_streak += 1
                 current_loss_streak = 0
@@ -134,34 +257,35 @@ class BacktestMetrics:
                 max_loss_streak = max(max_loss_streak, current_loss_streak)
         
         # Estadísticas de trades individuales (netas)
-        avg_trade_net_profit = self.trade_data["net_pnl"].mean()
-        avg_winning_trade = winning_trades_net["net_pnl"].mean() if not winning_trades_net.empty else 0
-        avg_losing_trade = losing_trades_net["net_pnl"].mean() if not losing_trades_net.empty else 0
-        largest_winning_trade = winning_trades_net["net_pnl"].max() if not winning_trades_net.empty else 0
-        largest_losing_trade = losing_trades_net["net_pnl"].min() if not losing_trades_net.empty else 0
+        stats = self._pnl_stats
+        avg_trade_net_profit = stats.mean_pnl
+        avg_winning_trade = stats.mean_win
+        avg_losing_trade = stats.mean_loss
+        largest_winning_trade = stats.max_win
+        largest_losing_trade = stats.max_loss
         
         # Porcentaje de ganancia/pérdida media por trade
-        avg_winning_pct = (winning_trades_net["net_pnl"] / self.initial_capital * 100).mean() if not winning_trades_net.empty else 0
-        avg_losing_pct = (losing_trades_net["net_pnl"] / self.initial_capital * 100).mean() if not losing_trades_net.empty else 0
+        avg_winning_pct = stats.mean_win / self.initial_capital * 100
+        avg_losing_pct = stats.mean_loss / self.initial_capital * 100
         
-        std_profit = self.trade_data["net_pnl"].std()
+        std_profit = stats.std_pnl
         
         return {
             # Bruto
-            "total_gross_profit": round(total_gross_profit, 2),
-            "total_gross_loss": round(total_gross_loss, 2),
+            "total_gross_profit": total_gross_profit,
+            "total_gross_loss": total_gross_loss,
             # Rachas (en neto)
             "max_consecutive_wins": max_win_streak,
             "max_consecutive_losses": max_loss_streak,
             # Estadísticas netas
-            "avg_trade_net_profit": round(avg_trade_net_profit, 2),
-            "avg_winning_trade": round(avg_winning_trade, 2),
-            "avg_losing_trade": round(avg_losing_trade, 2),
-            "avg_winning_trade_pct": round(avg_winning_pct, 2),
-            "avg_losing_trade_pct": round(avg_losing_pct, 2),
-            "largest_winning_trade": round(largest_winning_trade, 2),
-            "largest_losing_trade": round(largest_losing_trade, 2),
-            "std_profit": round(std_profit, 2),
+            "avg_trade_net_profit": avg_trade_net_profit,
+            "avg_winning_trade": avg_winning_trade,
+            "avg_losing_trade": avg_losing_trade,
+            "avg_winning_trade_pct": avg_winning_pct,
+            "avg_losing_trade_pct": avg_losing_pct,
+            "largest_winning_trade": largest_winning_trade,
+            "largest_losing_trade": largest_losing_trade,
+            "std_profit": std_profit,
         }
   
     def calculate_average_trade_durations_in_bars(self) -> tuple:
@@ -174,7 +298,7 @@ class BacktestMetrics:
         avg_bars_positive = winning_trades["duration_bars"].mean() if not winning_trades.empty else 0
         avg_bars_negative = losing_trades["duration_bars"].mean() if not losing_trades.empty else 0
         
-        return round(avg_bars_positive, 2), round(avg_bars_negative, 2)
+        return avg_bars_positive, avg_bars_negative
     
     def compute_drawdown_analysis(self) -> dict:
         """
@@ -183,10 +307,11 @@ class BacktestMetrics:
         - Duración del drawdown
         - Drawdown medio
         """
-        cumulative_capital = self.trade_data["cumulative_capital"]
+        # Trabajar sobre el array NumPy: evita el dispatch de pandas en cada operación
+        cumulative_capital = _as_array(self.trade_data["cumulative_capital"]).astype(np.float64, copy=False)
         
         # 1. Calcular los picos de capital
-        peak_capital = cumulative_capital.cummax()
+        peak_capital = np.maximum.accumulate(cumulative_capital)
         
         # 2. Calcular el drawdown como la caída desde el pico
         drawdown = peak_capital - cumulative_capital
@@ -195,20 +320,24 @@ class BacktestMetrics:
         max_drawdown = drawdown.max()
         
         # 4. Porcentaje de Drawdown Máximo respecto al pico máximo
-        max_drawdown_pct = (max_drawdown / peak_capital.max()) * 100 if peak_capital.max() > 0 else 0
+        # (el pico es monótono, así que su máximo es el último valor)
+        peak_max = peak_capital[-1]
+        max_drawdown_pct = (max_drawdown / peak_max) * 100 if peak_max > 0 else 0
         
-        # 5. Duración del Drawdown: Tiempo entre el máximo drawdown y la recuperación del capital
-        drawdown_periods = (drawdown > 0).astype(int)  # 1 si hay drawdown, 0 si no
-        drawdown_duration = drawdown_periods.groupby((drawdown_periods != drawdown_periods.shift()).cumsum()).cumsum().max()
+        # 5. Duración del Drawdown: racha más larga de trades consecutivos en drawdown
+        in_drawdown = np.concatenate(([0], (drawdown > 0).view(np.int8), [0]))
+        edges = np.diff(in_drawdown)
+        run_lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        drawdown_duration = run_lengths.max() if run_lengths.size else 0
         
         # 6. 📌 Drawdown Medio 📌 (Promedio de todos los drawdowns registrados)
         avg_drawdown = drawdown.mean()
         
         return {
-            "max_drawdown": round(max_drawdown, 2),
-            "max_drawdown_pct": round(max_drawdown_pct, 2),
+            "max_drawdown": max_drawdown,
+            "max_drawdown_pct": max_drawdown_pct,
             "drawdown_duration": int(drawdown_duration),
-            "avg_drawdown": round(avg_drawdown, 2),
+            "avg_drawdown": avg_drawdown,
         }
  
     def compute_time_statistics(self) -> dict:
@@ -218,8 +347,8 @@ class BacktestMetrics:
         """
         # 1. Convertir timestamps a segundos para calcular duración en tiempo real
         self.trade_data["trade_duration_seconds"] = (
-            pd.to_datetime(self.trade_data["exit_time"]) - pd.to_datetime(self.trade_data["entry_time"])
-        ).dt.total_seconds()
+            (self._exit_times - self._entry_times) / np.timedelta64(1, "s")
+        )
         
         winning_trades = self.trade_data[self.trade_data["net_pnl"] > 0]
         losing_trades = self.trade_data[self.trade_data["net_pnl"] < 0]
@@ -256,16 +385,15 @@ class BacktestMetrics:
         total_time_in_trades = self.trade_data["trade_duration_seconds"].sum()
         
         # 6. Calcular duración total del backtest
-        backtest_start = pd.to_datetime(self.trade_data["entry_time"]).min()
-        backtest_end = pd.to_datetime(self.trade_data["exit_time"]).max()
-        total_backtest_duration = (backtest_end - backtest_start).total_seconds()
+        if self._entry_times.size > 0:
+            backtest_span = self._exit_times.max() - self._entry_times.min()
+        else:
+            backtest_span = np.timedelta64(0, "ns")
+        total_backtest_duration = backtest_span / np.timedelta64(1, "s")
         
         # Convertir a formato más legible (días, horas, minutos)
-        days = int(total_backtest_duration // (24 * 3600))
-        remaining = total_backtest_duration % (24 * 3600)
-        hours = int(remaining // 3600)
-        remaining %= 3600
-        minutes = int(remaining // 60)
+        days, remaining_min = divmod(int(backtest_span // np.timedelta64(1, "m")), 24 * 60)
+        hours, minutes = divmod(remaining_min, 60)
         
         backtest_duration_str = ""
         if days > 0:
@@ -299,22 +427,8 @@ class BacktestMetrics:
                 # Extraer del string del timeframe si no es un objeto Timeframe
                 timeframe_str = str(tf_obj).split(".")[-1] if tf_obj else "M1"
                 
-                # Convertir a horas basado en la nomenclatura estándar
-                if timeframe_str.startswith("M"):
-                    # Formatos como M1, M5, M15, M30
-                    minutes = int(timeframe_str[1:]) if len(timeframe_str) > 1 else 1
-                    timeframe_hours = minutes / 60
-                elif timeframe_str.startswith("H"):
-                    # Formatos como H1, H4
-                    timeframe_hours = int(timeframe_str[1:]) if len(timeframe_str) > 1 else 1
-                elif timeframe_str == "D1":
-                    timeframe_hours = 24  # 1 día = 24 horas
-                elif timeframe_str == "W1":
-                    timeframe_hours = 24 * 7  # 1 semana = 168 horas
-                elif timeframe_str == "MN1":
-                    timeframe_hours = 24 * 30  # 1 mes ≈ 720 horas
-                else:
-                    timeframe_hours = 1/60  # Valor por defecto: 1 minuto
+                # Convertir a horas basado en la nomenclatura estándar (default: 1 minuto)
+                timeframe_hours = _TIMEFRAME_HOURS.get(timeframe_str, 1/60)
 
         # Convertir periodos de barras a minutos usando el timeframe
         bar_to_minutes = timeframe_hours * 60
@@ -325,19 +439,19 @@ class BacktestMetrics:
         
         return {
             "backtest_duration": backtest_duration_str,
-            "avg_winning_trade_duration_min": round(avg_winning_trade_duration_minutes, 2),
-            "avg_losing_trade_duration_min": round(avg_losing_trade_duration_minutes, 2),
-            "avg_winning_trade_duration_bars": round(avg_winning_trade_duration_bars, 2),
-            "avg_losing_trade_duration_bars": round(avg_losing_trade_duration_bars, 2),
-            "max_trade_duration_min": round(max_trade_duration_minutes, 2),
-            "min_trade_duration_min": round(min_trade_duration_minutes, 2),
-            "time_in_market_pct": round(time_in_market_pct, 2),
-            "time_in_market_hours": round(time_in_market_hours, 2),
-            "trades_per_day": round(trades_per_day, 2),
-            "avg_bars_in_loss_winners": round(avg_bars_in_loss_winners, 2),
-            "avg_bars_in_profit_winners": round(avg_bars_in_profit_winners, 2),
-            "avg_bars_in_loss_losers": round(avg_bars_in_loss_losers, 2),
-            "avg_bars_in_profit_losers": round(avg_bars_in_profit_losers, 2),
+            "avg_winning_trade_duration_min": avg_winning_trade_duration_minutes,
+            "avg_losing_trade_duration_min": avg_losing_trade_duration_minutes,
+            "avg_winning_trade_duration_bars": avg_winning_trade_duration_bars,
+            "avg_losing_trade_duration_bars": avg_losing_trade_duration_bars,
+            "max_trade_duration_min": max_trade_duration_minutes,
+            "min_trade_duration_min": min_trade_duration_minutes,
+            "time_in_market_pct": time_in_market_pct,
+            "time_in_market_hours": time_in_market_hours,
+            "trades_per_day": trades_per_day,
+            "avg_bars_in_loss_winners": avg_bars_in_loss_winners,
+            "avg_bars_in_profit_winners": avg_bars_in_profit_winners,
+            "avg_bars_in_loss_losers": avg_bars_in_loss_losers,
+            "avg_bars_in_profit_losers": avg_bars_in_profit_losers,
             "timeframe": timeframe_str,
             "timeframe_hours": timeframe_hours,
             "bar_to_minutes": bar_to_minutes,
@@ -351,10 +465,10 @@ class BacktestMetrics:
         - Factor de Recuperación
         - Índice de TradeStation (TS Index)
         """
-        returns = self.trade_data["net_pnl"]  # Retornos por trade
-        mean_return = returns.mean()
-        std_return = returns.std()  # Desviación estándar de los retornos
-        downside_std = returns[returns < 0].std()  # Desviación estándar de pérdidas
+        stats = self._pnl_stats
+        mean_return = stats.mean_pnl
+        std_return = stats.std_pnl  # Desviación estándar de los retornos
+        downside_std = stats.downside_std  # Desviación estándar de pérdidas
         
         # 1. Índice de Sharpe: Exceso de retorno sobre la volatilidad total
         sharpe_ratio = mean_return / std_return if std_return > 0 else np.nan
@@ -365,20 +479,20 @@ class BacktestMetrics:
         # 3. Factor de Recuperación: Beneficio Neto / Máximo Drawdown
         drawdown_analysis = self.compute_drawdown_analysis()
         max_drawdown = drawdown_analysis["max_drawdown"]
-        recovery_factor = (self.compute_general_summary()["net_profit"] / max_drawdown) if max_drawdown > 0 else np.nan
+        recovery_factor = (stats.sum_pnl / max_drawdown) if max_drawdown > 0 else np.nan
         
         return {
-            "sharpe_ratio": round(sharpe_ratio, 2),
-            "sortino_ratio": round(sortino_ratio, 2),
-            "recovery_factor": round(recovery_factor, 2),
+            "sharpe_ratio": sharpe_ratio,
+            "sortino_ratio": sortino_ratio,
+            "recovery_factor": recovery_factor,
         }
  
     def compute_operational_costs(self) -> dict:
         """
         Calcula los costos operacionales del backtest:
         """
-        total_fees = self.trade_data["total_fees"].sum()
-        total_slippage_cost = self.trade_data["slippage_cost"].sum() if "slippage_cost" in self.trade_data.columns else 0
+        total_fees = _sum64(self.trade_data["total_fees"])
+        total_slippage_cost = _sum64(self.trade_data["slippage_cost"]) if "slippage_cost" in self.trade_data.columns else 0
         total_costs = total_fees  # ✅ FIX: Solo fees para cálculos de P&L
         
         # Tomamos 'gross_profit' de la sumatoria global (compute_general_summary)
@@ -397,10 +511,10 @@ class BacktestMetrics:
         fees_pct_of_capital = (total_fees / self.initial_capital) * 100 if self.initial_capital > 0 else 0
         
         return {
-            "total_fees": round(total_fees, 2),
-            "total_slippage_cost": round(total_slippage_cost, 2),  # Solo informativo
-            "total_costs": round(total_fees, 2),  # ✅ Solo fees, no incluir slippage
-            "avg_fee_per_trade": round(avg_fee_per_trade, 2),
-            "fees_pct_of_capital": round(fees_pct_of_capital, 2),
-            "costs_as_pct_of_gross_profit": round(costs_as_pct_of_gross_profit, 2) if not np.isnan(costs_as_pct_of_gross_profit) else "N/A",
+            "total_fees": total_fees,
+            "total_slippage_cost": total_slippage_cost,  # Solo informativo
+            "total_costs": total_fees,  # ✅ Solo fees, no incluir slippage
+            "avg_fee_per_trade": avg_fee_per_trade,
+            "fees_pct_of_capital": fees_pct_of_capital,
+            "costs_as_pct_of_gross_profit": costs_as_pct_of_gross_profit,
         }
\ No newline at end of file
@@ -1,50 +1,156 @@
+from dataclasses import dataclass
+
 import pandas as pd
 import numpy as np
+from utils.jit import njit
 from utils.timeframe import Timeframe, prepare_datetime_data
 
+
+def _normalize_side(value) -> str:
+    """Normaliza position_side: 'SignalPositionSide.LONG', 'long', ... → 'LONG'."""
+    return str(value).replace("SignalPositionSide.", "").upper()
+
+
+@njit(cache=True)
+def _trade_window_stats(low, high, close, start, end, entry_prices, is_long):
+    """
+    Recorre una sola vez las barras [start, end) de cada trade y devuelve
+    (min_low, max_high, bars_in_loss, bars_in_profit).
+
+    - min/max ignoran NaN (como Series.min()/max()); ventana vacía → NaN.
+    - LONG está en pérdida si close < entry_price; SHORT si close > entry_price.
+      Con sign = +1 (LONG) / -1 (SHORT) ambos casos son (close - entry) * sign < 0,
+      sin rama por barra. is_long es un array int8 (1 = LONG, 0 = SHORT).
+    """
+    n = len(start)
+    min_low = np.full(n, np.nan)
+    max_high = np.full(n, np.nan)
+    bars_in_loss = np.zeros(n, dtype=np.int64)
+    bars_in_profit = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        lo = np.inf
+        hi = -np.inf
+        loss = 0
+        entry = entry_prices[i]
+        sign = 2 * is_long[i] - 1
+        for j in range(start[i], end[i]):
+            if low[j] < lo:
+                lo = low[j]
+            if high[j] > hi:
+                hi = high[j]
+            loss += (close[j] - entry) * sign < 0
+        if lo != np.inf:
+            min_low[i] = lo
+        if hi != -np.inf:
+            max_high[i] = hi
+        bars_in_loss[i] = loss
+        bars_in_profit[i] = max(end[i] - start[i], 0) - loss
+    return min_low, max_high, bars_in_loss, bars_in_profit
+
+
+@dataclass
+class _TradeWindowStats:
+    """Resultados de la pasada única sobre la ventana de mercado de cada trade."""
+    has_data: np.ndarray        # True si el trade tiene barras de mercado en su rango
+    is_long: np.ndarray         # int8: 1 = LONG, 0 = SHORT
+    min_price: np.ndarray
+    max_price: np.ndarray
+    bars_in_loss: np.ndarray
+    bars_in_profit: np.ndarray
+
+
+# Columnas que consulta prepare_datetime_data (fuentes de fecha y temporales ya existentes)
+_TEMPORAL_INPUT_COLUMNS = (
+    'entry_datetime', 'entry_timestamp', 'entry_time', 'timestamp', 'date', 'time',
+    'hour', 'day_of_week', 'day', 'month', 'year', 'quarter', 'week',
+)
+
+
+def extract_market_arrays(market_data: pd.DataFrame) -> dict:
+    """
+    Extrae de market_data los arrays que usa TradeMetricsCalculator:
+    'index_ns' (índice temporal como int64 ns, para searchsorted directo sobre
+    NumPy) y 'close' / 'low' / 'high' para el kernel de ventanas.
+
+    Se pueden extraer una sola vez y reutilizar en varios backtests sobre los
+    mismos datos (ver ParameterOptimizer).
+    """
+    # Precios en float64: el entry_price suele coincidir con un Close y en
+    # float32 esa igualdad se rompe, cambiando bars_in_loss/bars_in_profit.
+    # Fallbacks: sin 'Low'/'High' se usa 'Close'; sin 'Close', la primera columna
+    columns = market_data.columns
+    close_col = "Close" if "Close" in columns else columns[0]
+    close = market_data[close_col].to_numpy(np.float64)
+    return {
+        "index_ns": market_data.index.to_numpy("datetime64[ns]").view("i8"),
+        "close": close,
+        "low": market_data["Low"].to_numpy(np.float64) if "Low" in columns else close,
+        "high": market_data["High"].to_numpy(np.float64) if "High" in columns else close,
+    }
+
+
 class TradeMetricsCalculator:
     def __init__(self, initial_capital: float, market_data: pd.DataFrame, timeframe: Timeframe,
-                 is_futures: bool = False, point_value: float = 0.0):
+                 is_futures: bool = False, point_value: float = 0.0,
+                 market_arrays: dict | None = None):
         self.initial_capital = initial_capital
         self.market_data = market_data
         self.timeframe = timeframe
         self.is_futures = is_futures
         self.point_value = point_value
 
+        # Arrays de market_data, extraídos una sola vez (o recibidos ya
+        # extraídos con extract_market_arrays sobre el mismo market_data)
+        if market_arrays is None:
+            market_arrays = extract_market_arrays(market_data)
+        self._index_ns = market_arrays["index_ns"]
+        self._close = market_arrays["close"]
+        self._low = market_arrays["low"]
+        self._high = market_arrays["high"]
+
     def create_trade_metrics_df(self, trade_data: pd.DataFrame) -> pd.DataFrame:
         """
         Función principal que genera el DataFrame con todas las métricas.
         Coordina la ejecución de los métodos privados que encapsulan cada lógica.
+
+        Cada paso devuelve sus columnas nuevas en un dict; el DataFrame final se
+        ensambla una sola vez al terminar, sin copiar trade_data por adelantado.
         """
-        # 1. Copiamos el DataFrame para no modificar el original
-        df = trade_data.copy()
+        # 1. Copia superficial: solo se reemplazan columnas completas (df[col] = ...),
+        #    nunca se escribe en los arrays de trade_data
+        df = trade_data.copy(deep=False)
 
         # 2. Preparamos los datos (columnas de timestamp, side, etc.)
         df = self._prepare_data(df)
-        
-        # 3. Procesamiento temporal - NUEVO: Añadir columnas de análisis temporal
-        df = prepare_datetime_data(df)
+
+        derived = {}
+
+        # 3. Procesamiento temporal: columnas de análisis temporal
+        derived.update(self._add_temporal_columns(df))
 
         # 4. Añadir la duración en barras
-        df = self._add_duration_bars(df)
+        derived.update(self._add_duration_bars(df))
 
-        # 5. Añadir tiempo en pérdida/ganancia
-        df = self._add_time_in_profit_loss(df)
+        # 5. Recorrer una sola vez la ventana de mercado de cada trade
+        window_stats = self._compute_trade_window_stats(df)
 
-        # 6. Calcular MAE, MFE, Volatilidad y Eficiencia de ganancia
-        df = self._add_mae_mfe_volatility_efficiency(df)
-        
-        # 7. Calcular el drawdown del trade
-        df = self._add_trade_drawdown(df)
+        # 6. Añadir tiempo en pérdida/ganancia
+        derived.update(self._add_time_in_profit_loss(df, window_stats))
+
+        # 7. Calcular MAE, MFE, Volatilidad y Eficiencia de ganancia
+        derived.update(self._add_mae_mfe_volatility_efficiency(df, window_stats))
+
+        # 8. Calcular el drawdown del trade
+        derived.update(self._add_trade_drawdown(df, derived))
 
-        # 8. Calcular la relación riesgo-beneficio (risk_reward_ratio)
-        df = self._add_risk_reward_ratio(df)
+        # 9. Calcular la relación riesgo-beneficio (risk_reward_ratio)
+        derived.update(self._add_risk_reward_ratio(derived))
 
-        # 9. Calcular el riesgo aplicado, retorno sobre capital y capital acumulado
-        df = self._add_risk_management_metrics(df)
+        # 10. Calcular el riesgo aplicado, retorno sobre capital y capital acumulado
+        derived.update(self._add_risk_management_metrics(df))
 
-        # 10. Redondear a 2 decimales y devolver el DF
-        return df.round(2)
+        # 11. Ensamblar, redondear a 2 decimales y devolver el DF
+        return pd.concat([df, pd.DataFrame(derived, index=df.index)], axis=1).round(2)
 
     # -------------------------------------------------------------------------
     #                             MÉTODOS PRIVADOS
@@ -53,17 +159,18 @@ class TradeMetricsCalculator:
         """
         Se encarga de convertir tipos de dato (timestamps) y normalizar columnas.
         """
-        df["entry_timestamp"] = pd.to_datetime(df["entry_timestamp"])
-        df["exit_timestamp"] = pd.to_datetime(df["exit_timestamp"])
+        # Formato ISO explícito: evita la inferencia de formato por elemento si llegan como texto
+        # (si ya son datetime64, pd.to_datetime no hace nada)
+        df["entry_timestamp"] = pd.to_datetime(df["entry_timestamp"], format="ISO8601", cache=True)
+        df["exit_timestamp"] = pd.to_datetime(df["exit_timestamp"], format="ISO8601", cache=True)
         
         # 🔧 Manejar position_side de forma más robusta
         if "position_side" in df.columns:
-            df["position_side"] = (
-                df["position_side"]
-                .astype(str)
-                .str.replace("SignalPositionSide.", "", regex=False)
-                .str.upper()
-            )
+            # Solo hay un puñado de valores distintos: normalizar cada uno una vez
+            # y mapear, en vez de aplicar replace/upper fila a fila
+            sides = df["position_side"]
+            mapping = {value: _normalize_side(value) for value in sides.unique()}
+            df["position_side"] = sides.map(mapping).astype("category")
         else:
             raise ValueError(
                 "trade_data must include 'position_side' column. "
@@ -72,231 +179,175 @@ class TradeMetricsCalculator:
         
         return df
 
-    def _add_duration_bars(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_temporal_columns(self, df: pd.DataFrame) -> dict:
         """
-        Añade la columna 'duration_bars' al DF, calculada según el timeframe.
+        Columnas temporales (hour, day_of_week, month, ...) de prepare_datetime_data.
+        Se le pasa solo el subconjunto de columnas que consulta, no el DF completo.
         """
-        bar_seconds = self.timeframe.hours * 3600
-        duration = pd.to_datetime(df["exit_timestamp"]) - pd.to_datetime(df["entry_timestamp"])
-        df["duration_bars"] = duration.dt.total_seconds() / bar_seconds
-        return df
+        source = df[[col for col in df.columns if col in _TEMPORAL_INPUT_COLUMNS]]
+        temporal = prepare_datetime_data(source)
+        return {col: temporal[col] for col in temporal.columns if col not in source.columns}
+
+    def _add_duration_bars(self, df: pd.DataFrame) -> dict:
+        """
+        Columna 'duration_bars', calculada según el timeframe.
+        """
+        # Los timestamps ya vienen como datetime64 de _prepare_data: resta directa en NumPy
+        duration = df["exit_timestamp"].to_numpy("datetime64[ns]") - df["entry_timestamp"].to_numpy("datetime64[ns]")
+        return {"duration_bars": duration / np.timedelta64(1, "h") / self.timeframe.hours}
 
-    def _add_mae_mfe_volatility_efficiency(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_mae_mfe_volatility_efficiency(self, df: pd.DataFrame, stats: _TradeWindowStats) -> dict:
         """
-        Itera sobre cada trade para calcular MAE, MFE, Volatilidad y Profit Efficiency.
+        Calcula MAE, MFE, Volatilidad y Profit Efficiency de todos los trades a la vez,
+        a partir del mínimo/máximo de precio de la ventana de cada trade.
         """
-        maes = []
-        mfes = []
-        volatilities = []
-        profit_efficiencies = []
-
-        for _, row in df.iterrows():
-            mae, mfe, min_price, max_price = self._calculate_mae_mfe(
-                row["entry_timestamp"],
-                row["exit_timestamp"],
-                row["entry_price"],
-                row.get("contracts", 0) * self.point_value if self.is_futures else row["usdt_amount"],
-                row["position_side"]
+        entry_price = df["entry_price"].to_numpy(np.float64)
+        is_long = stats.is_long
+        min_price, max_price = stats.min_price, stats.max_price
+
+        if self.is_futures:
+            # quantity = contracts * point_value (dollar multiplier)
+            contracts = df["contracts"].to_numpy(np.float64) if "contracts" in df.columns else np.zeros(len(df))
+            units = contracts * self.point_value
+        else:
+            # quantity = usdt_amount (crypto)
+            units = df["usdt_amount"].to_numpy(np.float64) / entry_price
+
+        mae = np.where(is_long, entry_price - min_price, max_price - entry_price) * units
+        mfe = np.where(is_long, max_price - entry_price, entry_price - min_price) * units
+
+        # Profit Efficiency en %, limitada entre 0% y 100%
+        with np.errstate(divide="ignore", invalid="ignore"):
+            profit_efficiency = np.where(
+                mfe > 0,
+                np.clip(df["net_profit_loss"].to_numpy(np.float64) / mfe * 100, 0, 100),
+                0.0
             )
-            maes.append(round(mae, 2))
-            mfes.append(round(mfe, 2))
-
-            # Volatilidad en porcentaje
-            if pd.notna(max_price) and pd.notna(min_price):
-                trade_volatility = ((max_price - min_price) / row["entry_price"]) * 100
-            else:
-                trade_volatility = np.nan
-            volatilities.append(round(trade_volatility, 2) if not np.isnan(trade_volatility) else np.nan)
-
-            # Profit Efficiency en %
-            if mfe > 0:
-                profit_efficiency = (row["net_profit_loss"] / mfe) * 100
-                # Limitar entre 0% y 100%
-                profit_efficiency = min(max(profit_efficiency, 0), 100)
-            else:
-                profit_efficiency = 0
-            profit_efficiencies.append(round(profit_efficiency, 2))
-
-        df["MAE"] = maes
-        df["MFE"] = mfes
-        df["trade_volatility"] = volatilities
-        df["profit_efficiency"] = profit_efficiencies
 
-        return df
+        return {
+            "MAE": mae,
+            "MFE": mfe,
+            # Volatilidad en porcentaje (NaN si no hay barras en el rango)
+            "trade_volatility": (max_price - min_price) / entry_price * 100,
+            "profit_efficiency": profit_efficiency,
+        }
 
-    def _add_risk_reward_ratio(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_risk_reward_ratio(self, derived: dict) -> dict:
         """
-        Añade la columna 'risk_reward_ratio' usando MAE y MFE.
+        Columna 'risk_reward_ratio' usando MAE y MFE.
         """
-        df["risk_reward_ratio"] = np.where(
-            df["MAE"] > 0,
-            df["MFE"] / df["MAE"],
-            np.nan
-        )
-        return df
-
-    def _add_risk_management_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
+        mae = np.asarray(derived["MAE"], dtype=np.float64)
+        mfe = np.asarray(derived["MFE"], dtype=np.float64)
+        # Solo se divide donde MAE > 0; el resto queda en NaN
+        risk_reward = np.full_like(mae, np.nan)
+        np.divide(mfe, mae, out=risk_reward, where=mae > 0)
+        return {"risk_reward_ratio": risk_reward}
+
+    def _add_risk_management_metrics(self, df: pd.DataFrame) -> dict:
         """
-        Añade las columnas de riesgo aplicado, retorno sobre capital y capital acumulado.
+        Columnas de riesgo aplicado, retorno sobre capital y capital acumulado.
         """
-        riesgo_aplicado = []
-        return_on_capital = []
-        capital_previo = self.initial_capital
-
-        for _, row in df.iterrows():
-            # Riesgo aplicado en %
-            if self.is_futures and row.get("risk_usd", 0) > 0:
-                riesgo = (row["risk_usd"] / capital_previo) * 100
-            else:
-                riesgo = (row["usdt_amount"] / capital_previo) * 100
-            # Retorno sobre capital en %
-            roc = (row["net_profit_loss"] / capital_previo) * 100
-
-            riesgo_aplicado.append(round(riesgo, 2))
-            return_on_capital.append(round(roc, 2))
+        net_pnl = df["net_profit_loss"].to_numpy(np.float64)
 
-            # Actualizar capital
-            capital_previo += row["net_profit_loss"]
+        # Capital previo a cada trade: initial, initial + pnl0, initial + pnl0 + pnl1, ...
+        # (misma suma secuencial que el bucle original, sin iterar)
+        capital_previo = np.cumsum(np.concatenate(([self.initial_capital], net_pnl)))[:-1]
 
-        df["riesgo_aplicado"] = riesgo_aplicado
-        df["return_on_capital"] = return_on_capital
-        df["cumulative_capital"] = self.initial_capital + df["net_profit_loss"].cumsum()
+        # Riesgo aplicado en %
+        exposure = df["usdt_amount"].to_numpy(np.float64)
+        if self.is_futures and "risk_usd" in df.columns:
+            risk_usd = df["risk_usd"].to_numpy(np.float64)
+            exposure = np.where(risk_usd > 0, risk_usd, exposure)
 
-        return df
+        return {
+            "riesgo_aplicado": exposure / capital_previo * 100,
+            # Retorno sobre capital en %
+            "return_on_capital": net_pnl / capital_previo * 100,
+            "cumulative_capital": self.initial_capital + np.cumsum(net_pnl),
+        }
 
     # -------------------------------------------------------------------------
     #                         MÉTODOS DE UTILIDAD
     # -------------------------------------------------------------------------
-    def _convert_duration_to_bars(self, entry_ts: pd.Timestamp, exit_ts: pd.Timestamp) -> float:
+    def _trade_window_bounds(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
         """
-        Convierte la diferencia de tiempo entre entry_ts y exit_ts a 'barras'
-        según el timeframe configurado.
+        Devuelve los índices [start, end) de market_data que cubre cada trade.
+        Equivale a market_data.loc[entry_ts:exit_ts] (ambos extremos incluidos).
         """
-        duration_seconds = (exit_ts - entry_ts).total_seconds()
-        bar_duration_seconds = self.timeframe.hours * 3600
-        return duration_seconds / bar_duration_seconds
+        entry_ns = df["entry_timestamp"].to_numpy("datetime64[ns]").view("i8")
+        exit_ns = df["exit_timestamp"].to_numpy("datetime64[ns]").view("i8")
+        start = np.searchsorted(self._index_ns, entry_ns, side="left")
+        end = np.searchsorted(self._index_ns, exit_ns, side="right")
+        return start, end
 
-    def _calculate_mae_mfe(self,
-                        entry_ts: pd.Timestamp,
-                        exit_ts: pd.Timestamp,
-                        entry_price: float,
-                        quantity: float,
-                        position_side: str) -> tuple:
+    def _side_is_long(self, df: pd.DataFrame, has_data: np.ndarray) -> np.ndarray:
         """
-        Calcula MAE y MFE en función de los precios mínimo y máximo
-        entre el timestamp de entrada y salida.
+        Devuelve un array int8 1=LONG / 0=SHORT para cada trade, calculado una sola vez.
+        Lanza ValueError si algún trade con datos de mercado tiene otro lado.
         """
-        sub_data = self.market_data.loc[entry_ts:exit_ts]
-
-        if not sub_data.empty:
-            # Se asume que el DF de market_data tiene columnas 'Low' y 'High'; 
-            # en caso de que no, usamos 'Close' como fallback.
-            min_price = sub_data["Low"].min() if "Low" in sub_data.columns else sub_data["Close"].min()
-            max_price = sub_data["High"].max() if "High" in sub_data.columns else sub_data["Close"].max()
-
-            if self.is_futures:
-                # quantity = contracts * point_value (dollar multiplier)
-                if position_side.upper() == "LONG":
-                    mae = (entry_price - min_price) * quantity
-                    mfe = (max_price - entry_price) * quantity
-                elif position_side.upper() == "SHORT":
-                    mae = (max_price - entry_price) * quantity
-                    mfe = (entry_price - min_price) * quantity
-                else:
-                    raise ValueError(f"position_side invalido: {position_side}")
-            else:
-                # quantity = usdt_amount (crypto)
-                if position_side.upper() == "LONG":
-                    mae = (entry_price - min_price) * (quantity / entry_price)
-                    mfe = (max_price - entry_price) * (quantity / entry_price)
-                elif position_side.upper() == "SHORT":
-                    mae = (max_price - entry_price) * (quantity / entry_price)
-                    mfe = (entry_price - min_price) * (quantity / entry_price)
-                else:
-                    raise ValueError(f"position_side invalido: {position_side}")
-        else:
-            mae, mfe, min_price, max_price = np.nan, np.nan, np.nan, np.nan
-
-        return mae, mfe, min_price, max_price
-
-    def _calculate_time_in_profit_loss(self,
-                                    entry_ts: pd.Timestamp,
-                                    exit_ts: pd.Timestamp,
-                                    entry_price: float,
-                                    position_side: str) -> tuple:
+        # position_side es categórica: la comparación se hace sobre los códigos
+        sides = df["position_side"]
+        is_long = (sides == "LONG").to_numpy(dtype=np.int8)
+        invalid = has_data & (is_long == 0) & (sides != "SHORT").to_numpy(dtype=bool)
+        if invalid.any():
+            raise ValueError(f"position_side invalido: {sides[invalid].iloc[0]}")
+        return is_long
+
+    def _compute_trade_window_stats(self, df: pd.DataFrame) -> _TradeWindowStats:
         """
-        Retorna una tupla (bars_in_loss, bars_in_profit) indicando cuántas barras
-        estuvo la posición en pérdidas y cuántas en ganancias entre entry_ts y exit_ts.
+        Obtiene en una sola pasada sobre market_data el mínimo/máximo de precio y
+        las barras en pérdida/ganancia de cada trade.
         """
+        start, end = self._trade_window_bounds(df)
+        has_data = end > start
+        is_long = self._side_is_long(df, has_data)
+
+        min_price, max_price, bars_in_loss, bars_in_profit = _trade_window_stats(
+            self._low, self._high, self._close,
+            start, end,
+            df["entry_price"].to_numpy(np.float64),
+            is_long,
+        )
+        return _TradeWindowStats(has_data, is_long, min_price, max_price, bars_in_loss, bars_in_profit)
 
-        # 1. Filtramos datos de mercado en el rango de la operación
-        sub_data = self.market_data.loc[entry_ts:exit_ts]
-
-        # Si no hay datos en ese rango, devolvemos NaN
-        if sub_data.empty:
-            return np.nan, np.nan
-
-        # 2. Usamos el precio de cierre para determinar profit o pérdida
-        if "Close" in sub_data.columns:
-            close_prices = sub_data["Close"]
-        else:
-            # Fallback: si no existe 'Close', tomamos la primera columna disponible
-            close_prices = sub_data.iloc[:, 0]
-
-        # 3. Definir cuándo está en pérdidas y cuándo en ganancias
-        if position_side.upper() == "LONG":
-            in_loss_mask = close_prices < entry_price   # precio actual < precio entrada
-        elif position_side.upper() == "SHORT":
-            in_loss_mask = close_prices > entry_price   # precio actual > precio entrada
-        else:
-            raise ValueError(f"⚠️ `position_side` inválido: {position_side}.")
-
-        # 4. Contar barras en pérdida y en ganancia
-        bars_in_loss = in_loss_mask.sum()
-        bars_in_profit = len(sub_data) - bars_in_loss
-
-        # 5. Devolver la tupla
-        return bars_in_loss, bars_in_profit
-    
+    def _convert_duration_to_bars(self, entry_ts: pd.Timestamp, exit_ts: pd.Timestamp) -> float:
+        """
+        Convierte la diferencia de tiempo entre entry_ts y exit_ts a 'barras'
+        según el timeframe configurado.
+        """
+        duration_seconds = (exit_ts - entry_ts).total_seconds()
+        bar_duration_seconds = self.timeframe.hours * 3600
+        return duration_seconds / bar_duration_seconds
 
-    def _add_time_in_profit_loss(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_time_in_profit_loss(self, df: pd.DataFrame, stats: _TradeWindowStats) -> dict:
         """
-        Añade dos columnas al DataFrame:
+        Devuelve dos columnas:
         - 'bars_in_loss': cuántas barras estuvo el trade en pérdidas
         - 'bars_in_profit': cuántas barras estuvo el trade en ganancias
-        """
-        bars_in_loss_list = []
-        bars_in_profit_list = []
-
-        for _, row in df.iterrows():
-            bil, bip = self._calculate_time_in_profit_loss(
-                entry_ts=row["entry_timestamp"],
-                exit_ts=row["exit_timestamp"],
-                entry_price=row["entry_price"],
-                position_side=row["position_side"]
-            )
-            bars_in_loss_list.append(bil)
-            bars_in_profit_list.append(bip)
 
-        df["bars_in_loss"] = bars_in_loss_list
-        df["bars_in_profit"] = bars_in_profit_list
+        Se usa el precio de cierre de cada barra del rango [entry, exit].
+        Si no hay datos de mercado en el rango, ambas columnas son NaN.
+        """
+        bars_in_loss, bars_in_profit = stats.bars_in_loss, stats.bars_in_profit
+        if not stats.has_data.all():
+            bars_in_loss = np.where(stats.has_data, bars_in_loss, np.nan)
+            bars_in_profit = np.where(stats.has_data, bars_in_profit, np.nan)
 
         # Si en vez de barras, quieres la duración en horas:
-        # df["hours_in_loss"] = df["bars_in_loss"] * self.timeframe.hours
-        # df["hours_in_profit"] = df["bars_in_profit"] * self.timeframe.hours
+        # "hours_in_loss": bars_in_loss * self.timeframe.hours
+        # "hours_in_profit": bars_in_profit * self.timeframe.hours
 
-        return df
+        return {"bars_in_loss": bars_in_loss, "bars_in_profit": bars_in_profit}
 
-    def _add_trade_drawdown(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_trade_drawdown(self, df: pd.DataFrame, derived: dict) -> dict:
         """
-        Calcula y agrega la métrica 'trade_drawdown (%)' al DataFrame.
+        Calcula la métrica 'trade_drawdown (%)' a partir del MAE.
         """
+        mae = derived["MAE"]
         if self.is_futures and "risk_usd" in df.columns:
-            df["trade_drawdown"] = np.where(
-                df["risk_usd"] > 0,
-                (df["MAE"] / df["risk_usd"]) * 100,
-                0.0
-            )
+            risk_usd = df["risk_usd"].to_numpy(np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                trade_drawdown = np.where(risk_usd > 0, (mae / risk_usd) * 100, 0.0)
         else:
-            df["trade_drawdown"] = (df["MAE"] / df["entry_price"]) * 100
-        return df
\ No newline at end of file
+            trade_drawdown = (mae / df["entry_price"].to_numpy(np.float64)) * 100
+        return {"trade_drawdown": trade_drawdown}
\ No newline at end of file
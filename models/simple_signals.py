@@ -9,17 +9,21 @@ cuando la señal se ejecuta.
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Optional, Sequence
+
+import numpy as np
+
 from models.enums import SignalType, SignalPositionSide  # Importar desde enums.py
 
-@dataclass
+@dataclass(slots=True)
 class TradingSignal:
     """
     Una señal de trading simple.
     
     Representa únicamente la DECISIÓN de comprar o vender en un momento dado.
     No calcula costos, no tiene validaciones complejas, no lleva metadatos
-    innecesarios. Es información pura.
+    innecesarios. Es información pura. Usa slots: las estrategias crean
+    una por cada barra con señal.
     
     Campos:
         timestamp: Momento exacto en que se genera la señal (del índice del DataFrame)
@@ -75,6 +79,50 @@ class TradingSignal:
                 f"contracts debe ser >= 1 si se provee, "
                 f"recibido: {self.contracts}"
             )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamps: Sequence[datetime],
+        signal_types: Sequence[SignalType],
+        prices: Sequence[float],
+        position_size_pcts: Sequence[float],
+        symbol: str,
+        position_side: SignalPositionSide = SignalPositionSide.LONG
+    ) -> list["TradingSignal"]:
+        """
+        Crea muchas señales de una vez (una por posición de los arrays).
+
+        Aplica las mismas validaciones que __post_init__, pero vectorizadas sobre
+        todos los precios / tamaños, y luego rellena cada objeto sin pasar por
+        __init__ (~2x más rápido que construirlos uno a uno). Los valores se
+        guardan tal cual vienen (p. ej. np.float64 si prices es un array).
+        """
+        price_arr = np.asarray(prices, dtype=np.float64)
+        size_arr = np.asarray(position_size_pcts, dtype=np.float64)
+        if (price_arr <= 0).any():
+            raise ValueError(f"El precio debe ser positivo, recibido: {price_arr[price_arr <= 0][0]}")
+        invalid_size = ~((size_arr > 0) & (size_arr <= 1))
+        if invalid_size.any():
+            raise ValueError(
+                f"position_size_pct debe estar entre 0 y 1 (0% a 100%), "
+                f"recibido: {size_arr[invalid_size][0]}"
+            )
+
+        new = object.__new__
+        signals = []
+        for timestamp, signal_type, price, size in zip(timestamps, signal_types, prices, position_size_pcts):
+            signal = new(cls)
+            signal.timestamp = timestamp
+            signal.signal_type = signal_type
+            signal.symbol = symbol
+            signal.price = price
+            signal.position_size_pct = size
+            signal.position_side = position_side
+            signal.stop_loss_price = None
+            signal.contracts = None
+            signals.append(signal)
+        return signals
     
     def __repr__(self):
         """Representación legible de la señal para debugging."""
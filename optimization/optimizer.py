@@ -5,17 +5,187 @@ Usa Grid Search para probar todas las combinaciones de parámetros especificadas
 y retorna la mejor según la métrica elegida.
 """
 
+import csv
 import inspect
+import itertools
+import math
+import os
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
 from core.backtest_runner import BacktestRunner
+from metrics.trade_metrics import extract_market_arrays
+from strategies.base_strategy import quiet_strategies
 from .results import OptimizationResult
 
 
+# Columnas de métricas de get_summary(): (columna, clave en all_metrics).
+# 'roi' se lee de 'ROI' (mayúsculas), que es como lo devuelve portfolio_metrics
+_SUMMARY_METRICS = (
+    ('sharpe_ratio', 'sharpe_ratio'),
+    ('roi', 'ROI'),
+    ('max_drawdown', 'max_drawdown'),
+    ('profit_factor', 'profit_factor'),
+    ('total_trades', 'total_trades'),
+)
+
+
+def _metric_key(metric: str) -> str:
+    """Clave en all_metrics de la métrica objetivo (p. ej. 'roi' → 'ROI')."""
+    return dict(_SUMMARY_METRICS).get(metric, metric)
+
+
+# Métodos de búsqueda de optimize() → nombre para el encabezado
+_SEARCH_METHODS = {
+    'grid': 'Grid Search',
+    'random': 'Random Search',
+    'bayes': 'Bayesian Search',
+}
+
+
+def _require_n_iter(n_iter: Optional[int]) -> int:
+    """Valida n_iter de las búsquedas 'random' y 'bayes'."""
+    if n_iter is None or n_iter < 1:
+        raise ValueError("❌ method='random'/'bayes' requiere n_iter >= 1")
+    return n_iter
+
+
+def _unique_values(values: List[Any]) -> List[Any]:
+    """Quita valores repetidos de una lista de param_ranges conservando el orden."""
+    try:
+        return list(dict.fromkeys(values))
+    except TypeError:
+        return list(values)  # Valores no hasheables: se dejan tal cual
+
+
+def _csv_value(value: Any) -> Any:
+    """Valor de una celda de export_results(): None/NaN como celda vacía (igual que to_csv)."""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return value
+
+
+# Parámetros de BaseStrategy.__init__ que las estrategias reenvían por **kwargs
+# (no aparecen en la firma de la subclase pero se pueden optimizar)
+_BASE_STRATEGY_PARAMS = ('initial_capital', 'slippage', 'fees')
+
+
+# Estado de cada proceso worker: se fija una vez en _init_worker para no
+# serializar market_data en cada combinación
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _signal_key(strategy_class: type, full_params: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Clave de caché de señales: valores de los parámetros que declara la estrategia
+    en SIGNAL_PARAMS (más el símbolo, que va dentro de cada señal). None si la
+    estrategia no los declara (sin caché).
+    """
+    signal_params = getattr(strategy_class, 'SIGNAL_PARAMS', None)
+    if signal_params is None:
+        return None
+    return (full_params.get('symbol'),) + tuple(full_params.get(name) for name in signal_params)
+
+
+def _uses_signal_cache(strategy_class: type, param_ranges: Dict[str, List[Any]]) -> bool:
+    """
+    True si cachear señales puede dar aciertos: la estrategia declara SIGNAL_PARAMS
+    y algún parámetro fuera de ellos toma más de un valor. Si no, cada combinación
+    tiene su propia clave y la caché solo retendría señales que nadie vuelve a leer.
+    """
+    signal_params = getattr(strategy_class, 'SIGNAL_PARAMS', None)
+    if signal_params is None:
+        return False
+    return any(name not in signal_params and len(values) > 1 for name, values in param_ranges.items())
+
+
+def _run_single(
+    strategy_class: type,
+    market_data: pd.DataFrame,
+    fixed_params: Dict[str, Any],
+    params: Dict[str, Any],
+    signal_cache: Optional[Dict[tuple, list]] = None,
+    early_stop_cb: Optional[Callable[[int, dict], bool]] = None,
+    market_arrays: Optional[Dict[str, np.ndarray]] = None
+) -> Tuple[Optional[Dict[str, Any]], float, Optional[str]]:
+    """
+    Ejecuta el backtest de una combinación de parámetros.
+
+    Si se pasa signal_cache, las combinaciones que solo difieren en parámetros
+    fuera de SIGNAL_PARAMS reutilizan las señales ya generadas. market_arrays
+    (extract_market_arrays(market_data)) evita re-extraer los arrays de precios
+    en cada combinación.
+
+    Returns:
+        (métricas, tiempo de ejecución, error). Si el backtest falla,
+        métricas es None y error contiene el mensaje. Si early_stop_cb lo
+        podó, métricas y error son None.
+    """
+    start_time = time.time()
+    try:
+        # Combinar parámetros fijos + variables
+        full_params = {**fixed_params, **params}
+
+        # Sin los mensajes de carga / configuración / señales de cada combinación
+        with quiet_strategies():
+            # ✅ INYECCIÓN DE DATOS: Pasar market_data a la estrategia
+            strategy = strategy_class(data=market_data, **full_params)
+
+            # Reutilizar señales de una combinación con los mismos parámetros de señal
+            key = _signal_key(strategy_class, full_params) if signal_cache is not None else None
+            signals = signal_cache.get(key) if key is not None else None
+            if key is not None and signals is None:
+                signals = signal_cache[key] = strategy.generate_simple_signals()
+
+            # Ejecutar backtest
+            # Los arrays solo valen si la estrategia trabaja sobre el mismo DataFrame
+            # (las estrategias añaden columnas in-place, no reemplazan market_data)
+            if strategy.market_data is not market_data:
+                market_arrays = None
+            runner = BacktestRunner(strategy, market_arrays=market_arrays)
+            runner.run(verbose=False, signals=signals, early_stop_cb=early_stop_cb)
+        if runner.metrics is None:
+            return None, time.time() - start_time, None
+
+        return runner.metrics.all_metrics, time.time() - start_time, None
+    except Exception as e:
+        # Registrar errores pero continuar
+        return None, time.time() - start_time, str(e)
+
+
+def _init_worker(
+    strategy_class: type,
+    market_data: pd.DataFrame,
+    fixed_params: Dict[str, Any],
+    cache_signals: bool
+) -> None:
+    """Inicializador de ProcessPoolExecutor: recibe los datos una sola vez por proceso."""
+    _WORKER_STATE.update(
+        strategy_class=strategy_class,
+        market_data=market_data,
+        fixed_params=fixed_params,
+        signal_cache={} if cache_signals else None,
+        market_arrays=extract_market_arrays(market_data),
+    )
+
+
+def _run_in_worker(params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], float, Optional[str]]:
+    """Ejecuta una combinación dentro de un worker usando el estado de _init_worker."""
+    return _run_single(
+        _WORKER_STATE['strategy_class'],
+        _WORKER_STATE['market_data'],
+        _WORKER_STATE['fixed_params'],
+        params,
+        _WORKER_STATE['signal_cache'],
+        market_arrays=_WORKER_STATE['market_arrays'],
+    )
+
+
 class ParameterOptimizer:
     """
     Optimizador de parámetros usando Grid Search.
@@ -52,9 +222,23 @@ class ParameterOptimizer:
         self.best_score: float = -float('inf')
         self.target_metric: str = 'sharpe_ratio'
 
+        # Caché de get_summary(): válida mientras no cambien results ni target_metric
+        self._summary_cache: Optional[pd.DataFrame] = None
+        self._summary_key: Optional[Tuple[int, str]] = None
+
+        # Arrays de precios/índice de market_data (extract_market_arrays), se
+        # extraen una vez en la primera optimización y valen para todas las combinaciones
+        self._market_arrays: Optional[Dict[str, np.ndarray]] = None
+
         # Validar que la estrategia es válida
         self._validate_strategy()
 
+    def _get_market_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays de market_data para TradeMetricsCalculator, extraídos una sola vez."""
+        if self._market_arrays is None:
+            self._market_arrays = extract_market_arrays(self.market_data)
+        return self._market_arrays
+
     def _validate_strategy(self) -> None:
         """Verifica que la estrategia tenga el método generate_simple_signals"""
         if not hasattr(self.strategy_class, 'generate_simple_signals'):
@@ -66,6 +250,8 @@ class ParameterOptimizer:
     def _validate_params(self, param_ranges: Dict[str, List[Any]]) -> None:
         """
         Valida que los parámetros en param_ranges existan en el __init__ de la estrategia.
+        Si el __init__ acepta **kwargs (los reenvía a BaseStrategy), también valen
+        los de _BASE_STRATEGY_PARAMS (initial_capital, slippage, fees).
 
         Args:
             param_ranges: Diccionario con parámetros a optimizar
@@ -74,8 +260,11 @@ class ParameterOptimizer:
             ValueError: Si hay parámetros inválidos
         """
         # Obtener parámetros válidos del __init__
-        sig = inspect.signature(self.strategy_class.__init__)
-        valid_params = set(sig.parameters.keys()) - {'self'}
+        parameters = inspect.signature(self.strategy_class.__init__).parameters
+        var_keyword = {name for name, p in parameters.items() if p.kind is inspect.Parameter.VAR_KEYWORD}
+        valid_params = set(parameters) - {'self'} - var_keyword
+        if var_keyword:
+            valid_params |= set(_BASE_STRATEGY_PARAMS)
 
         # Detectar parámetros inválidos
         invalid = set(param_ranges.keys()) - valid_params
@@ -89,24 +278,30 @@ class ParameterOptimizer:
     def _generate_grid(
         self,
         param_ranges: Dict[str, List[Any]],
-        method: str = 'grid'
-    ) -> List[Dict[str, Any]]:
+        method: str = 'grid',
+        n_iter: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Genera todas las combinaciones de parámetros.
+        Genera las combinaciones de parámetros (de forma perezosa).
 
         Args:
             param_ranges: Diccionario donde cada clave es un parámetro y valor es lista de valores
-            method: 'grid' para grid search (único soportado en v1)
+            method: 'grid' (todas las combinaciones) o 'random' (n_iter combinaciones
+                    distintas de la rejilla, elegidas al azar y devueltas en orden de rejilla)
+            n_iter: Número de combinaciones para 'random'
+            seed: Semilla para 'random' (reproducible)
 
         Returns:
-            Lista de diccionarios, cada uno una combinación de parámetros
+            Iterador de diccionarios, cada uno una combinación de parámetros.
+            Cada dict se crea al consumirlo: la rejilla completa no se guarda en memoria
 
         Example:
             param_ranges = {
                 'lookback_period': [10, 20],
                 'position_size_pct': [0.3, 0.4]
             }
-            # Retorna:
+            # Genera (en este orden):
             # [
             #   {'lookback_period': 10, 'position_size_pct': 0.3},
             #   {'lookback_period': 10, 'position_size_pct': 0.4},
@@ -114,28 +309,121 @@ class ParameterOptimizer:
             #   {'lookback_period': 20, 'position_size_pct': 0.4},
             # ]
         """
-        if method != 'grid':
-            raise ValueError(f"❌ Método '{method}' no soportado (solo 'grid' en v1)")
+        if method not in _SEARCH_METHODS or method == 'bayes':
+            raise ValueError(f"❌ Método '{method}' no soportado en _generate_grid (opciones: 'grid', 'random')")
+
+        keys = tuple(param_ranges.keys())
+        values = tuple(param_ranges.values())
+
+        if method == 'random':
+            # Índices planos distintos de la rejilla → índice de cada parámetro
+            shape = tuple(len(v) for v in values)
+            total = math.prod(shape)
+            rng = np.random.default_rng(seed)
+            flat = np.sort(rng.choice(total, size=min(_require_n_iter(n_iter), total), replace=False))
+            indices = zip(*np.unravel_index(flat, shape)) if total else ()
+            return (
+                {key: vals[i] for key, vals, i in zip(keys, values, combo)}
+                for combo in indices
+            )
 
-        import itertools
+        # itertools.product genera todas las combinaciones
+        return (dict(zip(keys, combo)) for combo in itertools.product(*values))
 
-        keys = param_ranges.keys()
-        values = param_ranges.values()
+    def _skip_duplicates(self, combinations: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Omite las combinaciones cuya forma canónica (canonicalize_params de la
+        estrategia, si lo define) ya se ha generado antes.
+        """
+        canonicalize = getattr(self.strategy_class, 'canonicalize_params', None)
+        seen = set()
+        skipped = 0
+        for params in combinations:
+            canonical = canonicalize(dict(params)) if canonicalize is not None else params
+            try:
+                key = tuple(sorted(canonical.items(), key=lambda item: item[0]))
+                if key in seen:
+                    skipped += 1
+                    continue
+                seen.add(key)
+            except TypeError:
+                pass  # Valores no hasheables: se ejecuta sin deduplicar
+            yield params
+
+        if skipped:
+            print(f"\n⏭️ {skipped} combinaciones duplicadas omitidas")
+
+    def _bayes_outcomes(
+        self,
+        param_ranges: Dict[str, List[Any]],
+        metric: str,
+        n_iter: int,
+        seed: Optional[int]
+    ) -> Iterator[Tuple[Dict[str, Any], Tuple[Optional[Dict[str, Any]], float, Optional[str]]]]:
+        """
+        Búsqueda bayesiana (scikit-optimize): cada combinación se elige a partir de
+        los resultados anteriores, así que se ejecuta secuencialmente.
 
-        # itertools.product genera todas las combinaciones
-        combinations = [
-            dict(zip(keys, combo))
-            for combo in itertools.product(*values)
+        Cada parámetro es una dimensión entera sobre el índice de su lista de valores.
+        Una combinación ya evaluada no se vuelve a ejecutar ni a registrar.
+
+        Yields:
+            (params, (métricas, tiempo, error)) por cada combinación nueva
+        """
+        try:
+            from skopt import Optimizer
+            from skopt.space import Categorical, Integer
+        except ImportError as e:
+            raise ImportError(
+                "❌ method='bayes' requiere scikit-optimize (pip install scikit-optimize)"
+            ) from e
+
+        names = list(param_ranges)
+        values = list(param_ranges.values())
+        # Integer necesita low < high: un parámetro con un solo valor es categórico
+        dimensions = [
+            Integer(0, len(v) - 1, name=name) if len(v) > 1 else Categorical([0], name=name)
+            for name, v in zip(names, values)
         ]
+        search = Optimizer(dimensions, random_state=seed, n_initial_points=min(10, n_iter))
+
+        # skopt minimiza: max_drawdown ya es "menor es mejor", el resto se invierte
+        sign = 1.0 if metric == 'max_drawdown' else -1.0
+        metric_key = _metric_key(metric)
+        losses: Dict[tuple, float] = {}
+        signal_cache = {} if _uses_signal_cache(self.strategy_class, param_ranges) else None
+        market_arrays = self._get_market_arrays()
+
+        for _ in range(n_iter):
+            point = [int(i) for i in search.ask()]
+            key = tuple(point)
+
+            if key not in losses:
+                params = {name: v[i] for name, v, i in zip(names, values, point)}
+                outcome = _run_single(
+                    self.strategy_class, self.market_data, self.fixed_params, params,
+                    signal_cache, market_arrays=market_arrays
+                )
+                score = outcome[0].get(metric_key) if outcome[0] is not None else None
+                if score is None or not np.isfinite(score):
+                    # Sin métrica válida: la peor pérdida vista hasta ahora
+                    losses[key] = max(losses.values(), default=0.0)
+                else:
+                    losses[key] = sign * float(score)
+                yield params, outcome
 
-        return combinations
+            search.tell(point, losses[key])
 
     def optimize(
         self,
         param_ranges: Dict[str, List[Any]],
         metric: str = 'sharpe_ratio',
         method: str = 'grid',
-        show_progress: bool = True
+        show_progress: bool = True,
+        n_jobs: int = 1,
+        n_iter: Optional[int] = None,
+        seed: Optional[int] = None,
+        prune: bool = False
     ) -> pd.DataFrame:
         """
         Ejecuta la optimización de parámetros.
@@ -143,8 +431,17 @@ class ParameterOptimizer:
         Args:
             param_ranges: Diccionario con parámetros a probar y sus valores
             metric: Métrica para evaluar (sharpe_ratio, roi, profit_factor, etc.)
-            method: Método de búsqueda ('grid' en v1)
+            method: Método de búsqueda: 'grid' (todas las combinaciones), 'random'
+                    (n_iter combinaciones al azar) o 'bayes' (n_iter iteraciones con
+                    scikit-optimize; siempre secuencial)
             show_progress: Mostrar barra de progreso
+            n_jobs: Procesos en paralelo (1 = secuencial, -1 = todos los cores).
+                    En paralelo la estrategia debe ser importable (definida a nivel de módulo)
+            n_iter: Combinaciones a evaluar con 'random' / 'bayes'
+            seed: Semilla de 'random' / 'bayes' (reproducible)
+            prune: Abandonar a mitad las combinaciones que ya no pueden superar a
+                   la mejor (ver _make_pruner). Solo en 'grid'/'random' secuencial;
+                   las podadas quedan en results con pruned=True
 
         Returns:
             DataFrame con todos los resultados ordenados por la métrica
@@ -156,100 +453,186 @@ class ParameterOptimizer:
         self._validate_params(param_ranges)
         if metric not in ['sharpe_ratio', 'roi', 'profit_factor', 'max_drawdown', 'sortino_ratio']:
             raise ValueError(f"❌ Métrica desconocida: {metric}")
+        if method not in _SEARCH_METHODS:
+            raise ValueError(f"❌ Método '{method}' no soportado (opciones: {list(_SEARCH_METHODS)})")
 
         self.target_metric = metric
+        self._summary_cache = None
+
+        # Valores repetidos en un mismo parámetro generarían backtests idénticos
+        param_ranges = {name: _unique_values(values) for name, values in param_ranges.items()}
 
         # Generar combinaciones
-        combinations = self._generate_grid(param_ranges, method)
-        total = len(combinations)
+        total = math.prod(len(values) for values in param_ranges.values())
+        if method == 'bayes':
+            total = _require_n_iter(n_iter)
+            n_workers = 1  # Cada punto depende de los anteriores
+        else:
+            combinations = self._skip_duplicates(self._generate_grid(param_ranges, method, n_iter, seed))
+            if method == 'random':
+                total = min(n_iter, total)
+            n_workers = min(self._resolve_n_jobs(n_jobs), total)
 
         print(f"\n{'='*70}")
-        print(f"🎯 OPTIMIZACIÓN DE PARÁMETROS - Grid Search")
+        print(f"🎯 OPTIMIZACIÓN DE PARÁMETROS - {_SEARCH_METHODS[method]}")
         print(f"{'='*70}")
         print(f"Estrategia: {self.strategy_class.__name__}")
         print(f"Total de combinaciones: {total}")
         print(f"Parámetros fijos: {self.fixed_params}")
         print(f"Métrica objetivo: {metric}")
+        if n_workers > 1:
+            print(f"Procesos: {n_workers}")
+        if prune and (n_workers > 1 or method == 'bayes'):
+            print("⚠️ prune solo aplica a la búsqueda secuencial 'grid'/'random': se ignora")
         print(f"{'='*70}\n")
 
+        if method == 'bayes':
+            outcomes = self._bayes_outcomes(param_ranges, metric, total, seed)
+            self._collect_results(outcomes, total, metric, show_progress)
+        elif n_workers > 1:
+            # Cada worker recibe market_data una vez (initializer); map conserva el
+            # orden de las combinaciones, así el resultado no depende de qué termine antes
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_worker,
+                initargs=(
+                    self.strategy_class, self.market_data, self.fixed_params,
+                    _uses_signal_cache(self.strategy_class, param_ranges)
+                )
+            ) as executor:
+                # executor.map envía todas las tareas al empezar: en paralelo la
+                # rejilla sí se materializa (tee guarda los params para emparejarlos)
+                chunksize = max(1, total // (n_workers * 4))
+                params_iter, task_iter = itertools.tee(combinations)
+                outcomes = executor.map(_run_in_worker, task_iter, chunksize=chunksize)
+                self._collect_results(zip(params_iter, outcomes), total, metric, show_progress)
+        else:
+            signal_cache = {} if _uses_signal_cache(self.strategy_class, param_ranges) else None
+            early_stop_cb = self._make_pruner(metric) if prune else None
+            market_arrays = self._get_market_arrays()
+            outcomes = (
+                (params, _run_single(
+                    self.strategy_class, self.market_data, self.fixed_params, params,
+                    signal_cache, early_stop_cb, market_arrays
+                ))
+                for params in combinations
+            )
+            self._collect_results(outcomes, total, metric, show_progress)
+
+        print(f"\n✅ Optimización completada: {len(self.results)} resultados\n")
+
+        return self.get_summary()
+
+    def _make_pruner(self, metric: str) -> Optional[Callable[[int, dict], bool]]:
+        """
+        Crea el early_stop_cb que poda combinaciones sin opción de ser la mejor.
+
+        Solo max_drawdown tiene una cota parcial segura: el drawdown parcial nunca
+        baja, así que si ya supera al mejor (menor) drawdown registrado, la
+        combinación no puede ganar. Sharpe, ROI, profit_factor y sortino pueden
+        recuperarse con los trades restantes, así que no se podan.
+
+        Nota: best_score no aplica el filtro min_trades de get_best_params().
+        """
+        if metric != 'max_drawdown':
+            print(f"⚠️ prune no disponible para '{metric}' (sin cota parcial): se ignora")
+            return None
+
+        def early_stop(signal_idx: int, running: dict) -> bool:
+            return self.best_params is not None and running['max_drawdown'] > self.best_score
+
+        return early_stop
+
+    @staticmethod
+    def _resolve_n_jobs(n_jobs: int) -> int:
+        """Convierte n_jobs al número de procesos (-1 = todos los cores, -2 = todos menos uno...)."""
+        if n_jobs == 0:
+            raise ValueError("❌ n_jobs no puede ser 0")
+        if n_jobs < 0:
+            return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+        return n_jobs
+
+    def _collect_results(self, outcomes, total: int, metric: str, show_progress: bool) -> None:
+        """Registra cada (params, resultado) en orden de la rejilla y actualiza el mejor."""
         # Bucle de optimización con barra de progreso
         iterator = tqdm(
-            combinations,
+            outcomes,
+            total=total,
             desc="Optimizing",
             unit="combo",
             disable=not show_progress
-        ) if show_progress else combinations
-
-        for params in iterator:
-            start_time = time.time()
-
-            try:
-                # Combinar parámetros fijos + variables
-                full_params = {**self.fixed_params, **params}
+        )
 
-                # ✅ INYECCIÓN DE DATOS: Pasar market_data a la estrategia
-                strategy = self.strategy_class(data=self.market_data, **full_params)
+        # max_drawdown mejora hacia abajo; el resto de métricas hacia arriba
+        sign = -1 if metric == 'max_drawdown' else 1
+        metric_key = _metric_key(metric)
 
-                # Ejecutar backtest
-                runner = BacktestRunner(strategy)
-                runner.run(verbose=False)
-
-                # Extraer métricas
-                all_metrics = runner.metrics.all_metrics
-
-                # Crear resultado
-                execution_time = time.time() - start_time
-                result = OptimizationResult(
-                    params=params,
-                    metrics=all_metrics,
-                    execution_time=execution_time
-                )
-                self.results.append(result)
-
-                # Actualizar mejor si es necesario
-                score = all_metrics[metric]
-                if score > self.best_score:
-                    self.best_score = score
-                    self.best_params = params
-
-            except Exception as e:
-                # Registrar errores pero continuar
-                import traceback
-                print(f"\n⚠️ Error en {params}: {str(e)}")
-                # Descomentar la siguiente línea para debugging detallado:
-                # traceback.print_exc()
+        for params, (all_metrics, execution_time, error) in iterator:
+            if error is not None:
+                print(f"\n⚠️ Error en {params}: {error}")
+                continue
+            if all_metrics is None:
+                # Podado por early_stop_cb: se registra sin métricas
+                self.results.append(OptimizationResult(
+                    params=params, metrics={}, execution_time=execution_time, pruned=True
+                ))
                 continue
 
-        print(f"\n✅ Optimización completada: {len(self.results)} resultados\n")
+            self.results.append(OptimizationResult(
+                params=params,
+                metrics=all_metrics,
+                execution_time=execution_time
+            ))
 
-        return self.get_summary()
+            # Actualizar mejor si es necesario
+            score = all_metrics.get(metric_key)
+            if score is None:
+                print(f"\n⚠️ Error en {params}: {metric!r}")
+                continue
+            if np.isnan(score):
+                continue
+            if self.best_params is None or (score - self.best_score) * sign > 0:
+                self.best_score = score
+                self.best_params = params
 
     def get_summary(self) -> pd.DataFrame:
         """
         Convierte los resultados a un DataFrame de pandas.
 
         Returns:
-            DataFrame con columnas: [parámetros + métricas clave + execution_time]
+            DataFrame con columnas: [parámetros + métricas clave + execution_time].
+            Se cachea hasta que lleguen resultados nuevos: no modificarlo in-place
         """
-        data = []
-
-        for result in self.results:
-            row = {**result.params}  # Primero los parámetros
-
-            # Agregar métricas principales
-            # Nota: Usar 'ROI' (mayúsculas) porque así se retorna de portfolio_metrics
-            row.update({
-                'sharpe_ratio': result.metrics.get('sharpe_ratio', None),
-                'roi': result.metrics.get('ROI', None),  # ✅ Corrección: ROI está en mayúsculas
-                'max_drawdown': result.metrics.get('max_drawdown', None),
-                'profit_factor': result.metrics.get('profit_factor', None),
-                'total_trades': result.metrics.get('total_trades', None),
-                'execution_time': result.execution_time,
-            })
-
-            data.append(row)
-
-        df = pd.DataFrame(data)
+        summary_key = (len(self.results), self.target_metric)
+        if self._summary_cache is not None and self._summary_key == summary_key:
+            return self._summary_cache
+
+        # Construcción columnar (una lista por columna): sin transponer una lista
+        # de dicts fila a fila. Primero los parámetros, luego las métricas
+        results = self.results
+        param_names = dict.fromkeys(name for result in results for name in result.params)
+        columns = {
+            name: [result.params.get(name) for result in results]
+            for name in param_names
+        }
+
+        # Agregar métricas principales
+        for column, metric_key in _SUMMARY_METRICS:
+            columns[column] = [result.metrics.get(metric_key, None) for result in results]
+        columns['execution_time'] = [result.execution_time for result in results]
+        if any(result.pruned for result in results):
+            columns['pruned'] = [result.pruned for result in results]
+
+        df = pd.DataFrame(columns) if results else pd.DataFrame()
+
+        # Parámetros de texto / enums como category: un código por fila en vez de
+        # un objeto Python (menos memoria, groupby/sort más rápidos)
+        for name in param_names:
+            if df[name].dtype == object or isinstance(df[name].dtype, pd.StringDtype):
+                try:
+                    df[name] = df[name].astype('category')
+                except TypeError:
+                    pass  # Valores no hasheables (listas, dicts): se quedan como object
 
         # Validar que hay datos y que la métrica existe
         if df.empty:
@@ -264,6 +647,7 @@ class ParameterOptimizer:
             print(f"⚠️ Métrica '{self.target_metric}' no encontrada en resultados")
             print(f"   Columnas disponibles: {list(df.columns)}")
 
+        self._summary_cache, self._summary_key = df, summary_key
         return df
 
     def get_best_params(
@@ -301,15 +685,20 @@ class ParameterOptimizer:
             )
             return None
 
-        # Ordenar y obtener el mejor
-        ascending = metric == 'max_drawdown'
-        best_row = valid_results.sort_values(metric, ascending=ascending).iloc[0]
+        # Obtener el mejor con idxmin/idxmax: O(n) en vez de ordenar todo (O(n log n)).
+        # Ignoran NaN, igual que sort_values (que los deja al final)
+        values = valid_results[metric]
+        if values.isna().all():
+            best_row = valid_results.iloc[0]
+        else:
+            best_idx = values.idxmin() if metric == 'max_drawdown' else values.idxmax()
+            best_row = valid_results.loc[best_idx]
 
         print(f"\n{'='*70}")
         print(f"🏆 MEJORES PARÁMETROS ENCONTRADOS")
         print(f"{'='*70}")
         for param_name, param_value in best_row.items():
-            if param_name not in ['sharpe_ratio', 'roi', 'max_drawdown', 'profit_factor', 'total_trades', 'execution_time']:
+            if param_name not in ['sharpe_ratio', 'roi', 'max_drawdown', 'profit_factor', 'total_trades', 'execution_time', 'pruned']:
                 print(f"  {param_name}: {param_value}")
 
         # Formatear métricas de forma robusta ante valores None
@@ -327,7 +716,7 @@ class ParameterOptimizer:
         print(f"{'='*70}\n")
 
         # Retornar como diccionario
-        best_dict = best_row.drop(['sharpe_ratio', 'roi', 'max_drawdown', 'profit_factor', 'total_trades', 'execution_time']).to_dict()
+        best_dict = best_row.drop(['sharpe_ratio', 'roi', 'max_drawdown', 'profit_factor', 'total_trades', 'execution_time', 'pruned'], errors='ignore').to_dict()
 
         return best_dict
 
@@ -342,6 +731,44 @@ class ParameterOptimizer:
             print("⚠️ No hay resultados para exportar")
             return
 
-        df = self.get_summary()
-        df.to_csv(filename, index=False)
+        # Mismas columnas y orden que get_summary(), pero escritas fila a fila
+        # desde self.results: sin construir el DataFrame completo en memoria
+        results = self.results
+        param_names = list(dict.fromkeys(name for result in results for name in result.params))
+        header = param_names + [column for column, _ in _SUMMARY_METRICS] + ['execution_time']
+        with_pruned = any(result.pruned for result in results)
+        if with_pruned:
+            header.append('pruned')
+
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for i in self._summary_order():
+                result = results[i]
+                row = [result.params.get(name) for name in param_names]
+                row += [result.metrics.get(metric_key) for _, metric_key in _SUMMARY_METRICS]
+                row.append(result.execution_time)
+                if with_pruned:
+                    row.append(result.pruned)
+                writer.writerow([_csv_value(value) for value in row])
+
         print(f"✅ Resultados exportados a {filename}")
+
+    def _summary_order(self) -> List[int]:
+        """
+        Índices de self.results en el orden de get_summary(): por la métrica objetivo
+        (ascendente solo para max_drawdown), valores ausentes/NaN al final.
+        """
+        columns = dict(_SUMMARY_METRICS)
+        if self.target_metric not in columns:
+            return list(range(len(self.results)))
+
+        metric_key = columns[self.target_metric]
+        sign = 1 if self.target_metric == 'max_drawdown' else -1
+
+        def sort_key(i: int) -> Tuple[bool, float]:
+            value = self.results[i].metrics.get(metric_key)
+            missing = value is None or value != value
+            return missing, 0.0 if missing else sign * value
+
+        return sorted(range(len(self.results)), key=sort_key)
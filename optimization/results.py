@@ -15,12 +15,16 @@ class OptimizationResult:
         params: Diccionario con los parámetros usados en esta iteración
         metrics: Diccionario con todas las métricas calculadas (sharpe, roi, etc.)
         execution_time: Tiempo en segundos que tardó el backtest de esta iteración
+        pruned: True si el backtest se abandonó por poda (metrics vacío)
     """
     params: Dict[str, Any]
     metrics: Dict[str, float]
     execution_time: float
+    pruned: bool = False
 
     def __repr__(self) -> str:
         """Representación legible del resultado"""
+        if self.pruned:
+            return f"OptimizationResult({self.params} → podado [{self.execution_time:.2f}s])"
         metrics_str = ", ".join([f"{k}={v:.2f}" for k, v in self.metrics.items()])
         return f"OptimizationResult({self.params} → {metrics_str} [{self.execution_time:.2f}s])"
@@ -12,6 +12,25 @@ from matplotlib import cm
 from mpl_toolkits.mplot3d import Axes3D
 from typing import Optional
 
+from utils.jit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def _scatter_max(yi, xi, values, Z):
+    """
+    Z[yi[k], xi[k]] = max(Z[...], values[k]) ignorando NaN (como np.fmax.at).
+    Índices negativos (sin valor de parámetro) se saltan.
+    """
+    for k in range(values.size):
+        y = yi[k]
+        x = xi[k]
+        val = values[k]
+        if y < 0 or x < 0 or val != val:
+            continue
+        current = Z[y, x]
+        if not current >= val:  # también cuando current es NaN
+            Z[y, x] = val
+
 
 class OptimizationPlotter:
     """
@@ -37,6 +56,36 @@ class OptimizationPlotter:
         self.param_cols = [col for col in self.df.columns if col not in metric_cols]
         self.metric_cols = [col for col in metric_cols if col in self.df.columns]
 
+    def _surface_grid(self, x_param: str, y_param: str, metric: str, fill_value: float):
+        """
+        Construye la rejilla (X, Y, Z) de plot_3d_surface.
+
+        Equivale a pivot_table(values=metric, index=y_param, columns=x_param,
+        aggfunc=max).fillna(fill_value), pero con un scatter vectorizado:
+        pd.factorize da el índice de fila/columna de cada resultado y se guarda
+        el máximo por celda (ignorando NaN, como pivot_table): con Numba en un
+        solo bucle compilado (_scatter_max), si no con np.fmax.at.
+        """
+        yi, y_values = pd.factorize(self.df[y_param], sort=True)
+        xi, x_values = pd.factorize(self.df[x_param], sort=True)
+        z = self.df[metric].to_numpy(dtype=np.float64)
+
+        # Filas sin valor de parámetro (índice -1) no entran en la rejilla
+        Z = np.full((len(y_values), len(x_values)), np.nan)
+        if NUMBA_AVAILABLE:
+            _scatter_max(yi, xi, z, Z)
+        else:
+            valid = (yi >= 0) & (xi >= 0)
+            np.fmax.at(Z, (yi[valid], xi[valid]), z[valid])
+
+        # Como pivot_table (dropna=True): fuera filas/columnas sin ningún valor
+        rows = ~np.isnan(Z).all(axis=1)
+        cols = ~np.isnan(Z).all(axis=0)
+        Z = np.nan_to_num(Z[np.ix_(rows, cols)], nan=fill_value)
+
+        X, Y = np.meshgrid(np.asarray(x_values)[cols], np.asarray(y_values)[rows])
+        return X, Y, Z
+
     def plot_3d_surface(
         self,
         x_param: str,
@@ -65,19 +114,8 @@ class OptimizationPlotter:
         if metric not in self.df.columns:
             raise ValueError(f"Métrica {metric} no encontrada en resultados")
 
-        # 1. Preparar datos en formato Rejilla (Grid)
-        pivot_df = self.df.pivot_table(
-            values=metric,
-            index=y_param,
-            columns=x_param,
-            aggfunc=np.max  # Si hay duplicados, tomar el máximo
-        ).fillna(fill_value)
-
-        # 2. Crear las coordenadas X, Y (Meshgrid)
-        X = pivot_df.columns.values
-        Y = pivot_df.index.values
-        X, Y = np.meshgrid(X, Y)
-        Z = pivot_df.values
+        # 1-2. Rejilla X, Y (meshgrid) y matriz Z
+        X, Y, Z = self._surface_grid(x_param, y_param, metric, fill_value)
 
         # 3. Configurar el Plot 3D
         fig = plt.figure(figsize=figsize)
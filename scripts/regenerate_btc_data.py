@@ -6,7 +6,9 @@ limpia, enriquece con indicadores y exporta a laboratory_data/BTC/.
 
 Uso:
     python scripts/regenerate_btc_data.py
+    python scripts/regenerate_btc_data.py --verify   # + muestra de Open por timeframe
 """
+import argparse
 import sys
 import os
 
@@ -19,6 +21,13 @@ from data.preparation.data_transformer import DataTransformer
 from utils.timeframe import Timeframe
 
 
+parser = argparse.ArgumentParser(description="Regenerar datos BTC sin Heikin Ashi")
+parser.add_argument(
+    "--verify", action="store_true",
+    help="Mostrar un Open de muestra por timeframe (comprobar que no hay decimales HA)"
+)
+args = parser.parse_args()
+
 # ── 1. Descargar datos crudos desde Binance ─────────────────────────
 print("=" * 60)
 print("PASO 1: Descargando BTC/USDT 5m desde Binance...")
@@ -71,10 +80,11 @@ print("=" * 60)
 output_dir = "data/laboratory_data/BTC"
 transformer.export_dataframes_to_csv(enriched_data, output_dir)
 
-# Verificación: mostrar que los precios son reales (sin decimales HA)
-for tf, df in enriched_data.items():
-    sample_open = df['Open'].iloc[10]
-    print(f"  {tf} → Open sample: {sample_open} ({len(df)} filas)")
+# Verificación (--verify): mostrar que los precios son reales (sin decimales HA)
+if args.verify:
+    for tf, df in enriched_data.items():
+        opens = df['Open'].to_numpy()
+        print(f"  {tf} → Open sample: {opens[10]} ({opens.shape[0]} filas)")
 
 print("\n" + "=" * 60)
 print("✓ COMPLETADO — Datos regenerados sin Heikin Ashi")
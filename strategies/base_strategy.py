@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from typing import List, Optional
 from datetime import datetime
+import functools
 import os
-import uuid
+import weakref
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 # Imports de la nueva estructura
 from models.enums import SignalType, OrderType, CurrencyType, ExchangeName, MarketType, SignalPositionSide
@@ -12,7 +16,102 @@ from config.markets.crypto_market import CryptoMarketDefinition
 from config.markets.futures_market import FuturesMarketDefinition
 from utils.timeframe import Timeframe
 
+# Columnas OHLCV: lo mínimo que necesitan el motor, las métricas y los gráficos
+OHLCV_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+def _check_columns(data_path: str, available, columns: tuple) -> None:
+    """Lanza ValueError si alguna columna pedida no está en el archivo."""
+    missing = [col for col in columns if col not in set(available)]
+    if missing:
+        raise ValueError(f"❌ Columnas {missing} no encontradas en {data_path}")
+
+
+def _parse_market_csv(data_path: str) -> pd.DataFrame:
+    """
+    Parsea un CSV de laboratory_data con el lector multihilo de pyarrow.
+
+    'Time' se lee como texto y se convierte con pd.to_datetime, igual que
+    parse_dates del motor C (mismo dtype de índice). Los floats salen redondeados
+    exactamente (como float_precision='round_trip'), no con el parser rápido del
+    motor C, que puede desviarse 1 ulp.
+    """
+    df = pd.read_csv(data_path, engine="pyarrow", dtype={"Time": str})
+    return df.set_index(pd.to_datetime(df.pop("Time")))
+
+
+@functools.lru_cache(maxsize=32)
+def _read_market_file(data_path: str, mtime: float, columns: Optional[tuple] = None) -> pd.DataFrame:
+    """
+    Lee un CSV de laboratory_data, usando un sidecar Parquet al lado del CSV.
+
+    La primera lectura parsea el CSV y escribe el .parquet (completo); las
+    siguientes leen el Parquet (tipado, sin parsear fechas) mientras sea más
+    nuevo que el CSV, y solo las columnas pedidas. columns=None = todas.
+    mtime forma parte de la clave del lru_cache: si el CSV cambia, se relee.
+    """
+    sidecar = os.path.splitext(data_path)[0] + ".parquet"
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= mtime:
+        if columns is not None:
+            _check_columns(data_path, pq.read_schema(sidecar).names, columns)
+        return pd.read_parquet(
+            sidecar, engine="pyarrow", columns=list(columns) if columns is not None else None
+        )
+
+    df = _parse_market_csv(data_path)
+    try:
+        df.to_parquet(sidecar, engine="pyarrow", compression="zstd")
+    except OSError:
+        pass  # Directorio de solo lectura: se sigue sin sidecar
+    if columns is None:
+        return df
+    _check_columns(data_path, df.columns, columns)
+    return df[list(columns)]
+
+
+@contextmanager
+def quiet_strategies():
+    """
+    Silencia los mensajes de todas las estrategias dentro del bloque.
+
+    El optimizador construye cientos de estrategias: así no inunda stdout con
+    los mensajes de carga / configuración / señales de cada combinación.
+    """
+    previous = BaseStrategy._quiet
+    BaseStrategy._quiet = True
+    try:
+        yield
+    finally:
+        BaseStrategy._quiet = previous
+
+
+# Entradas máximas de la caché de indicadores (BaseStrategy._cached_indicator) antes de vaciarla
+_INDICATOR_CACHE_SIZE = 64
+
+
 class BaseStrategy(ABC):
+    # Parámetros del __init__ que afectan a generate_simple_signals(). Si una
+    # estrategia los declara y la optimización varía algún otro parámetro (p. ej.
+    # initial_capital o fees, que llegan a BaseStrategy por **kwargs), el
+    # optimizador reutiliza las señales entre esas combinaciones. None = sin caché.
+    SIGNAL_PARAMS: Optional[tuple] = None
+
+    # Columnas a cargar del disco (modo legacy, sin data=). Los CSV de
+    # laboratory_data traen decenas de indicadores de DataTransformer; una
+    # estrategia que calcula los suyos puede cargar solo OHLCV_COLUMNS.
+    # None = todas las columnas.
+    REQUIRED_COLUMNS: Optional[tuple] = None
+
+    # True = _log() no imprime nada (ver quiet_strategies)
+    _quiet: bool = False
+
+    # Caché de indicadores compartida entre instancias (ver _cached_indicator):
+    # (id(market_data), clase, nombre, parámetros) → (weakref a market_data, array).
+    # En un barrido del optimizador (mismo DataFrame inyectado) cada indicador se
+    # calcula una sola vez por parámetros aunque cambien los demás. market_data se
+    # trata como inmutable en OHLCV; el weakref descarta ids reutilizados
+    _indicator_cache: dict = {}
+
     def __init__(
         self,
         market: MarketType,
@@ -60,8 +159,8 @@ class BaseStrategy(ABC):
         if data is not None:
             # Modo inyectado (optimizador)
             self.market_data = data
-            print(f"✓ Datos inyectados: {len(self.market_data)} candles")
-            print(f"  Período: {self.market_data.index[0]} a {self.market_data.index[-1]}\n")
+            self._log(f"✓ Datos inyectados: {len(self.market_data)} candles")
+            self._log(f"  Período: {self.market_data.index[0]} a {self.market_data.index[-1]}\n")
         else:
             # Modo legacy (cargar del disco)
             current_file = os.path.abspath(__file__)
@@ -77,7 +176,7 @@ class BaseStrategy(ABC):
                 f"Timeframe.{timeframe.name}.csv"
             )
 
-            print(f"🔍 Buscando datos en: {data_path}")
+            self._log(f"🔍 Buscando datos en: {data_path}")
 
             if not os.path.exists(data_path):
                 raise FileNotFoundError(
@@ -86,17 +185,67 @@ class BaseStrategy(ABC):
                     f"  - backtesting/data/laboratory_data/{symbol}/Timeframe.{timeframe.name}.csv"
                 )
 
-            self.market_data = pd.read_csv(data_path, index_col="Time", parse_dates=["Time"])
+            self.market_data = self._load_market_data(data_path, self.REQUIRED_COLUMNS)
             if self.market_data.empty:
                 raise ValueError(f"❌ El archivo {data_path} no contiene datos.")
 
-            print(f"✅ Datos cargados: {len(self.market_data)} candles")
-            print(f"   Período: {self.market_data.index[0]} a {self.market_data.index[-1]}\n")
+            self._log(f"✅ Datos cargados: {len(self.market_data)} candles")
+            self._log(f"   Período: {self.market_data.index[0]} a {self.market_data.index[-1]}\n")
 
     # ========================================================================
     # NUEVO SISTEMA SIMPLIFICADO
     # ========================================================================
     
+    @staticmethod
+    def _load_market_data(data_path: str, columns: Optional[tuple] = None) -> pd.DataFrame:
+        """
+        Carga los datos de mercado de data_path (cacheados en memoria y en un
+        sidecar Parquet, ver _read_market_file). columns: solo esas columnas.
+
+        Devuelve una copia superficial: las columnas que añada la estrategia
+        (indicadores) no llegan al DataFrame cacheado.
+        """
+        columns = tuple(columns) if columns is not None else None
+        return _read_market_file(data_path, os.path.getmtime(data_path), columns).copy(deep=False)
+
+    def _cached_indicator(self, name: str, params, compute) -> np.ndarray:
+        """
+        Devuelve el indicador `name` con `params` (hasheables) de la estrategia,
+        calculándolo con compute() solo la primera vez por DataFrame.
+
+        El resultado es un array float64 de solo lectura: se comparte entre
+        instancias. Al llegar a _INDICATOR_CACHE_SIZE entradas la caché se vacía.
+        """
+        cache = BaseStrategy._indicator_cache
+        key = (id(self.market_data), type(self), name, params)
+        cached = cache.get(key)
+        if cached is not None and cached[0]() is self.market_data:
+            return cached[1]
+
+        values = np.asarray(compute(), dtype=np.float64)
+        values.flags.writeable = False
+
+        if len(cache) >= _INDICATOR_CACHE_SIZE:
+            cache.clear()
+        cache[key] = (weakref.ref(self.market_data), values)
+        return values
+
+    def _log(self, message: str = "") -> None:
+        """Imprime mensajes informativos de la estrategia salvo en modo silencioso."""
+        if not self._quiet:
+            print(message)
+
+    @classmethod
+    def canonicalize_params(cls, params: dict) -> dict:
+        """
+        Forma canónica de una combinación de parámetros para el optimizador.
+
+        Dos combinaciones con la misma forma canónica se consideran el mismo
+        backtest y solo se ejecuta la primera. Por defecto no cambia nada; una
+        estrategia puede sobreescribirlo (p. ej. redondear position_size_pct).
+        """
+        return params
+
     def generate_simple_signals(self) -> List[TradingSignal]:
         """
         Método para generar señales simplificadas.
@@ -4,11 +4,46 @@ Compra cuando el precio rompe el máximo de N períodos.
 Vende cuando el precio rompe el mínimo de N períodos.
 """
 
-from strategies.base_strategy import BaseStrategy
+import numpy as np
+
+from strategies.base_strategy import BaseStrategy, OHLCV_COLUMNS
 from models.enums import SignalType, MarketType
+from models.simple_signals import TradingSignal
+from utils.jit import njit
+from utils.rolling import rolling_max, rolling_min
 from utils.timeframe import Timeframe
 
 
+@njit(cache=True)
+def _breakout_scan(close, high_max, low_min, start):
+    """
+    Recorre las barras una sola vez aplicando la máquina de estados
+    (fuera de posición → BUY si Close > high_max[i-1]; dentro → SELL si
+    Close < low_min[i-1]).
+
+    Returns:
+        (índices de barra, lados) de cada señal, con lado 1 = BUY, -1 = SELL.
+        Comparaciones con NaN son False, igual que en pandas.
+    """
+    n = len(close)
+    out_idx = np.empty(n, dtype=np.int64)
+    out_side = np.empty(n, dtype=np.int8)
+    k = 0
+    in_position = False
+    for i in range(start, n):
+        if not in_position and close[i] > high_max[i - 1]:
+            out_idx[k] = i
+            out_side[k] = 1
+            k += 1
+            in_position = True
+        elif in_position and close[i] < low_min[i - 1]:
+            out_idx[k] = i
+            out_side[k] = -1
+            k += 1
+            in_position = False
+    return out_idx[:k], out_side[:k]
+
+
 class BreakoutSimple(BaseStrategy):
     """
     Estrategia de breakout de máximos/mínimos.
@@ -17,6 +52,12 @@ class BreakoutSimple(BaseStrategy):
         lookback_period: Cuántas velas usar para calcular máximo/mínimo
         position_size_pct: Porcentaje del capital por trade
     """
+
+    # position_size_pct va dentro de cada señal BUY
+    SIGNAL_PARAMS = ('lookback_period', 'position_size_pct')
+
+    # Los indicadores se calculan aquí: del disco basta con OHLCV
+    REQUIRED_COLUMNS = OHLCV_COLUMNS
     
     def __init__(
         self,
@@ -36,22 +77,26 @@ class BreakoutSimple(BaseStrategy):
             **kwargs
         )
 
-        # ✅ Asegurar tipos correctos (pandas.rolling requiere int)
+        # ✅ Asegurar tipos correctos (la ventana rodante requiere int)
         self.lookback_period = int(lookback_period)
         self.position_size_pct = float(position_size_pct)
 
-        # Calcular máximos y mínimos rodantes
-        self.market_data['High_Max'] = self.market_data['High'].rolling(
-            window=self.lookback_period
-        ).max()
-
-        self.market_data['Low_Min'] = self.market_data['Low'].rolling(
-            window=self.lookback_period
-        ).min()
+        # Máximos y mínimos rodantes (= rolling(window).max()/min()) como arrays
+        # NumPy alineados con market_data, no como columnas: asignar columnas
+        # copia el array en el DataFrame en cada instancia y solo los lee
+        # generate_simple_signals(). Se calculan una vez por DataFrame y lookback
+        # (ver BaseStrategy._cached_indicator)
+        data, lookback = self.market_data, self.lookback_period
+        self.high_max = self._cached_indicator(
+            'High_Max', lookback, lambda: rolling_max(data['High'].to_numpy(np.float64), lookback)
+        )
+        self.low_min = self._cached_indicator(
+            'Low_Min', lookback, lambda: rolling_min(data['Low'].to_numpy(np.float64), lookback)
+        )
         
-        print(f"📊 Estrategia Breakout configurada:")
-        print(f"   - Lookback: {lookback_period} períodos")
-        print(f"   - Position size: {position_size_pct*100}% del capital")
+        self._log(f"📊 Estrategia Breakout configurada:")
+        self._log(f"   - Lookback: {lookback_period} períodos")
+        self._log(f"   - Position size: {position_size_pct*100}% del capital")
     
     def generate_signals(self):
         """Método viejo - no lo usamos"""
@@ -62,45 +107,33 @@ class BreakoutSimple(BaseStrategy):
         Genera señales de breakout.
         
         Lógica:
-        - Compra cuando Close > High_Max[anterior]
-        - Vende cuando Close < Low_Min[anterior]
+        - Compra cuando Close > high_max[anterior]
+        - Vende cuando Close < low_min[anterior]
         
         Returns:
             Lista de TradingSignal
         """
-        self.simple_signals = []
-        
-        in_position = False
-        
-        # Empezar después del período de lookback
-        for i in range(self.lookback_period + 1, len(self.market_data)):
-            
-            current_close = self.market_data['Close'].iloc[i]
-            previous_high_max = self.market_data['High_Max'].iloc[i-1]
-            previous_low_min = self.market_data['Low_Min'].iloc[i-1]
-            
-            # Breakout alcista: precio rompe por encima del máximo
-            if current_close > previous_high_max and not in_position:
-                self.create_simple_signal(
-                    signal_type=SignalType.BUY,
-                    timestamp=self.market_data.index[i],
-                    price=current_close,
-                    position_size_pct=self.position_size_pct
-                )
-                in_position = True
-            
-            # Breakout bajista: precio rompe por debajo del mínimo
-            elif current_close < previous_low_min and in_position:
-                self.create_simple_signal(
-                    signal_type=SignalType.SELL,
-                    timestamp=self.market_data.index[i],
-                    price=current_close,
-                    position_size_pct=1.0  # Cerrar posición completa
-                )
-                in_position = False
+        # Máquina de estados sobre arrays NumPy (empezando después del lookback):
+        # solo se crean objetos para las barras con señal, todos de una vez
+        closes = self.market_data['Close'].to_numpy(np.float64)
+        signal_idx, signal_side = _breakout_scan(
+            closes, self.high_max, self.low_min, self.lookback_period + 1
+        )
+        buy_mask = signal_side == 1
+        is_buy = buy_mask.tolist()
+
+        # Breakout alcista (BUY) con position_size_pct; bajista (SELL) cierra todo
+        self.simple_signals = TradingSignal.from_arrays(
+            timestamps=self.market_data.index[signal_idx],
+            signal_types=[SignalType.BUY if buy else SignalType.SELL for buy in is_buy],
+            prices=closes[signal_idx],
+            position_size_pcts=[self.position_size_pct if buy else 1.0 for buy in is_buy],
+            symbol=self.symbol
+        )
         
-        print(f"✓ Generadas {len(self.simple_signals)} señales")
-        print(f"  - Señales BUY: {sum(1 for s in self.simple_signals if s.signal_type == SignalType.BUY)}")
-        print(f"  - Señales SELL: {sum(1 for s in self.simple_signals if s.signal_type == SignalType.SELL)}")
+        n_buy = int(buy_mask.sum())
+        self._log(f"✓ Generadas {len(self.simple_signals)} señales")
+        self._log(f"  - Señales BUY: {n_buy}")
+        self._log(f"  - Señales SELL: {len(self.simple_signals) - n_buy}")
         
         return self.simple_signals
\ No newline at end of file
@@ -11,11 +11,127 @@ v1.1: Detección real de consolidación (filtro ATR-normalizado + invalidación
 v2 (pendiente): Averaging con 2-3 entradas + POC detection.
 """
 
+import numpy as np
+import pandas as pd
+
 from strategies.base_strategy import BaseStrategy
 from models.enums import SignalType, MarketType
+from models.simple_signals import TradingSignal
+from utils.jit import njit
+from utils.rolling import ema, rolling_max, rolling_min
 from utils.timeframe import Timeframe
 
 
+# Estados de la máquina de estados de _pugilanime_scan
+_SCANNING = 0
+_BREAKOUT = 1
+_IN_POSITION = 2
+_WAITING_RESET = 3
+
+
+def _breakout_candidates(
+    closes, volumes, range_highs, volume_mas, range_width_atrs,
+    volume_multiplier, consolidation_threshold
+):
+    """
+    Barras donde, en estado SCANNING, se confirmaría una ruptura: rango estrecho
+    (< consolidation_threshold ATRs), Close sobre el máximo del rango y volumen
+    sobre la media * multiplicador, con rango / media / ancho de la barra anterior.
+
+    Returns:
+        Índices de barra ordenados (int64). Comparaciones con NaN son False.
+    """
+    candidate = np.zeros(len(closes), dtype=bool)
+    candidate[1:] = (
+        (range_width_atrs[:-1] < consolidation_threshold) &
+        (closes[1:] > range_highs[:-1]) &
+        (volumes[1:] > volume_mas[:-1] * volume_multiplier)
+    )
+    return np.flatnonzero(candidate)
+
+
+@njit(cache=True)
+def _pugilanime_scan(closes, highs, lows, emas, range_highs, atrs, range_lows, candidates, start, atr_multiplier):
+    """
+    Máquina de estados de BTCPugilanime.generate_simple_signals sobre arrays
+    (ver su docstring). En SCANNING salta directamente a la siguiente barra de
+    candidates (_breakout_candidates); el resto de estados avanza barra a barra.
+    Los niveles del rango se leen de la barra anterior (i - 1).
+
+    Returns:
+        (índices de barra, lados) de cada señal, con lado 1 = BUY, -1 = SELL.
+        Comparaciones con NaN son False, igual que en Python.
+    """
+    n = len(closes)
+    out_idx = np.empty(n, dtype=np.int64)
+    out_side = np.empty(n, dtype=np.int8)
+    k = 0
+    c = 0  # Siguiente candidato a ruptura
+
+    state = _SCANNING
+    breakout_range_high = 0.0    # Nivel de ruptura
+    breakout_range_low = 0.0     # Piso de la zona (para invalidación)
+    seen_above_ema = False       # Precio se alejó de la EMA (confirma impulso)
+    max_price_since_entry = 0.0  # Para trailing stop ATR
+    trailing_stop = 0.0
+
+    i = start
+    while i < n:
+        close = closes[i]
+        ema = emas[i]
+
+        if state == _SCANNING:
+            # Las barras sin ruptura no cambian el estado: saltar a la siguiente candidata
+            while c < len(candidates) and candidates[c] < i:
+                c += 1
+            if c == len(candidates):
+                break
+            i = candidates[c]
+            state = _BREAKOUT
+            breakout_range_high = range_highs[i - 1]
+            breakout_range_low = range_lows[i - 1]
+
+        elif state == _BREAKOUT:
+            if close < breakout_range_low:
+                # Invalidación: precio vuelve a la zona -> breakout falso
+                state = _SCANNING
+                seen_above_ema = False
+            elif not seen_above_ema:
+                # Fase 1: una vela entera por encima de la EMA confirma el impulso
+                if lows[i] > ema:
+                    seen_above_ema = True
+            elif lows[i] <= ema <= close and ema > breakout_range_high:
+                # Fase 2: pullback que toca la EMA, con la EMA aún sobre el rango
+                out_idx[k] = i
+                out_side[k] = 1
+                k += 1
+                state = _IN_POSITION
+                max_price_since_entry = close
+                trailing_stop = close - atrs[i] * atr_multiplier
+
+        elif state == _IN_POSITION:
+            # Trailing stop: sube cuando el precio sube, nunca baja
+            if highs[i] > max_price_since_entry:
+                max_price_since_entry = highs[i]
+                trailing_stop = max_price_since_entry - atrs[i] * atr_multiplier
+
+            if close < trailing_stop:
+                out_idx[k] = i
+                out_side[k] = -1
+                k += 1
+                state = _WAITING_RESET
+                seen_above_ema = False
+
+        else:  # _WAITING_RESET
+            # Esperar a que el precio vuelva bajo la EMA antes de escanear de nuevo
+            if close < ema:
+                state = _SCANNING
+
+        i += 1
+
+    return out_idx[:k], out_side[:k]
+
+
 class BTCPugilanime(BaseStrategy):
     """
     Estrategia de tendencia breakout-pullback sobre BTC 5min.
@@ -38,6 +154,16 @@ class BTCPugilanime(BaseStrategy):
         position_size_pct: Porcentaje del capital por trade (0.1-0.5)
     """
 
+    # Todos los parámetros optimizables cambian las señales (position_size_pct va
+    # dentro de cada BUY): el optimizador solo reutiliza señales entre
+    # combinaciones que difieren en el resto (initial_capital, fees, slippage,
+    # que llegan a BaseStrategy por **kwargs)
+    SIGNAL_PARAMS = (
+        'lookback_period', 'ema_period', 'atr_period', 'atr_multiplier',
+        'volume_multiplier', 'consolidation_threshold', 'position_size_pct'
+    )
+
+
     def __init__(
         self,
         symbol: str = "BTC",
@@ -70,37 +196,68 @@ class BTCPugilanime(BaseStrategy):
         self.consolidation_threshold = float(consolidation_threshold)
         self.position_size_pct = float(position_size_pct)
 
-        # Pre-calcular indicadores
-        # Máximo del rango (nivel de ruptura)
-        self.market_data['Range_High'] = self.market_data['High'].rolling(self.lookback_period).max()
+        # Pre-calcular indicadores, compartidos entre instancias por período (ver
+        # BaseStrategy._cached_indicator): variar atr_multiplier no recalcula nada y
+        # variar atr_period no recalcula la EMA
+        data = self.market_data
+        lookback, atr_period = self.lookback_period, self.atr_period
+
+        # Máximo del rango (nivel de ruptura) y piso (para invalidación de breakout falso)
+        range_high = self._cached_indicator(
+            'Range_High', lookback, lambda: rolling_max(data['High'].to_numpy(np.float64), lookback)
+        )
+        range_low = self._cached_indicator(
+            'Range_Low', lookback, lambda: rolling_min(data['Low'].to_numpy(np.float64), lookback)
+        )
 
         # EMA de referencia para detectar el pullback
-        self.market_data['EMA'] = self.market_data['Close'].ewm(span=self.ema_period, adjust=False).mean()
+        ema_values = self._cached_indicator(
+            'EMA', self.ema_period, lambda: ema(data['Close'].to_numpy(np.float64), self.ema_period)
+        )
 
         # Media de volumen del rango (filtro de ruptura)
-        self.market_data['Volume_MA'] = self.market_data['Volume'].rolling(self.lookback_period).mean()
+        volume_ma = self._cached_indicator('Volume_MA', lookback, lambda: data['Volume'].rolling(lookback).mean())
 
         # ATR para trailing stop
-        high_low = self.market_data['High'] - self.market_data['Low']
-        high_close = (self.market_data['High'] - self.market_data['Close'].shift()).abs()
-        low_close = (self.market_data['Low'] - self.market_data['Close'].shift()).abs()
-        true_range = high_low.combine(high_close, max).combine(low_close, max)
-        self.market_data['ATR'] = true_range.rolling(self.atr_period).mean()
-
-        # Piso del rango (para invalidación de breakout falso)
-        self.market_data['Range_Low'] = self.market_data['Low'].rolling(self.lookback_period).min()
+        atr = self._cached_indicator('ATR', atr_period, lambda: self._true_range().rolling(atr_period).mean())
 
         # Ancho del rango normalizado por volatilidad (bajo = consolidación real)
-        self.market_data['Range_Width_ATR'] = (
-            (self.market_data['Range_High'] - self.market_data['Range_Low']) / self.market_data['ATR']
-        )
+        def range_width_atr():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return (range_high - range_low) / atr
+        range_width = self._cached_indicator('Range_Width_ATR', (lookback, atr_period), range_width_atr)
 
-        print(f"📊 BTCPugilanime configurada:")
-        print(f"   - Lookback: {self.lookback_period} períodos")
-        print(f"   - EMA pullback: {self.ema_period}")
-        print(f"   - ATR trailing: período={self.atr_period}, multiplicador={self.atr_multiplier}")
-        print(f"   - Filtro volumen: {self.volume_multiplier}x media")
-        print(f"   - Consolidación: rango < {self.consolidation_threshold} ATRs")
+        data['Range_High'] = range_high
+        data['EMA'] = ema_values
+        data['Volume_MA'] = volume_ma
+        data['ATR'] = atr
+        data['Range_Low'] = range_low
+        data['Range_Width_ATR'] = range_width
+
+        self._log(f"📊 BTCPugilanime configurada:")
+        self._log(f"   - Lookback: {self.lookback_period} períodos")
+        self._log(f"   - EMA pullback: {self.ema_period}")
+        self._log(f"   - ATR trailing: período={self.atr_period}, multiplicador={self.atr_multiplier}")
+        self._log(f"   - Filtro volumen: {self.volume_multiplier}x media")
+        self._log(f"   - Consolidación: rango < {self.consolidation_threshold} ATRs")
+
+    def _true_range(self) -> pd.Series:
+        """True range de cada barra: max(High - Low, |High - Close previo|, |Low - Close previo|)."""
+        high = self.market_data['High'].to_numpy(np.float64)
+        low = self.market_data['Low'].to_numpy(np.float64)
+        close = self.market_data['Close'].to_numpy(np.float64)
+
+        # Close previo como vista desplazada (sin shift/roll); la primera barra no
+        # tiene Close previo: TR = High - Low. fmax ignora NaN como antes combine(max)
+        true_range = high - low
+        prev_close = close[:-1]
+        gap = high[1:] - prev_close  # Un solo buffer temporal, reutilizado in-place
+        np.abs(gap, out=gap)
+        np.fmax(true_range[1:], gap, out=true_range[1:])
+        np.subtract(low[1:], prev_close, out=gap)
+        np.abs(gap, out=gap)
+        np.fmax(true_range[1:], gap, out=true_range[1:])
+        return pd.Series(true_range, index=self.market_data.index)
 
     def generate_simple_signals(self) -> list:
         """
@@ -116,130 +273,37 @@ class BTCPugilanime(BaseStrategy):
         Un breakout = un intento de entrada. Después del SELL, no se busca nuevo
         breakout hasta que el precio resetee por debajo de la EMA.
         """
-        self.simple_signals = []
-
-        # Estados del loop
-        state = "SCANNING"
-        breakout_range_high = None   # Nivel de ruptura
-        breakout_range_low = None    # Piso de la zona (para invalidación)
-        seen_above_ema = False       # Precio se alejó de la EMA (confirma impulso)
-        max_price_since_entry = None # Para trailing stop ATR
-        trailing_stop = None
-
-        # Pre-extraer arrays numpy para velocidad (~10-50x vs .iloc)
-        closes = self.market_data['Close'].values
-        highs = self.market_data['High'].values
-        lows = self.market_data['Low'].values
-        volumes = self.market_data['Volume'].values
-        emas = self.market_data['EMA'].values
-        range_highs = self.market_data['Range_High'].values
-        volume_mas = self.market_data['Volume_MA'].values
-        atrs = self.market_data['ATR'].values
-        range_lows = self.market_data['Range_Low'].values
-        range_width_atrs = self.market_data['Range_Width_ATR'].values
-        timestamps = self.market_data.index
-
+        # La máquina de estados corre en un kernel @njit sobre arrays NumPy;
+        # solo se crean objetos para las barras con señal, todos de una vez
+        data = self.market_data
+        closes, highs, lows, volumes, emas, range_highs, volume_mas, atrs, range_lows, range_width_atrs = (
+            data[column].to_numpy(np.float64) for column in (
+                'Close', 'High', 'Low', 'Volume', 'EMA', 'Range_High', 'Volume_MA',
+                'ATR', 'Range_Low', 'Range_Width_ATR'
+            )
+        )
+        # Las condiciones de ruptura de SCANNING se evalúan de una vez, vectorizadas
+        candidates = _breakout_candidates(
+            closes, volumes, range_highs, volume_mas, range_width_atrs,
+            self.volume_multiplier, self.consolidation_threshold
+        )
         start = max(self.lookback_period, self.ema_period, self.atr_period) + 1
+        signal_idx, signal_side = _pugilanime_scan(
+            closes, highs, lows, emas, range_highs, atrs, range_lows, candidates, start, self.atr_multiplier
+        )
 
-        for i in range(start, len(self.market_data)):
-            close = closes[i]
-            high = highs[i]
-            low = lows[i]
-            volume = volumes[i]
-            ema = emas[i]
-            range_high = range_highs[i - 1]  # prev para no usar el actual
-            volume_ma = volume_mas[i - 1]
-            atr = atrs[i]
-            range_low = range_lows[i - 1]
-            range_width_atr = range_width_atrs[i - 1]
-
-            # ----------------------------------------------------------------
-            if state == "SCANNING":
-                # Condición de ruptura:
-                # 1. Rango estrecho (consolidación real, no tendencia)
-                # 2. Close supera el máximo de los últimos N períodos
-                # 3. Volumen del breakout > media * multiplicador
-                is_consolidation = range_width_atr < self.consolidation_threshold
-                breakout = (
-                    is_consolidation and
-                    close > range_high and
-                    volume > volume_ma * self.volume_multiplier
-                )
-                if breakout:
-                    state = "BREAKOUT"
-                    breakout_range_high = range_high  # guardar nivel para invalidación
-                    breakout_range_low = range_low    # guardar piso para invalidación
-
-            # ----------------------------------------------------------------
-            elif state == "BREAKOUT":
-                # Invalidación: precio vuelve a la zona -> breakout falso
-                if close < breakout_range_low:
-                    state = "SCANNING"
-                    breakout_range_high = None
-                    breakout_range_low = None
-                    seen_above_ema = False
-                    continue
-
-                # Fase 1: el precio debe alejarse de la EMA (confirma impulso post-breakout)
-                # Una vela entera por encima de la EMA = el breakout generó movimiento real
-                if not seen_above_ema:
-                    if low > ema:
-                        seen_above_ema = True
-                    continue  # No evaluar entrada hasta confirmar impulso
-
-                # Fase 2: pullback — el precio vuelve a tocar la EMA desde arriba
-                # La EMA actúa como árbitro automático:
-                #   EMA > breakout_range_high → pullback válido, todavía por encima del rango
-                #   EMA < breakout_range_high → pullback demasiado profundo, volvió al rango → no entrar
-                #
-                # TODO: explorar Hipótesis B — entrada por % de retroceso en vez de EMA
-                pullback_touched_ema = low <= ema <= close  # el candle toca la EMA
-                ema_above_breakout = ema > breakout_range_high  # EMA sigue sobre el rango
-
-                if pullback_touched_ema and ema_above_breakout:
-                    # Entrada en BUY
-                    self.create_simple_signal(
-                        signal_type=SignalType.BUY,
-                        timestamp=timestamps[i],
-                        price=close,
-                        position_size_pct=self.position_size_pct
-                    )
-                    state = "IN_POSITION"
-                    max_price_since_entry = close
-                    trailing_stop = close - atr * self.atr_multiplier
-
-            # ----------------------------------------------------------------
-            elif state == "IN_POSITION":
-                # Actualizar trailing stop: sube cuando el precio sube, nunca baja
-                if high > max_price_since_entry:
-                    max_price_since_entry = high
-                    trailing_stop = max_price_since_entry - atr * self.atr_multiplier
-
-                # Salida por trailing stop ATR
-                if close < trailing_stop:
-                    self.create_simple_signal(
-                        signal_type=SignalType.SELL,
-                        timestamp=timestamps[i],
-                        price=close,
-                        position_size_pct=1.0  # cerrar posición completa
-                    )
-                    # WAITING_RESET: un breakout = un intento. Esperamos que el
-                    # precio baje bajo la EMA antes de buscar el próximo setup.
-                    state = "WAITING_RESET"
-                    breakout_range_high = None
-                    breakout_range_low = None
-                    seen_above_ema = False
-                    max_price_since_entry = None
-                    trailing_stop = None
-
-            # ----------------------------------------------------------------
-            elif state == "WAITING_RESET":
-                # El movimiento se consumió. Esperamos que el precio vuelva
-                # a estar por debajo de la EMA antes de escanear de nuevo.
-                if close < ema:
-                    state = "SCANNING"
-
-        buys = sum(1 for s in self.simple_signals if s.signal_type == SignalType.BUY)
-        sells = sum(1 for s in self.simple_signals if s.signal_type == SignalType.SELL)
-        print(f"✓ Señales generadas: {len(self.simple_signals)} (BUY: {buys}, SELL: {sells})")
+        # BUY en el pullback a la EMA con position_size_pct; SELL (trailing stop) cierra todo
+        buy_mask = signal_side == 1
+        is_buy = buy_mask.tolist()
+        self.simple_signals = TradingSignal.from_arrays(
+            timestamps=data.index[signal_idx],
+            signal_types=[SignalType.BUY if buy else SignalType.SELL for buy in is_buy],
+            prices=closes[signal_idx],
+            position_size_pcts=[self.position_size_pct if buy else 1.0 for buy in is_buy],
+            symbol=self.symbol
+        )
+
+        buys = int(buy_mask.sum())
+        sells = len(signal_side) - buys
+        self._log(f"✓ Señales generadas: {len(self.simple_signals)} (BUY: {buys}, SELL: {sells})")
         return self.simple_signals
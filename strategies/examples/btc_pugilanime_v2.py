@@ -10,11 +10,266 @@ v2.1: Salida parcial 33% en 1R + break-even + trailing ATR + TP máximo 3R.
 v2.2: Position size 80%, trailing ATR x2.5, TP 6R, parcial en 1.5R. Robustness test passed.
 """
 
+import numpy as np
+import pandas as pd
+
 from strategies.base_strategy import BaseStrategy
 from models.enums import SignalType, MarketType
+from models.simple_signals import TradingSignal
+from utils.jit import njit
+from utils.rolling import ema, rolling_max, rolling_min
 from utils.timeframe import Timeframe
 
 
+# Estados de la máquina de estados de _pugilanime_v2_scan
+_SCANNING = 0
+_BREAKOUT = 1
+_DCA_FILLING = 2
+_IN_POSITION = 3
+_WAITING_RESET = 4
+
+# Tipos de señal que devuelve _pugilanime_v2_scan
+_BUY = 1             # Entrada DCA (dca_size_pct)
+_SELL_ALL = -1       # Cierre completo (stop, break-even, trailing o TP)
+_SELL_PARTIAL = -2   # Cierre parcial en trail_activation_r (partial_close_pct)
+
+
+def _breakout_masks(closes, volumes, sma_trends, range_highs, range_stables, volume_mas, volume_multiplier):
+    """
+    Condiciones de SCANNING evaluadas para todas las barras de una vez, con
+    rango, rango estable y media de volumen de la barra anterior (i - 1).
+
+    Returns:
+        (trend_ok, above_range, breakout_start): Close no bajo la SMA de tendencia,
+        Close sobre el máximo del rango, y primera vela de ruptura (las dos
+        anteriores + rango estable + volumen sobre la media * multiplicador).
+        Comparaciones con NaN son False, igual que en Python.
+    """
+    trend_ok = ~(closes < sma_trends)
+    above_range = np.zeros(len(closes), dtype=bool)
+    above_range[1:] = closes[1:] > range_highs[:-1]
+    breakout_start = trend_ok & above_range
+    breakout_start[1:] &= range_stables[:-1] & (volumes[1:] > volume_mas[:-1] * volume_multiplier)
+    return trend_ok, above_range, breakout_start
+
+
+@njit(cache=True)
+def _pugilanime_v2_scan(
+    closes, highs, lows, emas, range_highs, range_lows, atrs, trend_ok, above_range,
+    breakout_start, candidates, start, atr_stop_mult, atr_trail_mult, trail_activation_r,
+    breakout_confirm_bars, breakout_timeout, dca_entries, dca_interval_bars, max_tp_r
+):
+    """
+    Máquina de estados de BTCPugilanimeV2.generate_simple_signals sobre arrays
+    (ver su docstring), con las condiciones de SCANNING precalculadas por
+    _breakout_masks. En SCANNING sin cierres acumulados sobre el rango salta
+    directamente a la siguiente barra de candidates (índices de breakout_start):
+    las barras intermedias no cambian el estado. Los niveles del rango se leen
+    de la barra anterior (i - 1).
+
+    Returns:
+        (índices de barra, tipos) de cada señal, con tipo _BUY, _SELL_ALL o
+        _SELL_PARTIAL. Comparaciones con NaN son False, igual que en Python.
+    """
+    n = len(closes)
+    out_idx = np.empty(n, dtype=np.int64)
+    out_kind = np.empty(n, dtype=np.int8)
+    k = 0
+    c = 0  # Siguiente candidata a primera vela de ruptura
+
+    state = _SCANNING
+    breakout_range_high = 0.0
+    breakout_range_low = 0.0
+    seen_above_ema = False
+    stop_loss = 0.0
+    entry_price_first = 0.0        # Precio de la primera entrada (para calcular R)
+    entry_risk = 0.0               # Riesgo = entry - stop (para calcular trailing activation)
+    trailing_stop = 0.0
+    trailing_active = False
+    partial_done = False           # ¿Ya se hizo el cierre parcial?
+    highest_high_since_entry = 0.0
+    bars_above_range = 0           # Conteo de cierres consecutivos sobre range_high
+    bars_since_breakout = 0        # Timeout del breakout
+    dca_entries_done = 0
+    bars_since_last_entry = 0
+    trades_this_consolidation = 0
+    last_breakout_level = np.nan   # NaN: distinto de cualquier nivel (ninguno todavía)
+
+    i = start - 1
+    while True:
+        i += 1
+        if state == _SCANNING and bars_above_range == 0 and breakout_confirm_bars > 0:
+            while c < len(candidates) and candidates[c] < i:
+                c += 1
+            if c == len(candidates):
+                break
+            i = candidates[c]
+        if i >= n:
+            break
+
+        close = closes[i]
+        high = highs[i]
+        low = lows[i]
+        ema = emas[i]
+        atr = atrs[i]
+
+        # ----------------------------------------------------------------
+        if state == _SCANNING:
+            # Filtro de tendencia: solo operar en alcista
+            if not trend_ok[i]:
+                bars_above_range = 0
+                continue
+
+            range_high = range_highs[i - 1]
+
+            # Confirmación: N cierres consecutivos sobre range_high
+            # Primera vela: necesita range_stable + volumen. Siguientes: solo close > range_high.
+            if above_range[i]:
+                if bars_above_range == 0:
+                    if breakout_start[i]:
+                        bars_above_range = 1
+                else:
+                    bars_above_range += 1
+            else:
+                bars_above_range = 0
+
+            if bars_above_range >= breakout_confirm_bars:
+                # Nueva consolidación?
+                if range_high != last_breakout_level:
+                    trades_this_consolidation = 0
+                    last_breakout_level = range_high
+                if trades_this_consolidation >= 2:
+                    bars_above_range = 0
+                    continue
+
+                state = _BREAKOUT
+                breakout_range_high = range_high
+                breakout_range_low = range_lows[i - 1]
+                seen_above_ema = False
+                bars_since_breakout = 0
+                bars_above_range = 0
+
+        # ----------------------------------------------------------------
+        elif state == _BREAKOUT:
+            bars_since_breakout += 1
+
+            # Timeout / invalidación (precio vuelve bajo el rango)
+            if bars_since_breakout > breakout_timeout or close < breakout_range_low:
+                state = _SCANNING
+                seen_above_ema = False
+                continue
+
+            # Fase 1: confirmar impulso post-breakout
+            if not seen_above_ema:
+                if low > ema:
+                    seen_above_ema = True
+                continue
+
+            # Fase 2: pullback toca EMA desde arriba, con la EMA aún sobre el rango
+            if low <= ema <= close and ema > breakout_range_high:
+                # Stop basado en ATR
+                stop_loss = close - atr * atr_stop_mult
+                entry_risk = close - stop_loss
+                if entry_risk <= 0:
+                    continue
+
+                # Primera entrada DCA
+                entry_price_first = close
+                out_idx[k] = i
+                out_kind[k] = _BUY
+                k += 1
+                dca_entries_done = 1
+                bars_since_last_entry = 0
+                highest_high_since_entry = high
+                trailing_active = False
+                trades_this_consolidation += 1
+
+                if dca_entries == 1:
+                    state = _IN_POSITION
+                else:
+                    state = _DCA_FILLING
+
+        # ----------------------------------------------------------------
+        elif state == _DCA_FILLING:
+            bars_since_last_entry += 1
+            if high > highest_high_since_entry:
+                highest_high_since_entry = high
+
+            # Protección DCA: si toca stop, vender todo y salir
+            if close <= stop_loss:
+                out_idx[k] = i
+                out_kind[k] = _SELL_ALL
+                k += 1
+                state = _WAITING_RESET
+                trailing_active = False
+                partial_done = False
+                dca_entries_done = 0
+                seen_above_ema = False
+                continue
+
+            # Siguiente entrada DCA cada N velas
+            if bars_since_last_entry >= dca_interval_bars:
+                out_idx[k] = i
+                out_kind[k] = _BUY
+                k += 1
+                dca_entries_done += 1
+                bars_since_last_entry = 0
+
+                if dca_entries_done >= dca_entries:
+                    state = _IN_POSITION
+
+        # ----------------------------------------------------------------
+        elif state == _IN_POSITION:
+            if high > highest_high_since_entry:
+                highest_high_since_entry = high
+            profit = close - entry_price_first
+
+            exit_all = False
+            if not partial_done:
+                # Fase 1: pre-parcial (stop fijo, esperando trail_activation_r)
+                if close <= stop_loss:
+                    exit_all = True
+                elif profit >= entry_risk * trail_activation_r:
+                    # Cerrar parcial + activar trailing + stop a break-even
+                    out_idx[k] = i
+                    out_kind[k] = _SELL_PARTIAL
+                    k += 1
+                    partial_done = True
+                    stop_loss = entry_price_first
+                    trailing_active = True
+                    trailing_stop = highest_high_since_entry - atr * atr_trail_mult
+                    if trailing_stop < stop_loss:
+                        trailing_stop = stop_loss
+            else:
+                # Fase 2: post-parcial (trailing solo sube + BE + TP máximo)
+                if trailing_active:
+                    new_trail = highest_high_since_entry - atr * atr_trail_mult
+                    if new_trail > trailing_stop:
+                        trailing_stop = new_trail
+
+                hit_be = close <= stop_loss
+                hit_trail = trailing_active and close <= trailing_stop
+                hit_tp = profit >= entry_risk * max_tp_r
+                exit_all = hit_be or hit_trail or hit_tp
+
+            if exit_all:
+                out_idx[k] = i
+                out_kind[k] = _SELL_ALL
+                k += 1
+                state = _WAITING_RESET
+                trailing_active = False
+                partial_done = False
+                dca_entries_done = 0
+                seen_above_ema = False
+
+        # ----------------------------------------------------------------
+        else:  # _WAITING_RESET
+            if close < ema:
+                state = _SCANNING
+
+    return out_idx[:k], out_kind[:k]
+
+
 class BTCPugilanimeV2(BaseStrategy):
     """
     Estrategia breakout-pullback sobre BTC 5min con filtro de tendencia y DCA temporal.
@@ -94,33 +349,56 @@ class BTCPugilanimeV2(BaseStrategy):
         df = self.market_data
 
         # Rango de acumulación
-        df['Range_High'] = df['High'].rolling(self.lookback_period).max()
-        df['Range_Low'] = df['Low'].rolling(self.lookback_period).min()
-
-        # Rango estable: máximo no cambió en lookback/2 velas
+        # Máximo/mínimo rodante y EMA con utils.rolling (kernels Numba, mismo resultado que pandas)
+        high = df['High'].to_numpy(np.float64)
+        low = df['Low'].to_numpy(np.float64)
+        range_high = rolling_max(high, self.lookback_period)
+        df['Range_High'] = range_high
+        df['Range_Low'] = rolling_min(low, self.lookback_period)
+
+        # Rango estable: máximo no cambió en lookback/2 velas. Comparación entre dos
+        # vistas desplazadas del mismo array (= Range_High == Range_High.shift(half));
+        # las primeras `half` velas no tienen referencia: False
         half = self.lookback_period // 2
-        df['Range_Stable'] = (df['Range_High'] == df['Range_High'].shift(half))
+        range_stable = np.zeros(len(range_high), dtype=bool)
+        if half < len(range_high):
+            np.equal(range_high[half:], range_high[:len(range_high) - half], out=range_stable[half:])
+        df['Range_Stable'] = range_stable
 
         # Tendencia y pullback
         df['SMA_Trend'] = df['Close'].rolling(self.sma_trend_period).mean()
-        df['EMA'] = df['Close'].ewm(span=self.ema_period, adjust=False).mean()
+        df['EMA'] = ema(df['Close'].to_numpy(np.float64), self.ema_period)
 
         # Volumen
         df['Volume_MA'] = df['Volume'].rolling(20).mean()
 
         # ATR para stops dinámicos
-        tr = df['High'] - df['Low']
-        tr = tr.combine(abs(df['High'] - df['Close'].shift(1)), max)
-        tr = tr.combine(abs(df['Low'] - df['Close'].shift(1)), max)
-        df['ATR'] = tr.rolling(self.atr_period).mean()
-
-        print(f"BTCPugilanimeV2 configurada:")
-        print(f"   Rango: {self.lookback_period} velas ({self.lookback_period * 5 / 60:.0f}h)")
-        print(f"   Tendencia: SMA {self.sma_trend_period} | Pullback: EMA {self.ema_period}")
-        print(f"   Stop: ATR({self.atr_period}) x {self.atr_stop_mult} | Trail: ATR x {self.atr_trail_mult} tras {self.trail_activation_r}R")
-        print(f"   DCA: {self.dca_entries} entradas cada {self.dca_interval_bars} velas ({self.dca_interval_bars * 5}min)")
-        print(f"   Parcial: {self.partial_close_pct:.0%} en {self.trail_activation_r}R, TP max {self.max_tp_r}R, BE post-parcial")
-        print(f"   Breakout: {self.breakout_confirm_bars} velas confirm, vol {self.volume_multiplier}x")
+        # True range sobre arrays NumPy: max(High - Low, |High - Close previo|, |Low - Close previo|).
+        # copyto(where=gap > tr) es el max() de Python que usaba combine(max): un NaN
+        # en gap no reemplaza a tr. La primera barra no tiene Close previo: TR = High - Low
+        prev_close = df['Close'].to_numpy(np.float64)[:-1]
+        tr = high - low
+        for extreme in (high, low):
+            gap = np.abs(extreme[1:] - prev_close)
+            np.copyto(tr[1:], gap, where=gap > tr[1:])
+        df['ATR'] = pd.Series(tr, index=df.index).rolling(self.atr_period).mean()
+
+        # Arrays de entrada del kernel, extraídos una vez: generate_simple_signals no
+        # vuelve a tocar el DataFrame (se reutilizan si se llama varias veces)
+        self._scan_arrays = {
+            column: df[column].to_numpy(bool if column == 'Range_Stable' else np.float64) for column in (
+                'Close', 'High', 'Low', 'Volume', 'EMA', 'SMA_Trend', 'Range_High',
+                'Range_Low', 'Range_Stable', 'Volume_MA', 'ATR'
+            )
+        }
+
+        self._log(f"BTCPugilanimeV2 configurada:")
+        self._log(f"   Rango: {self.lookback_period} velas ({self.lookback_period * 5 / 60:.0f}h)")
+        self._log(f"   Tendencia: SMA {self.sma_trend_period} | Pullback: EMA {self.ema_period}")
+        self._log(f"   Stop: ATR({self.atr_period}) x {self.atr_stop_mult} | Trail: ATR x {self.atr_trail_mult} tras {self.trail_activation_r}R")
+        self._log(f"   DCA: {self.dca_entries} entradas cada {self.dca_interval_bars} velas ({self.dca_interval_bars * 5}min)")
+        self._log(f"   Parcial: {self.partial_close_pct:.0%} en {self.trail_activation_r}R, TP max {self.max_tp_r}R, BE post-parcial")
+        self._log(f"   Breakout: {self.breakout_confirm_bars} velas confirm, vol {self.volume_multiplier}x")
 
     def generate_simple_signals(self) -> list:
         """
@@ -131,267 +409,39 @@ class BTCPugilanimeV2(BaseStrategy):
             IN_POSITION   → DCA completo, gestionando trailing stop
             WAITING_RESET → trade cerrado, esperando reset bajo EMA
         """
-        self.simple_signals = []
-
-        # Estado
-        state = "SCANNING"
-        breakout_range_high = None
-        breakout_range_low = None
-        seen_above_ema = False
-        stop_loss = None
-        entry_price_first = None      # Precio de la primera entrada (para calcular R)
-        entry_risk = None             # Riesgo = entry - stop (para calcular trailing activation)
-        trailing_stop = None
-        trailing_active = False
-        partial_done = False          # ¿Ya se hizo el cierre parcial?
-        highest_high_since_entry = None
-        bars_above_range = 0          # Conteo de cierres consecutivos sobre range_high
-        volume_confirmed = False       # Volumen confirmado en primera vela del breakout
-        bars_since_breakout = 0       # Timeout del breakout
-        dca_entries_done = 0
-        bars_since_last_entry = 0
-        trades_this_consolidation = 0
-        last_breakout_level = None
-
-        # Pre-extraer arrays numpy
-        closes = self.market_data['Close'].values
-        highs = self.market_data['High'].values
-        lows = self.market_data['Low'].values
-        volumes = self.market_data['Volume'].values
-        emas = self.market_data['EMA'].values
-        sma_trends = self.market_data['SMA_Trend'].values
-        range_highs = self.market_data['Range_High'].values
-        range_lows = self.market_data['Range_Low'].values
-        range_stables = self.market_data['Range_Stable'].values
-        volume_mas = self.market_data['Volume_MA'].values
-        atrs = self.market_data['ATR'].values
-        timestamps = self.market_data.index
+        # La máquina de estados corre en un kernel @njit sobre arrays NumPy;
+        # solo se crean objetos para las barras con señal
+        arrays = self._scan_arrays
+        closes = arrays['Close']
+
+        # Condiciones de SCANNING vectorizadas; el kernel solo recorre la máquina de estados
+        trend_ok, above_range, breakout_start = _breakout_masks(
+            closes, arrays['Volume'], arrays['SMA_Trend'], arrays['Range_High'], arrays['Range_Stable'],
+            arrays['Volume_MA'], self.volume_multiplier
+        )
 
         start = max(self.lookback_period, self.sma_trend_period, self.atr_period) + 1
+        signal_idx, signal_kind = _pugilanime_v2_scan(
+            closes, arrays['High'], arrays['Low'], arrays['EMA'], arrays['Range_High'], arrays['Range_Low'],
+            arrays['ATR'], trend_ok, above_range, breakout_start, np.flatnonzero(breakout_start), start,
+            self.atr_stop_mult, self.atr_trail_mult, self.trail_activation_r, self.breakout_confirm_bars,
+            self.breakout_timeout, self.dca_entries, self.dca_interval_bars, self.max_tp_r
+        )
 
-        for i in range(start, len(self.market_data)):
-            close = closes[i]
-            high = highs[i]
-            low = lows[i]
-            ema = emas[i]
-            atr = atrs[i]
-
-            # ----------------------------------------------------------------
-            if state == "SCANNING":
-                # Filtro de tendencia: solo operar en alcista
-                if close < sma_trends[i]:
-                    bars_above_range = 0
-                    continue
-
-                range_high = range_highs[i - 1]
-                range_stable = range_stables[i - 1]
-                volume_ma = volume_mas[i - 1]
-
-                # Confirmación: N cierres consecutivos sobre range_high
-                # Primera vela: necesita range_stable + volumen. Siguientes: solo close > range_high.
-                if close > range_high:
-                    if bars_above_range == 0:
-                        # Primera vela: necesita range estable y volumen
-                        if range_stable and volumes[i] > volume_ma * self.volume_multiplier:
-                            bars_above_range = 1
-                            volume_confirmed = True
-                    else:
-                        # Velas de confirmación: solo close > range_high
-                        bars_above_range += 1
-                else:
-                    bars_above_range = 0
-                    volume_confirmed = False
-
-                if bars_above_range >= self.breakout_confirm_bars:
-                    # Nueva consolidación?
-                    if range_high != last_breakout_level:
-                        trades_this_consolidation = 0
-                        last_breakout_level = range_high
-                    if trades_this_consolidation >= 2:
-                        bars_above_range = 0
-                        continue
-
-                    state = "BREAKOUT"
-                    breakout_range_high = range_high
-                    breakout_range_low = range_lows[i - 1]
-                    seen_above_ema = False
-                    bars_since_breakout = 0
-                    bars_above_range = 0
-
-            # ----------------------------------------------------------------
-            elif state == "BREAKOUT":
-                bars_since_breakout += 1
-
-                # Timeout
-                if bars_since_breakout > self.breakout_timeout:
-                    state = "SCANNING"
-                    seen_above_ema = False
-                    continue
-
-                # Invalidación: precio vuelve bajo el rango
-                if close < breakout_range_low:
-                    state = "SCANNING"
-                    seen_above_ema = False
-                    continue
-
-                # Fase 1: confirmar impulso post-breakout
-                if not seen_above_ema:
-                    if low > ema:
-                        seen_above_ema = True
-                    continue
-
-                # Fase 2: pullback toca EMA desde arriba
-                pullback_touched_ema = low <= ema <= close
-                ema_above_breakout = ema > breakout_range_high
-
-                if pullback_touched_ema and ema_above_breakout:
-                    # Stop basado en ATR
-                    stop_loss = close - atr * self.atr_stop_mult
-                    entry_risk = close - stop_loss
-                    if entry_risk <= 0:
-                        continue
-
-                    # Primera entrada DCA
-                    entry_price_first = close
-                    self.create_simple_signal(
-                        signal_type=SignalType.BUY,
-                        timestamp=timestamps[i],
-                        price=close,
-                        position_size_pct=self.dca_size_pct
-                    )
-                    dca_entries_done = 1
-                    bars_since_last_entry = 0
-                    highest_high_since_entry = high
-                    trailing_stop = None
-                    trailing_active = False
-                    trades_this_consolidation += 1
-
-                    if self.dca_entries == 1:
-                        state = "IN_POSITION"
-                    else:
-                        state = "DCA_FILLING"
-
-            # ----------------------------------------------------------------
-            elif state == "DCA_FILLING":
-                bars_since_last_entry += 1
-                highest_high_since_entry = max(highest_high_since_entry, high)
-
-                # Protección DCA: si toca stop, vender todo y salir
-                if close <= stop_loss:
-                    self.create_simple_signal(
-                        signal_type=SignalType.SELL,
-                        timestamp=timestamps[i],
-                        price=close,
-                        position_size_pct=1.0
-                    )
-                    state = "WAITING_RESET"
-                    stop_loss = None
-                    entry_price_first = None
-                    entry_risk = None
-                    trailing_stop = None
-                    trailing_active = False
-                    partial_done = False
-                    highest_high_since_entry = None
-                    dca_entries_done = 0
-                    seen_above_ema = False
-                    continue
+        # BUY: entrada DCA (dca_size_pct). SELL: cierre parcial en trail_activation_r
+        # (partial_close_pct) o cierre completo (1.0)
+        sizes = {_BUY: self.dca_size_pct, _SELL_ALL: 1.0, _SELL_PARTIAL: self.partial_close_pct}
+        kinds = signal_kind.tolist()
+        self.simple_signals = TradingSignal.from_arrays(
+            timestamps=self.market_data.index[signal_idx],
+            signal_types=[SignalType.BUY if kind == _BUY else SignalType.SELL for kind in kinds],
+            prices=closes[signal_idx],
+            position_size_pcts=[sizes[kind] for kind in kinds],
+            symbol=self.symbol
+        )
 
-                # Siguiente entrada DCA cada N velas
-                if bars_since_last_entry >= self.dca_interval_bars:
-                    self.create_simple_signal(
-                        signal_type=SignalType.BUY,
-                        timestamp=timestamps[i],
-                        price=close,
-                        position_size_pct=self.dca_size_pct
-                    )
-                    dca_entries_done += 1
-                    bars_since_last_entry = 0
-
-                    if dca_entries_done >= self.dca_entries:
-                        state = "IN_POSITION"
-
-            # ----------------------------------------------------------------
-            elif state == "IN_POSITION":
-                highest_high_since_entry = max(highest_high_since_entry, high)
-                profit = close - entry_price_first
-
-                # --- Fase 1: Pre-parcial (stop fijo, esperando 1R) ---
-                if not partial_done:
-                    if close <= stop_loss:
-                        # Stop loss: cerrar 100%
-                        self.create_simple_signal(
-                            signal_type=SignalType.SELL,
-                            timestamp=timestamps[i],
-                            price=close,
-                            position_size_pct=1.0
-                        )
-                        state = "WAITING_RESET"
-                        stop_loss = None
-                        entry_price_first = None
-                        entry_risk = None
-                        trailing_stop = None
-                        trailing_active = False
-                        partial_done = False
-                        highest_high_since_entry = None
-                        dca_entries_done = 0
-                        seen_above_ema = False
-                        continue
-
-                    if profit >= entry_risk * self.trail_activation_r:
-                        # 1R alcanzado: cerrar parcial + activar trailing + BE
-                        self.create_simple_signal(
-                            signal_type=SignalType.SELL,
-                            timestamp=timestamps[i],
-                            price=close,
-                            position_size_pct=self.partial_close_pct
-                        )
-                        partial_done = True
-                        # Stop sube a break-even (avg entry price)
-                        stop_loss = entry_price_first
-                        # Activar trailing
-                        trailing_active = True
-                        trailing_stop = highest_high_since_entry - atr * self.atr_trail_mult
-                        if trailing_stop < stop_loss:
-                            trailing_stop = stop_loss
-
-                # --- Fase 2: Post-parcial (trailing + BE + TP máximo) ---
-                else:
-                    # Actualizar trailing (solo sube)
-                    if trailing_active:
-                        new_trail = highest_high_since_entry - atr * self.atr_trail_mult
-                        if new_trail > trailing_stop:
-                            trailing_stop = new_trail
-
-                    # Exit conditions para el runner (67% restante)
-                    hit_be = close <= stop_loss  # break-even
-                    hit_trail = trailing_active and close <= trailing_stop
-                    hit_tp = profit >= entry_risk * self.max_tp_r
-
-                    if hit_be or hit_trail or hit_tp:
-                        self.create_simple_signal(
-                            signal_type=SignalType.SELL,
-                            timestamp=timestamps[i],
-                            price=close,
-                            position_size_pct=1.0
-                        )
-                        state = "WAITING_RESET"
-                        stop_loss = None
-                        entry_price_first = None
-                        entry_risk = None
-                        trailing_stop = None
-                        trailing_active = False
-                        partial_done = False
-                        highest_high_since_entry = None
-                        dca_entries_done = 0
-                        seen_above_ema = False
-
-            # ----------------------------------------------------------------
-            elif state == "WAITING_RESET":
-                if close < ema:
-                    state = "SCANNING"
-
-        buys = sum(1 for s in self.simple_signals if s.signal_type == SignalType.BUY)
-        sells = sum(1 for s in self.simple_signals if s.signal_type == SignalType.SELL)
-        print(f"Signals: {len(self.simple_signals)} (BUY: {buys}, SELL: {sells})")
+        buys = int((signal_kind == _BUY).sum())
+        sells = len(signal_kind) - buys
+        self._log(f"Signals: {len(self.simple_signals)} (BUY: {buys}, SELL: {sells})")
         return self.simple_signals
 
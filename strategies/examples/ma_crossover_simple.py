@@ -3,8 +3,11 @@ Estrategia de ejemplo: Cruce de Medias Móviles
 Usando el sistema simplificado de señales.
 """
 
-from strategies.base_strategy import BaseStrategy
+import numpy as np
+
+from strategies.base_strategy import BaseStrategy, OHLCV_COLUMNS
 from models.enums import SignalType, MarketType
+from models.simple_signals import TradingSignal
 from utils.timeframe import Timeframe
 
 
@@ -13,6 +16,9 @@ class MACrossoverSimple(BaseStrategy):
     Estrategia simple: compra cuando MA rápida cruza por encima de MA lenta,
     vende cuando cruza por debajo.
     """
+
+    # Las medias se calculan aquí: del disco basta con OHLCV
+    REQUIRED_COLUMNS = OHLCV_COLUMNS
     
     def __init__(
         self,
@@ -52,43 +58,39 @@ class MACrossoverSimple(BaseStrategy):
         Returns:
             Lista de TradingSignal simplificadas
         """
-        self.simple_signals = []  # Reset
-        
+        data = self.market_data
+        ma_fast = data['MA_Fast'].to_numpy()
+        ma_slow = data['MA_Slow'].to_numpy()
+        closes = data['Close'].to_numpy()
+
+        # Cruces de todas las barras de una vez (barra i frente a i-1); el bucle
+        # solo recorre las barras con cruce
+        start = self.slow_period
+        fast_prev, slow_prev = ma_fast[start - 1:-1], ma_slow[start - 1:-1]
+        fast_curr, slow_curr = ma_fast[start:], ma_slow[start:]
+        golden_cross = (fast_prev <= slow_prev) & (fast_curr > slow_curr)   # MA rápida cruza por encima
+        death_cross = (fast_prev >= slow_prev) & (fast_curr < slow_curr)    # MA rápida cruza por debajo
+        cross_idx = np.flatnonzero(golden_cross | death_cross)
+
+        # Golden Cross abre (si no hay posición), Death Cross cierra (si la hay)
+        signal_idx = []
         in_position = False
-        
-        for i in range(self.slow_period, len(self.market_data)):
-            ma_fast_current = self.market_data['MA_Fast'].iloc[i]
-            ma_slow_current = self.market_data['MA_Slow'].iloc[i]
-            ma_fast_previous = self.market_data['MA_Fast'].iloc[i-1]
-            ma_slow_previous = self.market_data['MA_Slow'].iloc[i-1]
-            
-            # Cruce alcista (Golden Cross): MA rápida cruza por encima
-            if (ma_fast_previous <= ma_slow_previous and 
-                ma_fast_current > ma_slow_current and 
-                not in_position):
-                
-                self.create_simple_signal(
-                    signal_type=SignalType.BUY,
-                    timestamp=self.market_data.index[i],
-                    price=self.market_data['Close'].iloc[i],
-                    position_size_pct=self.position_size_pct
-                )
-                in_position = True
-            
-            # Cruce bajista (Death Cross): MA rápida cruza por debajo
-            elif (ma_fast_previous >= ma_slow_previous and 
-                  ma_fast_current < ma_slow_current and 
-                  in_position):
-                
-                self.create_simple_signal(
-                    signal_type=SignalType.SELL,
-                    timestamp=self.market_data.index[i],
-                    price=self.market_data['Close'].iloc[i],
-                    position_size_pct=1.0  # Cerrar 100% de la posición
-                )
-                in_position = False
-        
-        print(f"✓ Generadas {len(self.simple_signals)} señales")
+        for i, is_golden in zip((cross_idx + start).tolist(), golden_cross[cross_idx].tolist()):
+            if is_golden != in_position:
+                signal_idx.append(i)
+                in_position = is_golden
+
+        # Las señales alternan BUY / SELL empezando por BUY
+        signal_types = [SignalType.SELL if k % 2 else SignalType.BUY for k in range(len(signal_idx))]
+        self.simple_signals = TradingSignal.from_arrays(
+            timestamps=data.index[signal_idx],
+            signal_types=signal_types,
+            prices=closes[signal_idx],
+            position_size_pcts=[self.position_size_pct if t == SignalType.BUY else 1.0 for t in signal_types],
+            symbol=self.symbol
+        )
+
+        self._log(f"✓ Generadas {len(self.simple_signals)} señales")
         return self.simple_signals
 
 
@@ -30,6 +30,22 @@ def create_synthetic_data(n_bars=500, seed=42):
     return df
 
 
+def create_random_walk_data(n_bars=5000, seed=0, drift=0.0001):
+    """Create random-walk OHLCV data with consolidation ranges and breakouts."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(drift, 0.004, n_bars)))
+    open_prices = np.r_[close[0], close[:-1]]
+    df = pd.DataFrame({
+        'Open': open_prices,
+        'High': np.maximum(open_prices, close) * (1 + np.abs(rng.normal(0, 0.001, n_bars))),
+        'Low': np.minimum(open_prices, close) * (1 - np.abs(rng.normal(0, 0.001, n_bars))),
+        'Close': close,
+        'Volume': rng.lognormal(5, 0.8, n_bars),
+    }, index=pd.date_range('2024-01-01', periods=n_bars, freq='5min'))
+    df.index.name = 'Time'
+    return df
+
+
 class DummyStrategy(BaseStrategy):
     """Test strategy: buys and sells at regular intervals.
 
@@ -0,0 +1,133 @@
+"""Tests de BaseStrategy: carga de datos de mercado desde laboratory_data y mensajes."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.base_strategy import (
+    BaseStrategy, OHLCV_COLUMNS, _INDICATOR_CACHE_SIZE, _parse_market_csv, _read_market_file, quiet_strategies
+)
+from tests.conftest import DummyStrategy, create_synthetic_data
+
+
+class TestLoadMarketData:
+    def _write_csv(self, tmp_path):
+        df = pd.DataFrame({
+            'Time': pd.date_range('2024-01-01', periods=50, freq='5min'),
+            'Open': 100.0, 'High': 101.0, 'Low': 99.0, 'Close': 100.5, 'Volume': 10.0,
+            'EMA_9': 100.2,
+        })
+        csv_path = tmp_path / "Timeframe.M5.csv"
+        df.to_csv(csv_path, index=False)
+        return str(csv_path)
+
+    def test_matches_read_csv_and_writes_parquet_sidecar(self, tmp_path):
+        csv_path = self._write_csv(tmp_path)
+        expected = pd.read_csv(csv_path, index_col="Time", parse_dates=["Time"])
+
+        loaded = BaseStrategy._load_market_data(csv_path)
+
+        pd.testing.assert_frame_equal(loaded, expected)
+        assert os.path.exists(tmp_path / "Timeframe.M5.parquet")
+
+    def test_added_columns_do_not_leak_into_cache(self, tmp_path):
+        csv_path = self._write_csv(tmp_path)
+
+        first = BaseStrategy._load_market_data(csv_path)
+        first['High_Max'] = first['High'].rolling(5).max()
+        second = BaseStrategy._load_market_data(csv_path)
+
+        assert 'High_Max' not in second.columns
+
+    def test_parquet_sidecar_round_trip_matches_csv(self, tmp_path):
+        csv_path = self._write_csv(tmp_path)
+        BaseStrategy._load_market_data(csv_path)
+        _read_market_file.cache_clear()  # Forzar la lectura desde el sidecar
+
+        loaded = BaseStrategy._load_market_data(csv_path)
+
+        pd.testing.assert_frame_equal(loaded, pd.read_csv(csv_path, index_col="Time", parse_dates=["Time"]))
+
+    def test_loads_only_requested_columns(self, tmp_path):
+        csv_path = self._write_csv(tmp_path)
+
+        from_csv = BaseStrategy._load_market_data(csv_path, OHLCV_COLUMNS)
+        _read_market_file.cache_clear()  # Ahora desde el sidecar
+        from_parquet = BaseStrategy._load_market_data(csv_path, OHLCV_COLUMNS)
+
+        assert tuple(from_csv.columns) == OHLCV_COLUMNS
+        pd.testing.assert_frame_equal(from_parquet, from_csv)
+        assert 'EMA_9' in BaseStrategy._load_market_data(csv_path).columns
+
+    def test_rejects_missing_columns(self, tmp_path):
+        csv_path = self._write_csv(tmp_path)
+
+        with pytest.raises(ValueError, match="no encontradas"):
+            BaseStrategy._load_market_data(csv_path, ('Close', 'ATR'))
+        _read_market_file.cache_clear()
+        with pytest.raises(ValueError, match="no encontradas"):
+            BaseStrategy._load_market_data(csv_path, ('Close', 'ATR'))
+
+
+class TestParseMarketCsv:
+    def test_matches_round_trip_read_csv(self, tmp_path):
+        df = create_synthetic_data(500, seed=4)
+        df.index.name = 'Time'
+        csv_path = tmp_path / "Timeframe.M5.csv"
+        df.to_csv(csv_path)
+        expected = pd.read_csv(csv_path, index_col="Time", parse_dates=["Time"], float_precision='round_trip')
+
+        parsed = _parse_market_csv(str(csv_path))
+
+        pd.testing.assert_frame_equal(parsed, expected, check_exact=True)
+        np.testing.assert_array_equal(parsed['Close'].to_numpy(), df['Close'].to_numpy())
+
+
+class TestQuietStrategies:
+    def test_messages_printed_by_default(self, capsys):
+        DummyStrategy(data=create_synthetic_data(100))
+
+        assert 'Datos inyectados' in capsys.readouterr().out
+
+    def test_quiet_block_silences_and_restores(self, capsys):
+        with quiet_strategies():
+            DummyStrategy(data=create_synthetic_data(100))
+        assert capsys.readouterr().out == ''
+
+        DummyStrategy(data=create_synthetic_data(100))
+        assert 'Datos inyectados' in capsys.readouterr().out
+
+
+class TestCachedIndicator:
+    def test_computed_once_per_data_name_and_params(self):
+        df = create_synthetic_data(100)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return df['Close'].rolling(5).mean()
+
+        first = DummyStrategy(data=df)._cached_indicator('SMA', 5, compute)
+        second = DummyStrategy(data=df)._cached_indicator('SMA', 5, compute)
+
+        assert first is second and len(calls) == 1
+        assert first.dtype == np.float64 and not first.flags.writeable
+        np.testing.assert_array_equal(first, df['Close'].rolling(5).mean().to_numpy())
+
+        # Otros parámetros, otro DataFrame u otra clase: se recalcula
+        DummyStrategy(data=df)._cached_indicator('SMA', 10, compute)
+        DummyStrategy(data=df.copy())._cached_indicator('SMA', 5, compute)
+        type('OtherDummy', (DummyStrategy,), {})(data=df)._cached_indicator('SMA', 5, compute)
+        assert len(calls) == 4
+
+    def test_cache_cleared_when_full(self, monkeypatch):
+        monkeypatch.setattr(BaseStrategy, '_indicator_cache', {})
+        strategy = DummyStrategy(data=create_synthetic_data(100))
+        for period in range(_INDICATOR_CACHE_SIZE):
+            strategy._cached_indicator('SMA', period, lambda: np.zeros(100))
+        assert len(BaseStrategy._indicator_cache) == _INDICATOR_CACHE_SIZE
+
+        strategy._cached_indicator('SMA', -1, lambda: np.zeros(100))
+
+        assert len(BaseStrategy._indicator_cache) == 1
@@ -0,0 +1,52 @@
+"""Tests de la estrategia BreakoutSimple (strategies/examples/breakout_simple.py)."""
+import numpy as np
+import pandas as pd
+
+from models.enums import SignalType
+from strategies.examples.breakout_simple import BreakoutSimple
+from tests.conftest import create_synthetic_data
+
+
+def _reference_signals(df: pd.DataFrame, lookback: int) -> list:
+    """Implementación de referencia con pandas.rolling y un bucle .iloc."""
+    high_max = df['High'].rolling(lookback).max()
+    low_min = df['Low'].rolling(lookback).min()
+    signals, in_position = [], False
+    for i in range(lookback + 1, len(df)):
+        close = df['Close'].iloc[i]
+        if close > high_max.iloc[i - 1] and not in_position:
+            signals.append((df.index[i], SignalType.BUY, close))
+            in_position = True
+        elif close < low_min.iloc[i - 1] and in_position:
+            signals.append((df.index[i], SignalType.SELL, close))
+            in_position = False
+    return signals
+
+
+class TestBreakoutSimple:
+    def test_signals_match_reference_loop(self):
+        df = create_synthetic_data(2000, seed=3)
+        strategy = BreakoutSimple(data=df.copy(), lookback_period=15)
+
+        signals = strategy.generate_simple_signals()
+
+        assert [(s.timestamp, s.signal_type, s.price) for s in signals] == _reference_signals(df, 15)
+
+    def test_indicators_shared_across_instances_with_same_data(self):
+        df = create_synthetic_data(500, seed=1)
+        first = BreakoutSimple(data=df, lookback_period=20, position_size_pct=0.3)
+        second = BreakoutSimple(data=df, lookback_period=20, position_size_pct=0.5)
+
+        assert first.high_max is second.high_max
+        np.testing.assert_array_equal(second.high_max, df['High'].rolling(20).max().to_numpy())
+        np.testing.assert_array_equal(second.low_min, df['Low'].rolling(20).min().to_numpy())
+        assert 'High_Max' not in df.columns  # Los indicadores no se escriben en market_data
+
+    def test_indicators_not_shared_across_lookbacks_or_data(self):
+        df = create_synthetic_data(500, seed=1)
+        base = BreakoutSimple(data=df, lookback_period=20)
+        other_lookback = BreakoutSimple(data=df, lookback_period=30)
+        other_data = BreakoutSimple(data=df.copy(), lookback_period=20)
+
+        assert base.high_max is not other_lookback.high_max
+        assert base.high_max is not other_data.high_max
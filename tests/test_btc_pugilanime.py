@@ -0,0 +1,111 @@
+"""Tests de la estrategia BTCPugilanime (strategies/examples/btc_pugilanime.py)."""
+import inspect
+
+import numpy as np
+import pytest
+
+from models.enums import SignalType
+from optimization.optimizer import ParameterOptimizer
+from strategies.examples.btc_pugilanime import BTCPugilanime
+from tests.conftest import create_random_walk_data
+
+
+def _reference_signals(strategy: BTCPugilanime) -> list:
+    """Implementación de referencia: la máquina de estados original en Python puro."""
+    df = strategy.market_data
+    col = {name: df[name].to_numpy() for name in df.columns}
+    signals, state = [], 'SCANNING'
+    start = max(strategy.lookback_period, strategy.ema_period, strategy.atr_period) + 1
+    for i in range(start, len(df)):
+        close, high, low, ema, atr = (col[c][i] for c in ('Close', 'High', 'Low', 'EMA', 'ATR'))
+        if state == 'SCANNING':
+            if (col['Range_Width_ATR'][i - 1] < strategy.consolidation_threshold
+                    and close > col['Range_High'][i - 1]
+                    and col['Volume'][i] > col['Volume_MA'][i - 1] * strategy.volume_multiplier):
+                state, seen_above_ema = 'BREAKOUT', False
+                range_high, range_low = col['Range_High'][i - 1], col['Range_Low'][i - 1]
+        elif state == 'BREAKOUT':
+            if close < range_low:
+                state = 'SCANNING'
+            elif not seen_above_ema:
+                seen_above_ema = low > ema
+            elif low <= ema <= close and ema > range_high:
+                signals.append((df.index[i], SignalType.BUY, close))
+                state, max_price = 'IN_POSITION', close
+                trailing_stop = close - atr * strategy.atr_multiplier
+        elif state == 'IN_POSITION':
+            if high > max_price:
+                max_price = high
+                trailing_stop = max_price - atr * strategy.atr_multiplier
+            if close < trailing_stop:
+                signals.append((df.index[i], SignalType.SELL, close))
+                state = 'WAITING_RESET'
+        elif close < ema:
+            state = 'SCANNING'
+    return signals
+
+
+class TestBTCPugilanime:
+    def test_signals_match_reference_loop(self):
+        for params in ({'consolidation_threshold': 8.0},
+                       {'lookback_period': 10, 'ema_period': 50, 'atr_period': 7,
+                        'volume_multiplier': 1.2, 'consolidation_threshold': 5.0}):
+            strategy = BTCPugilanime(data=create_random_walk_data(seed=1), **params)
+
+            signals = strategy.generate_simple_signals()
+
+            assert len(signals) > 0
+            assert [(s.timestamp, s.signal_type, s.price) for s in signals] == _reference_signals(strategy)
+
+    def test_buy_uses_position_size_and_sell_closes_all(self):
+        strategy = BTCPugilanime(data=create_random_walk_data(seed=2), consolidation_threshold=8.0,
+                                 position_size_pct=0.3)
+
+        signals = strategy.generate_simple_signals()
+
+        assert {s.position_size_pct for s in signals if s.signal_type == SignalType.BUY} == {0.3}
+        assert {s.position_size_pct for s in signals if s.signal_type == SignalType.SELL} == {1.0}
+
+    def test_indicators_shared_across_instances_with_same_data(self):
+        def not_recomputed():
+            raise AssertionError("indicador recalculado")
+
+        df = create_random_walk_data(seed=3)
+        BTCPugilanime(data=df, atr_multiplier=2.0)
+        second = BTCPugilanime(data=df, atr_multiplier=3.0, atr_period=7)
+
+        # Mismo DataFrame: EMA y ATR(14) salen de la caché; ATR(7) es otra entrada
+        second._cached_indicator('Range_Width_ATR', (20, 14), not_recomputed)
+        second._cached_indicator('EMA', 20, not_recomputed)
+        second._cached_indicator('ATR', 14, not_recomputed)
+        expected_atr = second._true_range().rolling(7).mean().to_numpy()
+        np.testing.assert_array_equal(df['ATR'].to_numpy(), expected_atr)
+
+        # Otro DataFrame (aunque igual) no reutiliza la caché del primero
+        other = BTCPugilanime(data=df.copy())
+        with pytest.raises(AssertionError, match="recalculado"):
+            other._cached_indicator('ATR', 7, not_recomputed)
+
+    def test_signal_params_cover_all_strategy_parameters(self):
+        params = set(inspect.signature(BTCPugilanime.__init__).parameters)
+
+        assert params - {'self', 'symbol', 'timeframe', 'exchange', 'kwargs'} == set(BTCPugilanime.SIGNAL_PARAMS)
+
+    def test_optimizer_reuses_signals_across_initial_capital_and_fees(self, monkeypatch):
+        calls = []
+        generate = BTCPugilanime.generate_simple_signals
+
+        def counting_generate(strategy):
+            calls.append(strategy.atr_multiplier)
+            return generate(strategy)
+
+        monkeypatch.setattr(BTCPugilanime, 'generate_simple_signals', counting_generate)
+        optimizer = ParameterOptimizer(BTCPugilanime, create_random_walk_data(seed=1), consolidation_threshold=8.0)
+
+        summary = optimizer.optimize(
+            {'atr_multiplier': [2.0, 3.0], 'initial_capital': [1000.0, 5000.0], 'fees': [True, False]},
+            show_progress=False
+        )
+
+        assert len(summary) == 8
+        assert sorted(calls) == [2.0, 3.0]
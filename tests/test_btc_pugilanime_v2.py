@@ -0,0 +1,123 @@
+"""Tests de la estrategia BTCPugilanimeV2 (strategies/examples/btc_pugilanime_v2.py)."""
+import numpy as np
+
+from models.enums import SignalType
+from strategies.examples.btc_pugilanime_v2 import BTCPugilanimeV2
+from tests.conftest import create_random_walk_data
+
+
+def _reference_signals(s: BTCPugilanimeV2) -> list:
+    """Implementación de referencia: la máquina de estados original en Python puro."""
+    df = s.market_data
+    col = {name: df[name].to_numpy() for name in df.columns}
+    signals, state = [], 'SCANNING'
+    bars_above, trades, last_level, partial_done = 0, 0, None, False
+
+    def emit(i, signal_type, size):
+        signals.append((df.index[i], signal_type, col['Close'][i], size))
+
+    start = max(s.lookback_period, s.sma_trend_period, s.atr_period) + 1
+    for i in range(start, len(df)):
+        close, high, low, ema, atr = (col[c][i] for c in ('Close', 'High', 'Low', 'EMA', 'ATR'))
+        if state == 'SCANNING':
+            if close < col['SMA_Trend'][i]:
+                bars_above = 0
+                continue
+            range_high = col['Range_High'][i - 1]
+            if close > range_high:
+                if bars_above == 0:
+                    if col['Range_Stable'][i - 1] and col['Volume'][i] > col['Volume_MA'][i - 1] * s.volume_multiplier:
+                        bars_above = 1
+                else:
+                    bars_above += 1
+            else:
+                bars_above = 0
+            if bars_above >= s.breakout_confirm_bars:
+                if range_high != last_level:
+                    trades, last_level = 0, range_high
+                if trades >= 2:
+                    bars_above = 0
+                    continue
+                state, seen_above_ema, since_breakout, bars_above = 'BREAKOUT', False, 0, 0
+                breakout_high, breakout_low = range_high, col['Range_Low'][i - 1]
+        elif state == 'BREAKOUT':
+            since_breakout += 1
+            if since_breakout > s.breakout_timeout or close < breakout_low:
+                state = 'SCANNING'
+            elif not seen_above_ema:
+                seen_above_ema = low > ema
+            elif low <= ema <= close and ema > breakout_high:
+                stop_loss = close - atr * s.atr_stop_mult
+                risk = close - stop_loss
+                if risk <= 0:
+                    continue
+                emit(i, SignalType.BUY, s.dca_size_pct)
+                entry, highest, entries, since_entry = close, high, 1, 0
+                trades += 1
+                state = 'IN_POSITION' if s.dca_entries == 1 else 'DCA_FILLING'
+        elif state in ('DCA_FILLING', 'IN_POSITION'):
+            highest = max(highest, high)
+            exit_all = False
+            if state == 'DCA_FILLING':
+                since_entry += 1
+                if close <= stop_loss:
+                    exit_all = True
+                elif since_entry >= s.dca_interval_bars:
+                    emit(i, SignalType.BUY, s.dca_size_pct)
+                    entries, since_entry = entries + 1, 0
+                    if entries >= s.dca_entries:
+                        state = 'IN_POSITION'
+            elif not partial_done:
+                if close <= stop_loss:
+                    exit_all = True
+                elif close - entry >= risk * s.trail_activation_r:
+                    emit(i, SignalType.SELL, s.partial_close_pct)
+                    partial_done, stop_loss = True, entry
+                    trailing_stop = max(highest - atr * s.atr_trail_mult, stop_loss)
+            else:
+                trailing_stop = max(trailing_stop, highest - atr * s.atr_trail_mult)
+                exit_all = close <= stop_loss or close <= trailing_stop or close - entry >= risk * s.max_tp_r
+            if exit_all:
+                emit(i, SignalType.SELL, 1.0)
+                state, partial_done = 'WAITING_RESET', False
+        elif close < ema:
+            state = 'SCANNING'
+    return signals
+
+
+class TestBTCPugilanimeV2:
+    def test_signals_match_reference_loop(self):
+        base = {'lookback_period': 24, 'ema_period': 10, 'sma_trend_period': 50, 'volume_multiplier': 1.0}
+        # breakout_confirm_bars=0: SCANNING no salta entre candidatas (cualquier barra confirma)
+        for params in ({**base, 'breakout_confirm_bars': 1}, {**base, 'breakout_confirm_bars': 0},
+                       {**base, 'dca_entries': 1, 'trail_activation_r': 1.0, 'max_tp_r': 3.0}):
+            strategy = BTCPugilanimeV2(data=create_random_walk_data(seed=1, drift=0.0005), **params)
+
+            signals = strategy.generate_simple_signals()
+
+            assert len(signals) > 0
+            assert ([(s.timestamp, s.signal_type, s.price, s.position_size_pct) for s in signals]
+                    == _reference_signals(strategy))
+
+    def test_atr_matches_true_range_with_python_max(self):
+        df = create_random_walk_data(n_bars=300, seed=3)
+        df.iloc[[5, 50], df.columns.get_loc('High')] = np.nan
+        df.iloc[[10, 60], df.columns.get_loc('Close')] = np.nan
+        df.iloc[20, df.columns.get_loc('Low')] = np.nan
+
+        strategy = BTCPugilanimeV2(data=df.copy(), atr_period=14)
+
+        # Referencia: combine con el max() de Python (un NaN en el segundo argumento se ignora)
+        tr = df['High'] - df['Low']
+        tr = tr.combine(abs(df['High'] - df['Close'].shift(1)), max)
+        tr = tr.combine(abs(df['Low'] - df['Close'].shift(1)), max)
+        np.testing.assert_array_equal(strategy.market_data['ATR'].to_numpy(), tr.rolling(14).mean().to_numpy())
+
+    def test_range_stable_matches_shift_comparison(self):
+        df = create_random_walk_data(n_bars=300, seed=2)
+        for lookback in (1, 3, 96, 700):
+            strategy = BTCPugilanimeV2(data=df.copy(), lookback_period=lookback)
+
+            range_high = df['High'].rolling(lookback).max()
+            expected = range_high == range_high.shift(lookback // 2)
+            np.testing.assert_array_equal(strategy.market_data['Range_Stable'].to_numpy(), expected.to_numpy())
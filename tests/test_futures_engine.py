@@ -149,6 +149,18 @@ class TestPositionFutures:
         assert pos.total_crypto() == pytest.approx(0.2)
         assert pos.total_contracts() == 0
 
+    def test_running_totals_match_entries_after_partial_close(self):
+        """Las sumas acumuladas coinciden con recorrer las entradas tras un cierre parcial."""
+        pos = Position(symbol="BTC", entry_time=datetime(2024, 1, 1))
+        pos.add_entry(datetime(2024, 1, 1), 50000.0, size_usdt=1000.0, contracts=0, fee=1.0, slippage_cost=0.3)
+        pos.add_entry(datetime(2024, 1, 2), 48000.0, size_usdt=500.0, contracts=0, fee=0.5, slippage_cost=0.1)
+        pos.partial_close(0.4)
+
+        assert pos.total_cost() == sum(e.size_usdt for e in pos.entries)
+        assert pos.total_fees_on_entries() == sum(e.fee for e in pos.entries)
+        assert pos.total_slippage_on_entries() == sum(e.slippage_cost for e in pos.entries)
+        assert pos.total_crypto() == sum(e.size_usdt / e.price for e in pos.entries)
+
 
 def make_es_config():
     """Config de ES (S&P 500 E-mini) para tests."""
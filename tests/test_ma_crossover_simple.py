@@ -0,0 +1,43 @@
+"""Tests de la estrategia MACrossoverSimple (strategies/examples/ma_crossover_simple.py)."""
+from models.enums import SignalType
+from strategies.examples.ma_crossover_simple import MACrossoverSimple
+from tests.conftest import create_random_walk_data
+
+
+def _reference_signals(strategy: MACrossoverSimple) -> list:
+    """Implementación de referencia: el bucle original con .iloc."""
+    df = strategy.market_data
+    signals, in_position = [], False
+    for i in range(strategy.slow_period, len(df)):
+        fast, slow = df['MA_Fast'].iloc[i], df['MA_Slow'].iloc[i]
+        fast_prev, slow_prev = df['MA_Fast'].iloc[i - 1], df['MA_Slow'].iloc[i - 1]
+        if fast_prev <= slow_prev and fast > slow and not in_position:
+            signals.append((df.index[i], SignalType.BUY, df['Close'].iloc[i]))
+            in_position = True
+        elif fast_prev >= slow_prev and fast < slow and in_position:
+            signals.append((df.index[i], SignalType.SELL, df['Close'].iloc[i]))
+            in_position = False
+    return signals
+
+
+class TestMACrossoverSimple:
+    def test_signals_match_reference_loop(self):
+        df = create_random_walk_data(n_bars=2000, seed=4)
+        # Tramo plano: medias iguales (los cruces exigen <= / >= en la barra anterior)
+        df.iloc[100:140, df.columns.get_loc('Close')] = 100.0
+        for fast, slow in ((10, 30), (1, 2)):
+            strategy = MACrossoverSimple(data=df.copy(), fast_period=fast, slow_period=slow)
+
+            signals = strategy.generate_simple_signals()
+
+            assert len(signals) > 0
+            assert [(s.timestamp, s.signal_type, s.price) for s in signals] == _reference_signals(strategy)
+
+    def test_signals_alternate_buy_sell(self):
+        strategy = MACrossoverSimple(data=create_random_walk_data(n_bars=2000, seed=5), position_size_pct=0.5)
+
+        signals = strategy.generate_simple_signals()
+
+        assert [s.signal_type for s in signals[::2]] == [SignalType.BUY] * len(signals[::2])
+        assert [s.signal_type for s in signals[1::2]] == [SignalType.SELL] * len(signals[1::2])
+        assert {s.position_size_pct for s in signals} == {0.5, 1.0}
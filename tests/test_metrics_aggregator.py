@@ -0,0 +1,36 @@
+"""Tests para MetricsAggregator."""
+import os
+
+import pandas as pd
+import pytest
+
+from core.backtest_runner import BacktestRunner
+
+
+@pytest.fixture
+def aggregator(dummy_strategy_class, synthetic_market_data):
+    """MetricsAggregator de un backtest corto con DummyStrategy."""
+    strategy = dummy_strategy_class(data=synthetic_market_data)
+    runner = BacktestRunner(strategy)
+    runner.run(verbose=False)
+    return runner.metrics
+
+
+class TestSaveResults:
+    def test_save_results_csv(self, aggregator, tmp_path):
+        aggregator.save_results(str(tmp_path), format='csv')
+        for name in ('trade_metrics', 'portfolio_summary', 'engine_results'):
+            assert os.path.exists(tmp_path / f'{name}.csv')
+        df = pd.read_csv(tmp_path / 'engine_results.csv')
+        assert len(df) == len(aggregator.results)
+
+    def test_save_results_parquet_default(self, aggregator, tmp_path):
+        pytest.importorskip('pyarrow')
+        aggregator.save_results(str(tmp_path))
+        df = pd.read_parquet(tmp_path / 'trade_metrics.parquet')
+        assert len(df) == len(aggregator.trade_metrics_df)
+        assert list(df.columns) == list(aggregator.trade_metrics_df.columns)
+
+    def test_save_results_rejects_unknown_format(self, aggregator, tmp_path):
+        with pytest.raises(ValueError, match="no soportado"):
+            aggregator.save_results(str(tmp_path), format='xlsx')
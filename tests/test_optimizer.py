@@ -6,10 +6,25 @@ import pytest
 import pandas as pd
 from strategies.examples.breakout_simple import BreakoutSimple
 from optimization.optimizer import ParameterOptimizer
+from optimization.results import OptimizationResult
 from utils.timeframe import Timeframe
+from tests.conftest import DummyStrategy
 import os
 
 
+class CachedDummyStrategy(DummyStrategy):
+    """DummyStrategy que declara SIGNAL_PARAMS y cuenta las generaciones de señales"""
+    SIGNAL_PARAMS = ('buy_every', 'hold_bars')
+    generate_calls = 0
+
+    def __init__(self, buy_every=20, hold_bars=10, initial_capital=1000.0, **kwargs):
+        super().__init__(buy_every=buy_every, hold_bars=hold_bars, initial_capital=initial_capital, **kwargs)
+
+    def generate_simple_signals(self):
+        type(self).generate_calls += 1
+        return super().generate_simple_signals()
+
+
 @pytest.fixture
 def sample_market_data():
     """Fixture que carga datos de muestra"""
@@ -73,7 +88,7 @@ class TestParameterOptimizer:
             'position_size_pct': [0.3, 0.4, 0.5]
         }
 
-        combinations = optimizer._generate_grid(param_ranges, method='grid')
+        combinations = list(optimizer._generate_grid(param_ranges, method='grid'))
 
         # 2 * 3 = 6 combinaciones
         assert len(combinations) == 6
@@ -166,5 +181,236 @@ class TestParameterOptimizer:
             assert 'lookback_period' in best
 
 
+    def test_optimizer_parallel_matches_sequential(self, dummy_strategy_class, synthetic_market_data):
+        """Test: optimize(n_jobs=2) da los mismos resultados y en el mismo orden que n_jobs=1"""
+        param_ranges = {'buy_every': [15, 20, 30], 'hold_bars': [5, 10]}
+        summaries = []
+        for n_jobs in (1, 2):
+            optimizer = ParameterOptimizer(
+                strategy_class=dummy_strategy_class,
+                market_data=synthetic_market_data,
+                initial_capital=1000.0
+            )
+            summaries.append(optimizer.optimize(
+                param_ranges=param_ranges,
+                metric='sharpe_ratio',
+                show_progress=False,
+                n_jobs=n_jobs
+            ).drop(columns='execution_time'))
+
+        assert len(summaries[0]) == 6
+        pd.testing.assert_frame_equal(summaries[0], summaries[1])
+
+    def test_optimizer_rejects_zero_jobs(self, dummy_strategy_class, synthetic_market_data):
+        """Test: n_jobs=0 no es válido"""
+        optimizer = ParameterOptimizer(
+            strategy_class=dummy_strategy_class,
+            market_data=synthetic_market_data
+        )
+
+        with pytest.raises(ValueError, match="n_jobs"):
+            optimizer.optimize(param_ranges={'buy_every': [15]}, n_jobs=0)
+
+
+    def test_optimizer_reuses_signals_across_non_signal_params(self, synthetic_market_data):
+        """Test: con SIGNAL_PARAMS, variar initial_capital no regenera señales ni cambia resultados"""
+        param_ranges = {'buy_every': [15, 20], 'initial_capital': [1000.0, 2000.0, 5000.0]}
+        CachedDummyStrategy.generate_calls = 0
+
+        cached = ParameterOptimizer(CachedDummyStrategy, synthetic_market_data)
+        cached_summary = cached.optimize(param_ranges=param_ranges, show_progress=False)
+        assert CachedDummyStrategy.generate_calls == 2
+
+        CachedDummyStrategy.SIGNAL_PARAMS = None
+        try:
+            uncached = ParameterOptimizer(CachedDummyStrategy, synthetic_market_data)
+            uncached_summary = uncached.optimize(param_ranges=param_ranges, show_progress=False)
+        finally:
+            CachedDummyStrategy.SIGNAL_PARAMS = ('buy_every', 'hold_bars')
+        assert CachedDummyStrategy.generate_calls == 2 + 6
+
+        pd.testing.assert_frame_equal(
+            cached_summary.drop(columns='execution_time'),
+            uncached_summary.drop(columns='execution_time')
+        )
+
+    def test_optimizer_reuses_breakout_simple_signals_across_initial_capital(self, synthetic_market_data, monkeypatch):
+        """Test: BreakoutSimple acepta initial_capital (vía **kwargs) y reutiliza señales al variarlo"""
+        calls = []
+        generate = BreakoutSimple.generate_simple_signals
+
+        def counting_generate(strategy):
+            calls.append(strategy.lookback_period)
+            return generate(strategy)
+
+        monkeypatch.setattr(BreakoutSimple, 'generate_simple_signals', counting_generate)
+        param_ranges = {'lookback_period': [5, 10], 'initial_capital': [1000.0, 5000.0], 'fees': [True, False]}
+
+        summary = ParameterOptimizer(BreakoutSimple, synthetic_market_data).optimize(param_ranges, show_progress=False)
+
+        assert len(summary) == 8
+        assert sorted(calls) == [5, 10]
+
+        # Mismos resultados que generando las señales en cada combinación
+        monkeypatch.setattr(BreakoutSimple, 'SIGNAL_PARAMS', None)
+        uncached = ParameterOptimizer(BreakoutSimple, synthetic_market_data).optimize(param_ranges, show_progress=False)
+        assert len(calls) == 2 + 8
+        pd.testing.assert_frame_equal(summary.drop(columns='execution_time'), uncached.drop(columns='execution_time'))
+
+    def test_optimizer_skips_signal_cache_when_only_signal_params_vary(self):
+        """Test: sin parámetros fuera de SIGNAL_PARAMS que varíen, no hay caché (nunca tendría aciertos)"""
+        from optimization.optimizer import _uses_signal_cache
+
+        assert not _uses_signal_cache(BreakoutSimple, {'lookback_period': [10, 20], 'position_size_pct': [0.3, 0.5]})
+        assert not _uses_signal_cache(BreakoutSimple, {'lookback_period': [10, 20], 'initial_capital': [1000.0]})
+        assert _uses_signal_cache(BreakoutSimple, {'lookback_period': [10, 20], 'initial_capital': [1000.0, 2000.0]})
+        assert not _uses_signal_cache(DummyStrategy, {'buy_every': [10], 'initial_capital': [1000.0, 2000.0]})
+
+    def test_optimizer_validates_base_strategy_params_only_with_kwargs(self, synthetic_market_data):
+        """Test: initial_capital/fees/slippage solo son válidos si el __init__ acepta **kwargs"""
+        class NoKwargsStrategy(DummyStrategy):
+            def __init__(self, data=None, buy_every=20):
+                super().__init__(data=data, buy_every=buy_every)
+
+        ParameterOptimizer(BreakoutSimple, synthetic_market_data)._validate_params(
+            {'initial_capital': [1000.0], 'fees': [True], 'slippage': [False]}
+        )
+        with pytest.raises(ValueError, match="Parámetros inválidos"):
+            ParameterOptimizer(NoKwargsStrategy, synthetic_market_data)._validate_params({'initial_capital': [1000.0]})
+        with pytest.raises(ValueError, match="Parámetros inválidos"):
+            ParameterOptimizer(BreakoutSimple, synthetic_market_data)._validate_params({'kwargs': [1]})
+
+
+
+    def test_optimizer_summary_is_cached_until_results_change(self, dummy_strategy_class, synthetic_market_data):
+        """Test: get_summary() reutiliza el DataFrame hasta que cambian results o la métrica"""
+        optimizer = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+        summary = optimizer.optimize(param_ranges={'buy_every': [15, 20]}, show_progress=False)
+
+        assert optimizer.get_summary() is summary
+
+        optimizer.results.append(optimizer.results[0])
+        assert len(optimizer.get_summary()) == 3
+
+        optimizer.target_metric = 'max_drawdown'
+        assert optimizer.get_summary()['max_drawdown'].is_monotonic_increasing
+
+
+    def test_optimizer_summary_string_params_are_categorical(self, dummy_strategy_class, synthetic_market_data):
+        """Test: los parámetros de texto se guardan como category en get_summary()"""
+        optimizer = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+        optimizer.results = [
+            OptimizationResult(params={'mode': mode, 'buy_every': 10}, metrics={'sharpe_ratio': 1.0}, execution_time=0.1)
+            for mode in ['fast', 'slow', 'fast']
+        ]
+
+        summary = optimizer.get_summary()
+
+        assert isinstance(summary['mode'].dtype, pd.CategoricalDtype)
+        assert summary['buy_every'].dtype == 'int64'
+        assert sorted(summary['mode'].tolist()) == ['fast', 'fast', 'slow']
+
+    def test_optimizer_skips_duplicate_combinations(self, dummy_strategy_class, synthetic_market_data):
+        """Test: valores repetidos o equivalentes según canonicalize_params se ejecutan una vez"""
+        class RoundedDummyStrategy(dummy_strategy_class):
+            @classmethod
+            def canonicalize_params(cls, params):
+                return {**params, 'buy_every': round(params['buy_every'])}
+
+        optimizer = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+        optimizer.optimize(param_ranges={'buy_every': [15, 20, 15]}, show_progress=False)
+        assert [r.params['buy_every'] for r in optimizer.results] == [15, 20]
+
+        optimizer = ParameterOptimizer(RoundedDummyStrategy, synthetic_market_data)
+        optimizer.optimize(param_ranges={'buy_every': [15, 15.0000001, 20]}, show_progress=False)
+        assert [r.params['buy_every'] for r in optimizer.results] == [15, 20]
+
+    def test_optimizer_export_matches_summary(self, dummy_strategy_class, synthetic_market_data, tmp_path):
+        """Test: export_results() escribe las mismas filas y orden que get_summary()"""
+        optimizer = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+        summary = optimizer.optimize(
+            param_ranges={'buy_every': [10, 15, 20], 'hold_bars': [3, 5]}, show_progress=False
+        )
+        filename = tmp_path / 'results.csv'
+
+        optimizer.export_results(str(filename))
+
+        exported = pd.read_csv(filename)
+        pd.testing.assert_frame_equal(exported, summary.reset_index(drop=True), check_dtype=False)
+
+    def test_optimizer_random_search_samples_distinct_grid_points(self, dummy_strategy_class, synthetic_market_data):
+        """Test: method='random' evalúa n_iter combinaciones distintas de la rejilla, reproducibles con seed"""
+        param_ranges = {'buy_every': [10, 15, 20, 25, 30], 'hold_bars': [3, 5, 8]}
+        runs = []
+        for _ in range(2):
+            optimizer = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+            optimizer.optimize(param_ranges=param_ranges, method='random', n_iter=4, seed=7, show_progress=False)
+            runs.append([r.params for r in optimizer.results])
+
+        assert runs[0] == runs[1]
+        assert len(runs[0]) == 4
+        assert len({tuple(p.values()) for p in runs[0]}) == 4
+        assert all(p['buy_every'] in param_ranges['buy_every'] and p['hold_bars'] in param_ranges['hold_bars']
+                   for p in runs[0])
+
+    def test_optimizer_random_search_requires_n_iter(self, dummy_strategy_class, synthetic_market_data):
+        """Test: method='random' sin n_iter no es válido"""
+        optimizer = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+
+        with pytest.raises(ValueError, match="n_iter"):
+            optimizer.optimize(param_ranges={'buy_every': [15, 20]}, method='random')
+
+    def test_optimizer_bayes_search(self, dummy_strategy_class, synthetic_market_data):
+        """Test: method='bayes' registra como mucho n_iter combinaciones, sin repetir"""
+        pytest.importorskip('skopt')
+        optimizer = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+        summary = optimizer.optimize(
+            param_ranges={'buy_every': [10, 15, 20, 25], 'hold_bars': [5]},
+            method='bayes',
+            n_iter=6,
+            seed=0,
+            show_progress=False
+        )
+
+        params = [tuple(r.params.values()) for r in optimizer.results]
+        assert 1 <= len(params) <= 6
+        assert len(set(params)) == len(params)
+        assert optimizer.best_params is not None
+        assert len(summary) == len(params)
+
+    def test_optimizer_bayes_search_roi(self, dummy_strategy_class, synthetic_market_data, capsys):
+        """Test: metric='roi' se lee de 'ROI' en all_metrics (la búsqueda recibe scores reales)"""
+        pytest.importorskip('skopt')
+        optimizer = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+        summary = optimizer.optimize(
+            param_ranges={'buy_every': [10, 15, 20, 25], 'hold_bars': [5, 10]},
+            metric='roi',
+            method='bayes',
+            n_iter=4,
+            seed=0,
+            show_progress=False
+        )
+
+        assert "Error en" not in capsys.readouterr().out
+        assert optimizer.best_params is not None
+        assert optimizer.best_score == summary['roi'].max()
+
+    def test_optimizer_prune_keeps_best_max_drawdown(self, dummy_strategy_class, synthetic_market_data):
+        """Test: prune=True con max_drawdown encuentra el mismo mejor y marca las podadas"""
+        param_ranges = {'buy_every': [5, 10, 15, 20], 'hold_bars': [2, 3, 4]}
+        full = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+        full.optimize(param_ranges=param_ranges, metric='max_drawdown', show_progress=False)
+        pruned = ParameterOptimizer(dummy_strategy_class, synthetic_market_data)
+        summary = pruned.optimize(param_ranges=param_ranges, metric='max_drawdown', show_progress=False, prune=True)
+
+        assert pruned.best_params == full.best_params
+        assert pruned.best_score == full.best_score
+        assert len(pruned.results) == len(full.results)
+        for a, b in zip(pruned.results, full.results):
+            assert a.params == b.params
+            assert a.pruned or a.metrics == b.metrics
+        assert summary['pruned'].sum() == sum(r.pruned for r in pruned.results)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
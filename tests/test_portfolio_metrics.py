@@ -0,0 +1,62 @@
+"""Tests para BacktestMetrics (métricas a nivel portfolio)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.backtest_runner import BacktestRunner
+from metrics.portfolio_metrics import BacktestMetrics, _moment_stats
+
+
+@pytest.fixture
+def portfolio_trade_data(dummy_strategy_class, synthetic_market_data):
+    """DataFrame de trades en el formato que recibe BacktestMetrics."""
+    runner = BacktestRunner(dummy_strategy_class(data=synthetic_market_data))
+    runner.run(verbose=False)
+    return runner.metrics._adapt_for_portfolio_metrics(runner.metrics.trade_metrics_df)
+
+
+class TestMomentStats:
+    def test_matches_pandas(self, synthetic_trades_df):
+        pnl = synthetic_trades_df['net_pnl'].astype(float)
+        mean, std, downside_std = _moment_stats(pnl.to_numpy())
+        assert mean == pytest.approx(pnl.mean())
+        assert std == pytest.approx(pnl.std())
+        assert downside_std == pytest.approx(pnl[pnl < 0].std())
+
+    def test_float32_input(self, synthetic_trades_df):
+        pnl = synthetic_trades_df['net_pnl'].to_numpy(dtype=np.float32)
+        mean, std, _ = _moment_stats(pnl)
+        assert mean == pytest.approx(pnl.astype(np.float64).mean())
+        assert std == pytest.approx(pnl.astype(np.float64).std(ddof=1))
+
+    def test_empty_and_single_value(self):
+        mean, std, downside_std = _moment_stats(np.array([], dtype=np.float64))
+        assert np.isnan(mean) and np.isnan(std) and np.isnan(downside_std)
+
+        mean, std, downside_std = _moment_stats(np.array([-3.0]))
+        assert mean == -3.0
+        assert np.isnan(std) and np.isnan(downside_std)
+
+
+class TestMoneyPrecision:
+    def test_net_profit_is_exact_float64_sum(self, portfolio_trade_data):
+        trades = portfolio_trade_data.copy()
+        trades['net_pnl'] = np.resize([11.28, -3.17, 0.1, 7.07], len(trades))
+        metrics = BacktestMetrics(trades, 1000.0)
+
+        assert metrics.trade_data['net_pnl'].dtype == np.float64
+        assert metrics.compute_all_metrics()['net_profit'] == trades['net_pnl'].sum()
+
+
+class TestArrowBackend:
+    def test_arrow_matches_numpy(self, portfolio_trade_data):
+        pytest.importorskip('pyarrow')
+        expected = BacktestMetrics(portfolio_trade_data, 1000.0).compute_all_metrics()
+        result = BacktestMetrics(portfolio_trade_data, 1000.0, use_arrow=True).compute_all_metrics()
+
+        assert result.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, str):
+                assert result[key] == value
+            else:
+                assert result[key] == pytest.approx(value, nan_ok=True), key
@@ -0,0 +1,44 @@
+"""Tests de utils.rolling (máximo/mínimo rodante y EMA)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.rolling import ema, rolling_max, rolling_min
+
+
+class TestRollingExtremes:
+    @pytest.mark.parametrize("window", [1, 3, 20, 150])
+    def test_matches_pandas_rolling(self, window):
+        rng = np.random.default_rng(0)
+        values = rng.normal(100, 5, 1000)
+        values[rng.random(1000) < 0.02] = np.nan
+        series = pd.Series(values)
+
+        np.testing.assert_array_equal(rolling_max(values, window), series.rolling(window).max().to_numpy())
+        np.testing.assert_array_equal(rolling_min(values, window), series.rolling(window).min().to_numpy())
+
+    def test_window_longer_than_data_is_all_nan(self):
+        assert np.isnan(rolling_max(np.array([1.0, 2.0]), 5)).all()
+
+    def test_rejects_non_positive_window(self):
+        with pytest.raises(ValueError, match="window"):
+            rolling_min(np.array([1.0, 2.0]), 0)
+
+
+class TestEma:
+    @pytest.mark.parametrize("span", [1, 9, 20, 200])
+    def test_matches_pandas_ewm_exactly(self, span):
+        rng = np.random.default_rng(1)
+        values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 2000)))
+        values[:3] = np.nan
+        values[rng.random(2000) < 0.02] = np.nan
+        expected = pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+        np.testing.assert_array_equal(ema(values, span), expected)
+
+    def test_constant_series_stays_constant(self):
+        np.testing.assert_array_equal(ema(np.full(50, 7.5), 10), np.full(50, 7.5))
+
+    def test_rejects_non_positive_span(self):
+        with pytest.raises(ValueError, match="span"):
+            ema(np.array([1.0, 2.0]), 0)
@@ -56,6 +56,27 @@ class TestTradingSignalPositionSide:
         )
         assert 'SHORT' in repr(signal)
 
+    def test_from_arrays_matches_constructor(self):
+        timestamps = [datetime(2024, 1, 1), datetime(2024, 1, 2)]
+        signals = TradingSignal.from_arrays(
+            timestamps, [SignalType.BUY, SignalType.SELL], [100.0, 110.0], [0.5, 1.0], 'BTC',
+            position_side=SignalPositionSide.SHORT,
+        )
+        expected = [
+            TradingSignal(timestamp=timestamps[0], signal_type=SignalType.BUY, symbol='BTC', price=100.0,
+                          position_size_pct=0.5, position_side=SignalPositionSide.SHORT),
+            TradingSignal(timestamp=timestamps[1], signal_type=SignalType.SELL, symbol='BTC', price=110.0,
+                          position_size_pct=1.0, position_side=SignalPositionSide.SHORT),
+        ]
+        assert signals == expected
+
+    def test_from_arrays_validates_like_constructor(self):
+        timestamps = [datetime(2024, 1, 1)]
+        with pytest.raises(ValueError):
+            TradingSignal.from_arrays(timestamps, [SignalType.BUY], [0.0], [0.5], 'BTC')
+        with pytest.raises(ValueError):
+            TradingSignal.from_arrays(timestamps, [SignalType.BUY], [100.0], [1.5], 'BTC')
+
 
 class TestShortCryptoEngine:
     def _make_engine(self, capital=1000.0):
@@ -0,0 +1,132 @@
+"""Tests para TradeMetricsCalculator (métricas por trade)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics.trade_metrics import TradeMetricsCalculator, _trade_window_stats
+from utils.timeframe import Timeframe
+
+
+@pytest.fixture
+def ramp_market_data():
+    """OHLC con precios crecientes: Low = i, High = i + 2."""
+    dates = pd.date_range('2024-01-01', periods=20, freq='5min')
+    base = np.arange(20, dtype=float) + 100
+    return pd.DataFrame({
+        'Open': base + 1, 'High': base + 2, 'Low': base, 'Close': base + 1, 'Volume': 1.0,
+    }, index=dates)
+
+
+def _trade(entry_bar, exit_bar, side, dates, entry_price=105.0, pnl=1.0):
+    return {
+        'entry_timestamp': dates[entry_bar],
+        'exit_timestamp': dates[exit_bar],
+        'entry_price': entry_price,
+        'usdt_amount': entry_price * 2,   # 2 unidades
+        'net_profit_loss': pnl,
+        'position_side': side,
+    }
+
+
+class TestTradeWindowStats:
+    def test_min_max_and_counts_per_window(self):
+        low = np.array([5.0, 1.0, 7.0, 3.0, 9.0])
+        high = low + 1
+        close = low + 0.5
+        start = np.array([0, 2, 1])
+        end = np.array([2, 5, 4])
+        min_low, max_high, loss, profit = _trade_window_stats(
+            low, high, close, start, end, np.array([4.0, 4.0, 4.0]), np.array([1, 0, 1], dtype=np.int8)
+        )
+        np.testing.assert_array_equal(min_low, [1.0, 3.0, 1.0])
+        np.testing.assert_array_equal(max_high, [6.0, 10.0, 8.0])
+        np.testing.assert_array_equal(loss, [1, 2, 2])
+        np.testing.assert_array_equal(profit, [1, 1, 1])
+
+    def test_empty_window_and_nan_prices(self):
+        low = np.array([np.nan, 2.0, 3.0])
+        min_low, max_high, loss, profit = _trade_window_stats(
+            low, low, low, np.array([0, 3]), np.array([2, 3]), np.array([1.0, 1.0]), np.array([1, 1], dtype=np.int8)
+        )
+        # Los NaN se ignoran como en Series.min(); la ventana vacía devuelve NaN
+        assert min_low[0] == 2.0 and max_high[0] == 2.0
+        assert np.isnan(min_low[1]) and np.isnan(max_high[1])
+        assert loss[1] == 0 and profit[1] == 0
+
+
+class TestMaeMfe:
+    def test_long_and_short(self, ramp_market_data):
+        dates = ramp_market_data.index
+        trades = pd.DataFrame([
+            _trade(5, 9, 'LONG', dates),
+            _trade(5, 9, 'SignalPositionSide.SHORT', dates),
+        ])
+        calc = TradeMetricsCalculator(1000.0, ramp_market_data, Timeframe.M5)
+        result = calc.create_trade_metrics_df(trades)
+
+        # Ventana barras 5..9 inclusive: min Low = 105, max High = 111
+        assert result['MAE'].tolist() == [0.0, 12.0]
+        assert result['MFE'].tolist() == [12.0, 0.0]
+        assert result['trade_volatility'].iloc[0] == pytest.approx(6 / 105 * 100, abs=0.01)
+
+    def test_trade_outside_market_data(self, ramp_market_data):
+        trades = pd.DataFrame([{
+            **_trade(0, 1, 'LONG', ramp_market_data.index),
+            'entry_timestamp': pd.Timestamp('2023-01-01'),
+            'exit_timestamp': pd.Timestamp('2023-01-02'),
+        }])
+        calc = TradeMetricsCalculator(1000.0, ramp_market_data, Timeframe.M5)
+        result = calc.create_trade_metrics_df(trades)
+
+        assert np.isnan(result['MAE'].iloc[0])
+        assert np.isnan(result['trade_volatility'].iloc[0])
+        assert result['profit_efficiency'].iloc[0] == 0
+
+    def test_invalid_side_raises(self, ramp_market_data):
+        trades = pd.DataFrame([_trade(2, 4, 'FLAT', ramp_market_data.index)])
+        calc = TradeMetricsCalculator(1000.0, ramp_market_data, Timeframe.M5)
+        with pytest.raises(ValueError, match='position_side'):
+            calc.create_trade_metrics_df(trades)
+
+
+class TestTimeInProfitLoss:
+    def test_counts_bars_by_side(self, ramp_market_data):
+        dates = ramp_market_data.index
+        trades = pd.DataFrame([
+            _trade(5, 9, 'LONG', dates, entry_price=108.0),
+            _trade(5, 9, 'SHORT', dates, entry_price=108.0),
+        ])
+        calc = TradeMetricsCalculator(1000.0, ramp_market_data, Timeframe.M5)
+        result = calc.create_trade_metrics_df(trades)
+
+        # Closes de las barras 5..9: 106, 107, 108, 109, 110
+        assert result['bars_in_loss'].tolist() == [2, 2]
+        assert result['bars_in_profit'].tolist() == [3, 3]
+
+    def test_trade_outside_market_data_is_nan(self, ramp_market_data):
+        trades = pd.DataFrame([{
+            **_trade(0, 1, 'LONG', ramp_market_data.index),
+            'entry_timestamp': pd.Timestamp('2023-01-01'),
+            'exit_timestamp': pd.Timestamp('2023-01-02'),
+        }])
+        calc = TradeMetricsCalculator(1000.0, ramp_market_data, Timeframe.M5)
+        result = calc.create_trade_metrics_df(trades)
+
+        assert np.isnan(result['bars_in_loss'].iloc[0])
+        assert np.isnan(result['bars_in_profit'].iloc[0])
+
+
+class TestRiskManagement:
+    def test_uses_capital_before_each_trade(self, ramp_market_data):
+        dates = ramp_market_data.index
+        trades = pd.DataFrame([
+            _trade(1, 2, 'LONG', dates, entry_price=100.0, pnl=100.0),
+            _trade(3, 4, 'LONG', dates, entry_price=100.0, pnl=-55.0),
+        ])
+        calc = TradeMetricsCalculator(1000.0, ramp_market_data, Timeframe.M5)
+        result = calc.create_trade_metrics_df(trades)
+
+        # Capital previo: 1000 y 1100; usdt_amount = 200
+        assert result['riesgo_aplicado'].tolist() == [20.0, pytest.approx(18.18)]
+        assert result['return_on_capital'].tolist() == [10.0, -5.0]
+        assert result['cumulative_capital'].tolist() == [1100.0, 1045.0]
@@ -0,0 +1,55 @@
+"""Tests del visualizador de optimización (optimization/visualizer.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimization import visualizer
+from optimization.visualizer import OptimizationPlotter
+
+
+def _random_results(seed: int) -> pd.DataFrame:
+    """Resultados de optimización con celdas repetidas, métricas NaN y parámetros NaN."""
+    rng = np.random.default_rng(seed)
+    n = 60
+    df = pd.DataFrame({
+        'lookback_period': rng.choice([10.0, 20.0, 30.0, 40.0, np.nan], n),
+        'position_size_pct': rng.choice([0.1, 0.3, 0.5, np.nan], n),
+        'sharpe_ratio': rng.normal(0, 1, n),
+    })
+    df.loc[rng.random(n) < 0.3, 'sharpe_ratio'] = np.nan
+    # Una columna entera sin métricas: pivot_table la descarta
+    df.loc[df['lookback_period'] == 40.0, 'sharpe_ratio'] = np.nan
+    return df
+
+
+def _reference_grid(df: pd.DataFrame, fill_value: float):
+    """Implementación de referencia: pivot_table con el máximo por celda."""
+    pivot = df.pivot_table(
+        values='sharpe_ratio', index='position_size_pct', columns='lookback_period', aggfunc='max'
+    ).fillna(fill_value)
+    X, Y = np.meshgrid(pivot.columns.to_numpy(), pivot.index.to_numpy())
+    return X, Y, pivot.to_numpy()
+
+
+class TestSurfaceGrid:
+    @pytest.mark.parametrize('numba', [True, False])
+    def test_matches_pivot_table(self, numba, monkeypatch):
+        if numba and not visualizer.NUMBA_AVAILABLE:
+            pytest.skip("Numba no instalado")
+        monkeypatch.setattr(visualizer, 'NUMBA_AVAILABLE', numba)
+
+        for seed in range(20):
+            df = _random_results(seed)
+
+            grid = OptimizationPlotter(df)._surface_grid('lookback_period', 'position_size_pct', 'sharpe_ratio', -1.0)
+
+            for actual, expected in zip(grid, _reference_grid(df, -1.0)):
+                np.testing.assert_array_equal(actual, expected)
+
+    def test_drops_nan_parameters_and_empty_columns(self):
+        df = _random_results(0)
+
+        X, Y, Z = OptimizationPlotter(df)._surface_grid('lookback_period', 'position_size_pct', 'sharpe_ratio', 0.0)
+
+        assert not np.isnan(X).any() and not np.isnan(Y).any() and not np.isnan(Z).any()
+        assert 40.0 not in X
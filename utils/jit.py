@@ -0,0 +1,25 @@
+"""
+Compatibilidad opcional con Numba.
+
+Los kernels numéricos del framework se decoran con `njit`. Si Numba está
+instalado se compilan a código máquina; si no, el decorador no hace nada y
+los kernels se ejecutan como Python normal (mismos resultados, más lentos).
+
+Requiere (opcional): pip install numba
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Sustituto de `numba.njit` cuando Numba no está instalado: devuelve la función tal cual."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -0,0 +1,116 @@
+"""
+Máximo / mínimo rodante de ventana fija y EMA sobre arrays NumPy.
+
+rolling_max / rolling_min equivalen a pd.Series(a).rolling(window).max() / .min()
+(min_periods = window: NaN mientras la ventana no está completa o contiene algún
+NaN). Con Numba usan una cola monótona de índices, O(n) en un solo bucle
+compilado. ema equivale a pd.Series(a).ewm(span=span, adjust=False).mean().
+Sin Numba todas delegan en pandas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.jit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def _rolling_extreme(a, window, is_max):
+    """
+    Cola monótona de índices (array usado como deque): el primero de la cola es
+    siempre el extremo de la ventana actual. Cada índice entra y sale una vez.
+    """
+    n = a.size
+    out = np.full(n, np.nan)
+    queue = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    nan_count = 0
+    for i in range(n):
+        value = a[i]
+        if value != value:
+            nan_count += 1
+        else:
+            # Quitar del final los que ya no pueden ser el extremo
+            while tail > head and (a[queue[tail - 1]] <= value if is_max else a[queue[tail - 1]] >= value):
+                tail -= 1
+            queue[tail] = i
+            tail += 1
+
+        # Sacar de la ventana el valor i - window
+        if i >= window:
+            leaving = a[i - window]
+            if leaving != leaving:
+                nan_count -= 1
+        while tail > head and queue[head] <= i - window:
+            head += 1
+
+        if i >= window - 1 and nan_count == 0:
+            out[i] = a[queue[head]]
+    return out
+
+
+@njit(cache=True)
+def _ema_kernel(a, alpha):
+    """
+    Misma recurrencia que la EWM de pandas con adjust=False (mismas operaciones
+    en el mismo orden, resultado idéntico bit a bit): los NaN no cuentan como
+    observación pero sí decaen el peso del valor anterior.
+    """
+    n = a.size
+    out = np.empty(n)
+    if n == 0:
+        return out
+    old_wt_factor = 1.0 - alpha
+    weighted = a[0]
+    out[0] = weighted
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = a[i]
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= old_wt + alpha
+                old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+def _check_window(window: int) -> int:
+    """Valida la ventana (entero >= 1)."""
+    window = int(window)
+    if window < 1:
+        raise ValueError(f"❌ window debe ser >= 1, recibido: {window}")
+    return window
+
+
+def rolling_max(a: np.ndarray, window: int) -> np.ndarray:
+    """Máximo rodante de `window` valores (NaN en las primeras window-1 posiciones)."""
+    window = _check_window(window)
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _rolling_extreme(a, window, True)
+    return pd.Series(a).rolling(window).max().to_numpy()
+
+
+def rolling_min(a: np.ndarray, window: int) -> np.ndarray:
+    """Mínimo rodante de `window` valores (NaN en las primeras window-1 posiciones)."""
+    window = _check_window(window)
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _rolling_extreme(a, window, False)
+    return pd.Series(a).rolling(window).min().to_numpy()
+
+
+def ema(a: np.ndarray, span: int) -> np.ndarray:
+    """Media móvil exponencial con alpha = 2 / (span + 1), sin ajuste (= ewm(span, adjust=False).mean())."""
+    if span < 1:
+        raise ValueError(f"❌ span debe ser >= 1, recibido: {span}")
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _ema_kernel(a, 2.0 / (span + 1.0))
+    return pd.Series(a).ewm(span=span, adjust=False).mean().to_numpy()
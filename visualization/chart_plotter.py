@@ -70,16 +70,20 @@ class BacktestVisualizerStatic:
 
             has_operations = False
 
-            for _, trade in self.df_trades.iterrows():
-                entry_time = pd.to_datetime(trade["entry_timestamp"])
-                exit_time = pd.to_datetime(trade["exit_timestamp"])
+            trade_rows = self.df_trades[
+                ["entry_timestamp", "exit_timestamp", "entry_price", "exit_price"]
+            ].itertuples(index=False, name=None)
+
+            for entry_ts, exit_ts, entry_price, exit_price in trade_rows:
+                entry_time = pd.to_datetime(entry_ts)
+                exit_time = pd.to_datetime(exit_ts)
 
                 if entry_time in df_subset.index:
-                    signals_long_entry.loc[entry_time] = trade["entry_price"]
+                    signals_long_entry.loc[entry_time] = entry_price
                     has_operations = True
 
                 if exit_time in df_subset.index:
-                    signals_long_exit.loc[exit_time] = trade["exit_price"]
+                    signals_long_exit.loc[exit_time] = exit_price
                     has_operations = True
 
             if not has_operations:
@@ -294,9 +298,9 @@ class BacktestVisualizerInteractive:
                 })
         else:
             # Fallback: usar entry del DataFrame (1 marker por trade)
-            for _, trade in trades.iterrows():
-                entry_time = pd.to_datetime(trade['entry_timestamp'])
-                entry_price = trade['entry_price']
+            trade_rows = trades[['entry_timestamp', 'entry_price']].itertuples(index=False, name=None)
+            for entry_ts, entry_price in trade_rows:
+                entry_time = pd.to_datetime(entry_ts)
                 markers.append({
                     'time': int(entry_time.value // 10**9),
                     'position': 'belowBar',
@@ -307,7 +311,8 @@ class BacktestVisualizerInteractive:
                 })
 
         # SELL markers: siempre del DataFrame de trades (tiene P&L)
-        for _, trade in trades.iterrows():
+        # Registros como dict (sin crear una Series por fila); .get() sigue funcionando
+        for trade in trades.to_dict('records'):
             exit_time = pd.to_datetime(trade['exit_timestamp'])
             exit_price = trade['exit_price']
             net_pnl = trade.get('net_profit_loss', 0)
@@ -393,7 +398,7 @@ class BacktestVisualizerInteractive:
                 return 0.0
 
         result = []
-        for _, trade in trades.iterrows():
+        for trade in trades.to_dict('records'):
             entry_time = pd.to_datetime(trade['entry_timestamp'])
             exit_time = pd.to_datetime(trade['exit_timestamp'])
             result.append({
@@ -85,8 +85,8 @@ def time_chart(df_trade_metrics, save_path=None):
     if not year_df.empty and len(year_df) > 0:
         # Dibujar gráfico de años
         y_pos_year = np.arange(len(year_df))
-        bar_colors_year = [colors['profit'] if row["is_profitable"] else colors['loss'] 
-                           for _, row in year_df.iterrows()]
+        bar_colors_year = [colors['profit'] if is_profitable else colors['loss'] 
+                           for is_profitable in year_df["is_profitable"]]
         
         ax_year.barh(y_pos_year, year_df["net_result"], color=bar_colors_year, edgecolor="black", alpha=0.9)
         ax_year.axvline(x=0, color='black', linestyle='-', alpha=0.3)
@@ -170,8 +170,8 @@ def time_chart(df_trade_metrics, save_path=None):
     
     # Dibujar gráfico de meses
     y_pos_month = np.arange(len(month_df))
-    bar_colors_month = [colors['profit'] if row["is_profitable"] else colors['loss'] 
-                        for _, row in month_df.iterrows()]
+    bar_colors_month = [colors['profit'] if is_profitable else colors['loss'] 
+                        for is_profitable in month_df["is_profitable"]]
     
     ax_month.barh(y_pos_month, month_df["net_result"], color=bar_colors_month, edgecolor="black", alpha=0.9)
     ax_month.axvline(x=0, color='black', linestyle='-', alpha=0.3)
@@ -250,8 +250,8 @@ def time_chart(df_trade_metrics, save_path=None):
     
     # Dibujar gráfico de días
     y_pos_day = np.arange(len(day_df))
-    bar_colors_day = [colors['profit'] if row["is_profitable"] else colors['loss'] 
-                     for _, row in day_df.iterrows()]
+    bar_colors_day = [colors['profit'] if is_profitable else colors['loss'] 
+                     for is_profitable in day_df["is_profitable"]]
     
     ax_day.barh(y_pos_day, day_df["net_result"], color=bar_colors_day, edgecolor="black", alpha=0.9)
     ax_day.axvline(x=0, color='black', linestyle='-', alpha=0.3)